@@ -0,0 +1,82 @@
+"""added rank keys to questions and categories
+
+Revision ID: 7c2e5b9d41a6
+Revises: 3f1c9a7d2e84
+Create Date: 2026-10-17 11:03:27.540912
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e5b9d41a6"
+down_revision: Union[str, None] = "3f1c9a7d2e84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors src.main.utils.ranking.order_rank at the time of this migration
+RANK_DIGITS = (
+    "0123456789" "ABCDEFGHIJKLMNOPQRSTUVWXYZ" "abcdefghijklmnopqrstuvwxyz"
+)
+RANK_WIDTH = 5
+
+
+def order_rank_sql(order: str) -> str:
+    """
+    Returns a SQL expression for the rank key of an integer order expression.
+    """
+
+    base = len(RANK_DIGITS)
+    digits = " || ".join(
+        f"substr('{RANK_DIGITS}',"
+        f" (({order} / {base ** place}) % {base} + 1)::int, 1)"
+        for place in reversed(range(RANK_WIDTH))
+    )
+    return f"rtrim({digits}, '0')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "questions",
+        sa.Column("draft_rank", sa.String(collation="C"), nullable=True),
+    )
+    op.add_column(
+        "questions",
+        sa.Column("published_rank", sa.String(collation="C"), nullable=True),
+    )
+    op.add_column(
+        "question_categories",
+        sa.Column("display_rank", sa.String(collation="C"), nullable=True),
+    )
+
+    # Backfill ranks from the current integer orders, in one statement per
+    # table rather than one per row
+    rank = order_rank_sql("ordered.position")
+    op.execute(
+        "UPDATE questions SET"
+        f" published_rank = CASE WHEN ordered.is_published THEN {rank} END,"
+        f" draft_rank = CASE WHEN NOT ordered.is_published THEN {rank} END"
+        " FROM (SELECT id, is_published, row_number() OVER ("
+        " PARTITION BY event_id, is_published"
+        " ORDER BY published_order, draft_order, id"
+        ") AS position FROM questions) AS ordered"
+        " WHERE questions.id = ordered.id"
+    )
+    op.execute(
+        f"UPDATE question_categories SET display_rank = {rank}"
+        " FROM (SELECT id, row_number() OVER ("
+        " PARTITION BY event_id ORDER BY display_order, id"
+        ") AS position FROM question_categories) AS ordered"
+        " WHERE question_categories.id = ordered.id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("question_categories", "display_rank")
+    op.drop_column("questions", "published_rank")
+    op.drop_column("questions", "draft_rank")
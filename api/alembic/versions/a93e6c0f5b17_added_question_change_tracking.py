@@ -0,0 +1,82 @@
+"""added question change tracking
+
+Revision ID: a93e6c0f5b17
+Revises: d41f7a2c9e58
+Create Date: 2026-10-17 14:12:48.903615
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a93e6c0f5b17"
+down_revision: Union[str, None] = "d41f7a2c9e58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "questions",
+        sa.Column(
+            "changed_version",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "questions",
+        sa.Column("published_version", sa.Integer(), nullable=True),
+    )
+    # Existing published questions count as visible to every cursor
+    op.execute("UPDATE questions SET published_version = 0 WHERE is_published")
+    op.create_index(
+        "ix_questions_event_id_changed_version",
+        "questions",
+        ["event_id", "changed_version"],
+        unique=False,
+    )
+    op.create_table(
+        "question_tombstones",
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("question_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("published_version", sa.Integer(), nullable=True),
+        sa.Column(
+            "unpublished",
+            sa.Boolean(),
+            server_default=sa.text("false"),
+            nullable=False,
+        ),
+        sa.Column("deleted_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["event_id"], ["events.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_question_tombstones_event_id_version",
+        "question_tombstones",
+        ["event_id", "version"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_question_tombstones_event_id_version",
+        table_name="question_tombstones",
+    )
+    op.drop_table("question_tombstones")
+    op.drop_index(
+        "ix_questions_event_id_changed_version", table_name="questions"
+    )
+    op.drop_column("questions", "published_version")
+    op.drop_column("questions", "changed_version")
@@ -0,0 +1,117 @@
+"""added hot path indexes
+
+Revision ID: b52d8e1f7c03
+Revises: a93e6c0f5b17
+Create Date: 2026-10-17 15:40:12.218736
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b52d8e1f7c03"
+down_revision: Union[str, None] = "a93e6c0f5b17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexes are built CONCURRENTLY so the tables stay writable meanwhile
+INDEXES = [
+    ("ix_participants_user_id_role", "participants", ["user_id", "role"]),
+    ("ix_invites_user_id_status", "invites", ["user_id", "status"]),
+    (
+        "ix_questions_event_id_is_published_rank",
+        "questions",
+        [
+            "event_id",
+            "is_published",
+            sa.text("coalesce(published_rank, draft_rank)"),
+        ],
+    ),
+    (
+        "ix_question_categories_event_id_display_rank",
+        "question_categories",
+        ["event_id", "display_rank"],
+    ),
+]
+
+
+# Keep one invite per event and email, preferring an answered one
+DEDUPE_INVITES = (
+    "DELETE FROM invites WHERE id IN ("
+    " SELECT id FROM ("
+    "  SELECT id, row_number() OVER ("
+    "   PARTITION BY event_id, email"
+    "   ORDER BY status = 'pending', id"
+    "  ) AS position FROM invites"
+    " ) AS ranked WHERE position > 1"
+    ")"
+)
+
+
+def drop_invalid_index(name: str, table: str) -> None:
+    # A failed concurrent build leaves an invalid index behind, which
+    # if_not_exists would otherwise keep
+    invalid = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT NOT indisvalid FROM pg_index"
+                " WHERE indexrelid = to_regclass(:name)"
+            ),
+            {"name": name},
+        )
+        .scalar()
+    )
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            drop_invalid_index(name, table)
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        # Dedupe right before the build, as invites stay writable. A
+        # duplicate written during the build fails it; rerun the migration
+        # to dedupe again and rebuild the index.
+        drop_invalid_index("uq_invites_event_id_email", "invites")
+        op.execute(DEDUPE_INVITES)
+        op.create_index(
+            "uq_invites_event_id_email",
+            "invites",
+            ["event_id", "email"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    # Promote the unique index to a constraint without another table scan
+    op.execute(
+        "ALTER TABLE invites ADD CONSTRAINT uq_invites_event_id_email"
+        " UNIQUE USING INDEX uq_invites_event_id_email"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_invites_event_id_email", "invites", type_="unique")
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,36 @@
+"""added version to events
+
+Revision ID: d41f7a2c9e58
+Revises: 7c2e5b9d41a6
+Create Date: 2026-10-17 13:26:05.318244
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7a2c9e58"
+down_revision: Union[str, None] = "7c2e5b9d41a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "events",
+        sa.Column(
+            "version",
+            sa.Integer(),
+            server_default=sa.text("1"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("events", "version")
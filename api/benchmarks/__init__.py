@@ -0,0 +1,4 @@
+"""
+Benchmarks for the API. Run them from the api directory with DATABASE_URL
+pointing at a scratch database, e.g. python -m benchmarks.async_vs_sync.
+"""
@@ -0,0 +1,142 @@
+"""
+Compares requests/sec of the async read routes on the asyncpg engine with the
+same routes on the sync engine (get_async_db()'s thread pool fallback).
+
+Seeds one event with participants and published questions, then drives the
+app in-process over ASGI with a fixed number of concurrent clients.
+
+Usage: DATABASE_URL=postgresql://... JWT_SECRET_KEY=... \\
+    python -m benchmarks.async_vs_sync [--requests N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+import httpx
+from src.main import database
+from src.main.main import app
+from src.main.models import Event, Invite, Participant, Question, User
+
+
+def seed(participants: int, questions: int) -> tuple[int, str]:
+    """
+    Creates an event with participants and published questions. Returns the
+    event id and an invite token for it.
+    """
+
+    db = database.SessionLocal()
+    try:
+        event = Event(
+            address="1 Benchmark Way",
+            description="Benchmark event",
+            end_time="2030-01-02T00:00:00Z",
+            start_time="2030-01-01T00:00:00Z",
+            title="Benchmark",
+        )
+        db.add(event)
+        db.flush()
+        prefix = uuid.uuid4().hex[:8]
+        users = [
+            User(email=f"bench-{prefix}-{i}@example.com", first_name="Bench")
+            for i in range(participants)
+        ]
+        db.add_all(users)
+        db.flush()
+        db.add_all(
+            Participant(
+                event_id=event.id,
+                user_id=user.id,
+                role="host" if i == 0 else "participant",
+            )
+            for i, user in enumerate(users)
+        )
+        db.add_all(
+            Question(
+                event_id=event.id,
+                question_text=f"Question {i}",
+                answer_text="Answer",
+                is_published=True,
+                published_order=i + 1,
+            )
+            for i in range(questions)
+        )
+        token = str(uuid.uuid4())
+        db.add(
+            Invite(
+                event_id=event.id,
+                email=f"bench-{prefix}-guest@example.com",
+                role="participant",
+                token=token,
+            )
+        )
+        db.commit()
+        return event.id, token
+    finally:
+        db.close()
+
+
+async def run(urls: list[str], requests: int, concurrency: int) -> float:
+    """
+    Sends requests to the URLs in turn from concurrent clients. Returns
+    requests/sec.
+    """
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+        counter = iter(range(requests))
+
+        async def worker():
+            for i in counter:
+                response = await client.get(urls[i % len(urls)])
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+async def benchmark(database_url: str, args) -> dict:
+    results = {}
+    for mode in ("sync", "async"):
+        os.environ["DB_ASYNC_DRIVER"] = "true" if mode == "async" else "false"
+        database.init_engine_and_session(database_url)
+        event_id, token = seed(args.participants, args.questions)
+        urls = [
+            f"/api/public/events/token/{token}",
+            f"/api/public/events/token/{token}/participants",
+            f"/api/events/{event_id}/questions/changes"
+            f"?cursor=0&invite_token={token}",
+        ]
+
+        await run(urls, args.concurrency, args.concurrency)  # Warm up
+        results[mode] = await run(urls, args.requests, args.concurrency)
+        await database.dispose_async_engine()
+        database.engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--participants", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=200)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("Set DATABASE_URL to a scratch database.")
+
+    results = asyncio.run(benchmark(database_url, args))
+    for mode, rate in results.items():
+        print(f"{mode:>5}: {rate:8.1f} requests/sec")
+    print(f"speedup: {results['async'] / results['sync']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+Generates a large synthetic dataset for reproducing production-scale
+performance problems locally.
+
+Fills users, events, participants, invites, question categories, questions
+and question askers with skewed data: a handful of mega-events with tens of
+thousands of participants and questions, and a long tail of small events
+whose sizes follow a Pareto distribution. Rows are streamed into Postgres
+with COPY rather than the ORM, and the same profile and seed always produce
+the same rows. Every user signs in with benchmarks.seed.BENCHMARK_PASSWORD.
+
+Usage: DATABASE_URL=postgresql://... \\
+    python -m benchmarks.generate --profile large [--seed N] [--reset]
+
+The large profile writes about 15 million rows. Without --reset the
+tables must be empty, e.g. a freshly migrated database.
+"""
+
+import argparse
+import io
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, select
+from src.main.models import (
+    Event,
+    Invite,
+    Participant,
+    Question,
+    QuestionAsker,
+    QuestionCategory,
+    User,
+)
+from src.main.utils import order_rank
+
+from .seed import password_hash, reset_schema, reset_sequences
+
+# Rows buffered across all tables before they are copied
+FLUSH_ROWS = 200_000
+
+# Shape of the long tail; lower values give bigger outliers
+PARETO_ALPHA = 1.5
+
+PUBLISHED_SHARE = 0.7
+ASKED_SHARE = 0.6
+MAX_ASKERS = 3
+
+# Tables in the order their rows can be written
+TABLES = [
+    User.__table__,
+    Event.__table__,
+    Participant.__table__,
+    Invite.__table__,
+    QuestionCategory.__table__,
+    Question.__table__,
+    QuestionAsker.__table__,
+]
+
+
+@dataclass
+class Profile:
+    users: int
+    events: int
+
+    # The few events that dominate the dataset
+    mega_events: int
+    mega_participants: int
+    mega_questions: int
+
+    # Median sizes of every other event
+    participants: int
+    questions: int
+    invites: int
+    categories: int
+
+
+PROFILES = {
+    "small": Profile(
+        users=10_000,
+        events=1_000,
+        mega_events=2,
+        mega_participants=2_000,
+        mega_questions=1_000,
+        participants=8,
+        questions=20,
+        invites=3,
+        categories=2,
+    ),
+    "medium": Profile(
+        users=100_000,
+        events=10_000,
+        mega_events=5,
+        mega_participants=20_000,
+        mega_questions=5_000,
+        participants=8,
+        questions=25,
+        invites=4,
+        categories=3,
+    ),
+    "large": Profile(
+        users=1_000_000,
+        events=100_000,
+        mega_events=10,
+        mega_participants=50_000,
+        mega_questions=20_000,
+        participants=8,
+        questions=25,
+        invites=4,
+        categories=3,
+    ),
+}
+
+
+class CopyWriter:
+    """
+    Buffers rows per table and copies them into Postgres in table order, so
+    foreign keys always point at rows that were already written.
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.buffers = {table.name: io.StringIO() for table in TABLES}
+        self.columns = {
+            table.name: [column.name for column in table.columns]
+            for table in TABLES
+        }
+        self.counts = {table.name: 0 for table in TABLES}
+        self.buffered = 0
+
+    def add(self, table, row: dict):
+        values = (
+            format_value(row.get(column))
+            for column in self.columns[table.name]
+        )
+        self.buffers[table.name].write("\t".join(values) + "\n")
+        self.counts[table.name] += 1
+        self.buffered += 1
+        if self.buffered >= FLUSH_ROWS:
+            self.flush()
+
+    def flush(self):
+        for name, buffer in self.buffers.items():
+            if not buffer.tell():
+                continue
+            buffer.seek(0)
+            columns = ", ".join(self.columns[name])
+            self.cursor.copy_expert(
+                f"COPY {name} ({columns}) FROM STDIN", buffer
+            )
+            self.buffers[name] = io.StringIO()
+        self.buffered = 0
+
+
+def format_value(value) -> str:
+    # Generated text never contains tabs, newlines or backslashes
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def event_size(rng: random.Random, median: int, cap: int) -> int:
+    """
+    Returns a long-tailed size with the given median, capped at the size of
+    a mega-event.
+    """
+
+    scale = median / 2 ** (1 / PARETO_ALPHA)
+    return min(int(scale * rng.paretovariate(PARETO_ALPHA)), cap)
+
+
+def generate(engine, profile: Profile, seed_value: int = 1) -> dict:
+    """
+    Writes a profile's rows into an empty schema. Returns the row count per
+    table.
+    """
+
+    rng = random.Random(seed_value)
+    hashed_password = password_hash(random.Random(seed_value))
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    user_ids = range(1, profile.users + 1)
+    invite_id = category_id = question_id = 0
+
+    connection = engine.raw_connection()
+    try:
+        writer = CopyWriter(connection.cursor())
+        for user_id in user_ids:
+            writer.add(
+                User.__table__,
+                {
+                    "id": user_id,
+                    "email": f"user-{user_id}@example.com",
+                    "first_name": "Generated",
+                    "last_name": f"User {user_id}",
+                    "hashed_password": hashed_password,
+                    "is_registered": True,
+                },
+            )
+
+        for event_id in range(1, profile.events + 1):
+            # Spread the mega-events through the id range
+            mega = event_id % (profile.events // profile.mega_events) == 0
+            if mega:
+                participant_count = profile.mega_participants
+                question_count = profile.mega_questions
+                category_count = profile.categories * 4
+            else:
+                participant_count = event_size(
+                    rng, profile.participants, profile.mega_participants
+                )
+                question_count = event_size(
+                    rng, profile.questions, profile.mega_questions
+                )
+                category_count = rng.randint(0, profile.categories)
+            invite_count = event_size(
+                rng, profile.invites, profile.mega_participants
+            )
+
+            starts = start + timedelta(hours=rng.randrange(24 * 365))
+            created = starts - timedelta(days=30)
+            writer.add(
+                Event.__table__,
+                {
+                    "id": event_id,
+                    "title": f"Generated event {event_id}",
+                    "description": "Synthetic event",
+                    "start_time": starts,
+                    "end_time": starts + timedelta(hours=2),
+                    "address": f"{event_id} Generated Way",
+                    "version": 1,
+                },
+            )
+
+            # The first sampled user hosts the event
+            members = rng.sample(
+                user_ids, min(participant_count + 1, profile.users)
+            )
+            for i, user_id in enumerate(members):
+                writer.add(
+                    Participant.__table__,
+                    {
+                        "event_id": event_id,
+                        "user_id": user_id,
+                        "role": "host" if i == 0 else "participant",
+                    },
+                )
+            attendees = members[1:] or members
+
+            for i in range(invite_count):
+                invite_id += 1
+                writer.add(
+                    Invite.__table__,
+                    {
+                        "id": invite_id,
+                        "event_id": event_id,
+                        "email": f"guest-{event_id}-{i}@example.com",
+                        "role": "participant",
+                        "token": uuid.UUID(
+                            int=rng.getrandbits(128), version=4
+                        ),
+                        "status": "pending",
+                    },
+                )
+
+            category_ids = []
+            for i in range(category_count):
+                category_id += 1
+                category_ids.append(category_id)
+                writer.add(
+                    QuestionCategory.__table__,
+                    {
+                        "id": category_id,
+                        "event_id": event_id,
+                        "name": f"Category {i + 1}",
+                        "display_order": i + 1,
+                        "display_rank": order_rank(i + 1),
+                        "created_at": created,
+                        "updated_at": created,
+                    },
+                )
+
+            published = int(question_count * PUBLISHED_SHARE)
+            for i in range(question_count):
+                question_id += 1
+                is_published = i < published
+                order = i + 1 if is_published else i - published + 1
+                askers = []
+                if rng.random() < ASKED_SHARE:
+                    askers = rng.sample(
+                        attendees,
+                        min(rng.randint(1, MAX_ASKERS), len(attendees)),
+                    )
+                writer.add(
+                    Question.__table__,
+                    {
+                        "id": question_id,
+                        "event_id": event_id,
+                        "user_id": askers[0] if askers else None,
+                        "category_id": (
+                            rng.choice(category_ids) if category_ids else None
+                        ),
+                        "question_text": f"Question {i} for event {event_id}?",
+                        "answer_text": "Synthetic answer",
+                        "is_published": is_published,
+                        "published_order": order if is_published else None,
+                        "published_rank": (
+                            order_rank(order) if is_published else None
+                        ),
+                        "draft_order": None if is_published else order,
+                        "draft_rank": (
+                            None if is_published else order_rank(order)
+                        ),
+                        "changed_version": 0,
+                        "published_version": 0 if is_published else None,
+                        "created_at": created,
+                        "published_at": created if is_published else None,
+                        "updated_at": created,
+                    },
+                )
+                for user_id in askers:
+                    writer.add(
+                        QuestionAsker.__table__,
+                        {
+                            "question_id": question_id,
+                            "user_id": user_id,
+                            "created_at": created,
+                        },
+                    )
+
+        writer.flush()
+        connection.commit()
+    finally:
+        connection.close()
+
+    with engine.begin() as connection:
+        reset_sequences(
+            connection,
+            [
+                User.__table__,
+                Event.__table__,
+                Invite.__table__,
+                QuestionCategory.__table__,
+                Question.__table__,
+            ],
+        )
+    return writer.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Drop and recreate every table first",
+    )
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("Set DATABASE_URL to a scratch database.")
+    engine = create_engine(database_url)
+    if args.reset:
+        reset_schema(engine)
+    else:
+        with engine.connect() as connection:
+            if connection.scalar(select(func.count()).select_from(User)):
+                raise SystemExit("The users table is not empty; use --reset.")
+
+    started = time.perf_counter()
+    counts = generate(engine, PROFILES[args.profile], args.seed)
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        connection.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+    for name, count in counts.items():
+        print(f"{name:<20} {count:>12,}")
+    print(f"{'total':<20} {sum(counts.values()):>12,}")
+    print(f"Generated in {time.perf_counter() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Load-tests the API with a workload mix and reports latency percentiles and
+requests/sec per route, compared against a stored baseline.
+
+Seeds a scratch database at a preset scale (see benchmarks.seed.SCALES),
+then runs the mix's virtual users concurrently against the app in-process
+over ASGI (with its lifespan, so caches and workers run as in production),
+or against a running server with --base-url. Setup such as host sign-ins is
+not measured. In-process, every virtual user shares one worker's connection
+pool, so concurrency well past DB_POOL_SIZE + DB_MAX_OVERFLOW measures pool
+timeouts rather than the routes.
+
+Baselines live in benchmarks/baselines/<mix>-<scale>.json. Record them with
+--save-baseline on the machine that runs --compare (e.g. the CI runner):
+absolute numbers only compare on the same hardware. A baseline also records
+the requests, concurrency and seed it was run with, which later runs of the
+mix use by default. --compare exits with status 1 when a route's p95 latency
+rises, or its requests/sec falls, by more than --tolerance.
+
+Usage: DATABASE_URL=postgresql://... JWT_SECRET_KEY=... \\
+    python -m benchmarks.load --mix realistic --scale small --reset \\
+    [--requests N] [--concurrency N] [--seed N] [--base-url URL] \\
+    [--save-baseline | --compare] [--tolerance 0.25]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from sqlalchemy import create_engine
+
+from .seed import SCALES, reset_schema, seed
+from .workloads import MIXES, virtual_users
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# Routes with fewer requests are too noisy to compare
+MIN_COMPARED_COUNT = 100
+
+# Used when neither the command line nor the baseline sets them
+RUN_DEFAULTS = {"requests": 5000, "concurrency": 20, "seed": 1}
+
+
+def percentile(sorted_values: list[float], share: float) -> float:
+    """
+    Returns the nearest-rank percentile of sorted values.
+    """
+
+    return sorted_values[max(math.ceil(share * len(sorted_values)) - 1, 0)]
+
+
+def summarize(samples: dict, elapsed: float) -> dict:
+    """
+    Returns count, errors, requests/sec and p50/p95/p99 latency (ms) per
+    route and for all routes together.
+    """
+
+    def summary(latencies: list[float], errors: int) -> dict:
+        latencies = sorted(latencies)
+        return {
+            "count": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        }
+
+    routes = {
+        route: summary(latencies, samples["errors"][route])
+        for route, latencies in sorted(samples["latencies"].items())
+    }
+    everything = [
+        latency
+        for latencies in samples["latencies"].values()
+        for latency in latencies
+    ]
+    routes["all"] = summary(everything, sum(samples["errors"].values()))
+    return routes
+
+
+async def run_mix(
+    mix: str,
+    dataset,
+    requests: int,
+    concurrency: int,
+    seed_value: int,
+    base_url: Optional[str] = None,
+) -> dict:
+    """
+    Drives the virtual users of a mix until they have sent the requested
+    number of requests. Returns the summary per route.
+    """
+
+    if base_url:
+        transport = httpx.AsyncHTTPTransport()
+    else:
+        from src.main.main import app
+
+        # Count unhandled errors as 500s, as a server would return them
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    users = virtual_users(mix, dataset, concurrency, seed_value)
+    clients = [
+        httpx.AsyncClient(
+            transport=transport,
+            base_url=base_url or "http://benchmark",
+            timeout=60,
+        )
+        for _ in users
+    ]
+    samples = {
+        "latencies": defaultdict(list),
+        "errors": defaultdict(int),
+    }
+    remaining = iter(range(requests))
+
+    async def drive(user, client):
+        for _ in remaining:
+            request = user.next_request()
+            started = time.perf_counter()
+            response = await client.request(
+                request.method,
+                request.url,
+                json=request.json,
+                headers=request.headers,
+            )
+            samples["latencies"][request.route].append(
+                time.perf_counter() - started
+            )
+            if response.status_code >= 400:
+                samples["errors"][request.route] += 1
+            user.observe(request, response)
+
+    try:
+        await asyncio.gather(
+            *(user.setup(client) for user, client in zip(users, clients))
+        )
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(drive(user, client) for user, client in zip(users, clients))
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        for client in clients:
+            await client.aclose()
+    return summarize(samples, elapsed)
+
+
+async def run_in_process(mix: str, dataset, args) -> dict:
+    from src.main.main import app
+
+    # Run the app's startup and shutdown as uvicorn would
+    async with app.router.lifespan_context(app):
+        return await run_mix(
+            mix, dataset, args.requests, args.concurrency, args.seed
+        )
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns a description of every route whose p95 latency or requests/sec
+    regressed beyond the tolerance. Skips routes with too few requests.
+    """
+
+    regressions = []
+    for route, result in results.items():
+        base = baseline.get(route)
+        if (
+            not base
+            or min(base["count"], result["count"]) < MIN_COMPARED_COUNT
+        ):
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{route}: p95 {base['p95_ms']} -> {result['p95_ms']} ms"
+            )
+        if result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{route}: {base['rps']} -> {result['rps']} requests/sec"
+            )
+    return regressions
+
+
+def print_results(results: dict, baseline: Optional[dict]):
+    print(
+        f"{'route':<56} {'count':>6} {'err':>4} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'base p95':>9}"
+    )
+    for route, result in results.items():
+        base = (baseline or {}).get(route, {}).get("p95_ms", "")
+        print(
+            f"{route:<56} {result['count']:>6} {result['errors']:>4} "
+            f"{result['rps']:>8} {result['p50_ms']:>8} {result['p95_ms']:>8} "
+            f"{result['p99_ms']:>8} {base:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="realistic")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--requests", type=int)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Drop and recreate every table before seeding",
+    )
+    parser.add_argument(
+        "--base-url", help="Load a running server instead of the app"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--save-baseline", action="store_true")
+    action.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+
+    # Run as the baseline was recorded, unless told otherwise
+    baseline_path = BASELINE_DIR / f"{args.mix}-{args.scale}.json"
+    recorded = {}
+    if baseline_path.exists():
+        recorded = json.loads(baseline_path.read_text())
+    for option, default in RUN_DEFAULTS.items():
+        if getattr(args, option) is None:
+            setattr(args, option, recorded.get(option, default))
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("Set DATABASE_URL to a scratch database.")
+    # Leave outbound email to a real deployment
+    os.environ.setdefault("EMAIL_OUTBOX_WORKER", "false")
+
+    engine = create_engine(database_url)
+    if args.reset:
+        reset_schema(engine)
+    dataset = seed(engine, SCALES[args.scale], args.seed)
+    engine.dispose()
+
+    if args.base_url:
+        results = asyncio.run(
+            run_mix(
+                args.mix,
+                dataset,
+                args.requests,
+                args.concurrency,
+                args.seed,
+                args.base_url,
+            )
+        )
+    else:
+        results = asyncio.run(run_in_process(args.mix, dataset, args))
+
+    baseline = recorded.get("results")
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        baseline_run = {
+            "mix": args.mix,
+            "scale": args.scale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "results": results,
+        }
+        baseline_path.write_text(json.dumps(baseline_run, indent=2) + "\n")
+        print(f"Saved {baseline_path}")
+    elif args.compare:
+        if baseline is None:
+            raise SystemExit(f"No baseline at {baseline_path}")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
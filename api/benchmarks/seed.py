@@ -0,0 +1,218 @@
+"""
+Seeds an empty schema with synthetic users, events, participants, invites and
+questions for the load benchmarks.
+
+Rows are built in Python with explicit ids and written with Core bulk
+inserts, so the same seed always produces the same data. Every user shares
+one bcrypt hash of BENCHMARK_PASSWORD, salted from the seed, which keeps
+seeding fast while logins still pay the real hashing cost.
+"""
+
+import base64
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import bcrypt
+from sqlalchemy import insert, text
+from src.main.models import Base, Event, Invite, Participant, Question, User
+from src.main.utils import order_rank
+
+BENCHMARK_PASSWORD = "benchmark-password"
+BCRYPT_ROUNDS = 12
+
+# bcrypt writes base64 with its own alphabet
+BCRYPT_BASE64 = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    b"./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+)
+BATCH_SIZE = 5000
+
+# Share of each event's questions that are published
+PUBLISHED_SHARE = 0.7
+
+
+@dataclass
+class Scale:
+    events: int
+    questions_per_event: int
+    participants_per_event: int
+    invites_per_event: int
+
+    @property
+    def users(self) -> int:
+        # One host per event, plus a pool attendees are drawn from
+        return self.events + max(self.participants_per_event * 4, 1)
+
+
+SCALES = {
+    "small": Scale(
+        events=50,
+        questions_per_event=40,
+        participants_per_event=20,
+        invites_per_event=10,
+    ),
+    "medium": Scale(
+        events=1000,
+        questions_per_event=100,
+        participants_per_event=50,
+        invites_per_event=20,
+    ),
+    "large": Scale(
+        events=10000,
+        questions_per_event=100,
+        participants_per_event=50,
+        invites_per_event=20,
+    ),
+}
+
+
+@dataclass
+class Dataset:
+    """
+    What the workloads need to know about the seeded data.
+    """
+
+    hosts: list[tuple[str, int]] = field(default_factory=list)
+    attendees: list[str] = field(default_factory=list)
+    invites: list[tuple[int, str]] = field(default_factory=list)
+
+
+def password_hash(rng: random.Random) -> str:
+    """
+    Returns a bcrypt hash of BENCHMARK_PASSWORD with a salt drawn from rng,
+    so seeded data does not change between runs.
+    """
+
+    salt = base64.b64encode(rng.randbytes(16))[:22].translate(BCRYPT_BASE64)
+    return bcrypt.hashpw(
+        BENCHMARK_PASSWORD.encode("utf-8"),
+        f"$2b${BCRYPT_ROUNDS}$".encode("utf-8") + salt,
+    ).decode("utf-8")
+
+
+def reset_schema(engine):
+    """
+    Drops and recreates every table. Only point this at a scratch database.
+    """
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def bulk_insert(connection, table, rows: list[dict]):
+    for start in range(0, len(rows), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        connection.execute(insert(table), rows[start:end])
+
+
+def reset_sequences(connection, tables: list):
+    # Explicit ids leave the serial sequences behind
+    for table in tables:
+        connection.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"(SELECT coalesce(max(id), 0) + 1 FROM {table.name}), false)"
+            )
+        )
+
+
+def seed(engine, scale: Scale, seed_value: int = 1) -> Dataset:
+    """
+    Seeds an empty schema at a scale and returns what the workloads need.
+    """
+
+    rng = random.Random(seed_value)
+    hashed_password = password_hash(random.Random(seed_value))
+    dataset = Dataset()
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    users = [
+        {
+            "id": user_id,
+            "email": f"bench-{user_id}@example.com",
+            "first_name": "Bench",
+            "last_name": f"User {user_id}",
+            "hashed_password": hashed_password,
+            "is_registered": True,
+        }
+        for user_id in range(1, scale.users + 1)
+    ]
+    attendee_ids = range(scale.events + 1, scale.users + 1)
+    dataset.attendees = [users[i - 1]["email"] for i in attendee_ids]
+
+    events, participants, invites, questions = [], [], [], []
+    question_id = 0
+    for event_id in range(1, scale.events + 1):
+        starts = start + timedelta(hours=rng.randrange(24 * 365))
+        events.append(
+            {
+                "id": event_id,
+                "title": f"Benchmark event {event_id}",
+                "description": "Synthetic event",
+                "address": f"{event_id} Benchmark Way",
+                "start_time": starts,
+                "end_time": starts + timedelta(hours=2),
+            }
+        )
+
+        # The event's host is user event_id
+        dataset.hosts.append((users[event_id - 1]["email"], event_id))
+        participants.append(
+            {"event_id": event_id, "user_id": event_id, "role": "host"}
+        )
+        for user_id in rng.sample(
+            attendee_ids, min(scale.participants_per_event, len(attendee_ids))
+        ):
+            participants.append(
+                {
+                    "event_id": event_id,
+                    "user_id": user_id,
+                    "role": "participant",
+                }
+            )
+
+        for i in range(scale.invites_per_event):
+            token = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            invites.append(
+                {
+                    "event_id": event_id,
+                    "email": f"guest-{event_id}-{i}@example.com",
+                    "role": "participant",
+                    "token": token,
+                    "status": "pending",
+                }
+            )
+            dataset.invites.append((event_id, token))
+
+        published = int(scale.questions_per_event * PUBLISHED_SHARE)
+        for i in range(scale.questions_per_event):
+            question_id += 1
+            is_published = i < published
+            order = i + 1 if is_published else i - published + 1
+            questions.append(
+                {
+                    "id": question_id,
+                    "event_id": event_id,
+                    "question_text": f"Question {i} for event {event_id}?",
+                    "answer_text": "Synthetic answer",
+                    "is_published": is_published,
+                    "published_rank": (
+                        order_rank(order) if is_published else None
+                    ),
+                    "draft_rank": None if is_published else order_rank(order),
+                }
+            )
+
+    with engine.begin() as connection:
+        bulk_insert(connection, User.__table__, users)
+        bulk_insert(connection, Event.__table__, events)
+        bulk_insert(connection, Participant.__table__, participants)
+        bulk_insert(connection, Invite.__table__, invites)
+        bulk_insert(connection, Question.__table__, questions)
+        reset_sequences(
+            connection,
+            [User.__table__, Event.__table__, Question.__table__],
+        )
+    return dataset
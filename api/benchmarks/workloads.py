@@ -0,0 +1,281 @@
+"""
+Virtual users and the workload mixes built from them.
+
+Each virtual user has its own client (and cookies), signs in during setup if
+it needs to, and then picks its next request from weighted actions. Requests
+are labelled with their route template so results line up with /metrics.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from .seed import BENCHMARK_PASSWORD, Dataset
+
+
+@dataclass
+class Request:
+    route: str
+    method: str
+    url: str
+    json: Optional[dict] = None
+    headers: Optional[dict] = None
+
+
+class VirtualUser:
+    """
+    A client that sends a stream of requests drawn from weighted actions.
+    """
+
+    actions: list[tuple[int, str]] = []
+
+    def __init__(self, dataset: Dataset, rng: random.Random, number: int):
+        self.dataset = dataset
+        self.rng = rng
+        self.number = number
+        self.etags = {}
+
+    async def setup(self, client: httpx.AsyncClient):
+        pass
+
+    def next_request(self) -> Request:
+        names = [name for _, name in self.actions]
+        weights = [weight for weight, _ in self.actions]
+        return getattr(self, self.rng.choices(names, weights)[0])()
+
+    def observe(self, request: Request, response: httpx.Response):
+        # Poll with the last ETag, as the web client does
+        if "etag" in response.headers:
+            self.etags[request.url] = response.headers["etag"]
+
+    def conditional(self, url: str) -> Optional[dict]:
+        etag = self.etags.get(url)
+        return {"If-None-Match": etag} if etag else None
+
+    async def sign_in(self, client: httpx.AsyncClient, email: str):
+        response = await client.post(
+            "/api/auth/signin",
+            json={"email": email, "password": BENCHMARK_PASSWORD},
+        )
+        response.raise_for_status()
+
+
+class Attendee(VirtualUser):
+    """
+    Follows one event through its invite link, polling for questions.
+    """
+
+    actions = [
+        (60, "poll_questions"),
+        (30, "sync_changes"),
+        (5, "view_event"),
+        (5, "view_participants"),
+    ]
+
+    def __init__(self, dataset, rng, number):
+        super().__init__(dataset, rng, number)
+        self.event_id, self.token = rng.choice(dataset.invites)
+        self.cursor = None
+
+    def poll_questions(self) -> Request:
+        url = (
+            f"/api/events/{self.event_id}/questions?invite_token={self.token}"
+        )
+        return Request(
+            "/api/events/{event_id}/questions",
+            "GET",
+            url,
+            headers=self.conditional(url),
+        )
+
+    def sync_changes(self) -> Request:
+        url = (
+            f"/api/events/{self.event_id}/questions/changes"
+            f"?invite_token={self.token}"
+        )
+        if self.cursor is not None:
+            url += f"&cursor={self.cursor}"
+        return Request("/api/events/{event_id}/questions/changes", "GET", url)
+
+    def view_event(self) -> Request:
+        return Request(
+            "/api/public/events/token/{token}",
+            "GET",
+            f"/api/public/events/token/{self.token}",
+        )
+
+    def view_participants(self) -> Request:
+        return Request(
+            "/api/public/events/token/{token}/participants",
+            "GET",
+            f"/api/public/events/token/{self.token}/participants?limit=50",
+        )
+
+    def observe(self, request, response):
+        super().observe(request, response)
+        if request.route.endswith("/changes") and response.is_success:
+            self.cursor = response.json()["cursor"]
+
+
+class Host(VirtualUser):
+    """
+    Signs in as an event's host and reorders its published questions.
+    """
+
+    actions = [
+        (50, "move_question"),
+        (40, "view_questions"),
+        (10, "list_events"),
+    ]
+
+    def __init__(self, dataset, rng, number):
+        super().__init__(dataset, rng, number)
+        self.email, self.event_id = dataset.hosts[number % len(dataset.hosts)]
+        self.published_ids = []
+
+    async def setup(self, client):
+        await self.sign_in(client, self.email)
+        response = await client.get(f"/api/events/{self.event_id}/questions")
+        response.raise_for_status()
+        self.published_ids = [
+            question["id"]
+            for question in response.json()
+            if question["is_published"]
+        ]
+
+    def move_question(self) -> Request:
+        ids = self.published_ids
+        if len(ids) < 2:
+            return self.view_questions()
+        question_id = ids.pop(self.rng.randrange(len(ids)))
+        position = self.rng.randrange(len(ids) + 1)
+        ids.insert(position, question_id)
+        return Request(
+            "/api/events/{event_id}/questions/{question_id}/move",
+            "PUT",
+            f"/api/events/{self.event_id}/questions/{question_id}/move",
+            json={
+                "is_published": True,
+                "previous_id": ids[position - 1] if position > 0 else None,
+                "next_id": (
+                    ids[position + 1] if position + 1 < len(ids) else None
+                ),
+            },
+        )
+
+    def view_questions(self) -> Request:
+        url = f"/api/events/{self.event_id}/questions"
+        return Request(
+            "/api/events/{event_id}/questions",
+            "GET",
+            url,
+            headers=self.conditional(url),
+        )
+
+    def list_events(self) -> Request:
+        return Request(
+            "/api/private/events/",
+            "GET",
+            "/api/private/events/?role=host&limit=20",
+        )
+
+
+class Inviter(Host):
+    """
+    Signs in as a host and sends bursts of invitations.
+    """
+
+    actions = [(80, "invite_burst"), (20, "list_invites")]
+    burst_size = 50
+
+    def __init__(self, dataset, rng, number):
+        super().__init__(dataset, rng, number)
+        self.sent = 0
+
+    async def setup(self, client):
+        await self.sign_in(client, self.email)
+
+    def invite_burst(self) -> Request:
+        emails = [
+            f"burst-{self.number}-{self.sent + i}@example.com"
+            for i in range(self.burst_size)
+        ]
+        self.sent += self.burst_size
+        return Request(
+            "/api/invites/bulk",
+            "POST",
+            "/api/invites/bulk",
+            json={
+                "event_id": self.event_id,
+                "invites": [{"email": email} for email in emails],
+            },
+        )
+
+    def list_invites(self) -> Request:
+        return Request(
+            "/api/invites/",
+            "GET",
+            f"/api/invites/?event_id={self.event_id}&limit=50",
+        )
+
+
+class SignIn(VirtualUser):
+    """
+    Signs in as random attendees, as when an event starts.
+    """
+
+    actions = [(90, "sign_in_request"), (10, "who_am_i")]
+
+    def __init__(self, dataset, rng, number):
+        super().__init__(dataset, rng, number)
+        self.signed_in = False
+
+    def sign_in_request(self) -> Request:
+        return Request(
+            "/api/auth/signin",
+            "POST",
+            "/api/auth/signin",
+            json={
+                "email": self.rng.choice(self.dataset.attendees),
+                "password": BENCHMARK_PASSWORD,
+            },
+        )
+
+    def who_am_i(self) -> Request:
+        if not self.signed_in:
+            return self.sign_in_request()
+        return Request("/api/auth/me", "GET", "/api/auth/me")
+
+    def observe(self, request, response):
+        super().observe(request, response)
+        if request.route == "/api/auth/signin" and response.is_success:
+            self.signed_in = True
+
+
+# Share of virtual users of each kind
+MIXES = {
+    "attendee_polling": {Attendee: 1},
+    "host_reordering": {Host: 1},
+    "invite_bursts": {Inviter: 1},
+    "login_storm": {SignIn: 1},
+    "realistic": {Attendee: 85, Host: 8, Inviter: 2, SignIn: 5},
+}
+
+
+def virtual_users(
+    mix: str, dataset: Dataset, count: int, seed_value: int
+) -> list[VirtualUser]:
+    """
+    Creates the virtual users for a mix, deterministically by seed.
+    """
+
+    rng = random.Random(seed_value)
+    kinds = list(MIXES[mix])
+    weights = list(MIXES[mix].values())
+    users = []
+    for number in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        users.append(kind(dataset, random.Random(rng.getrandbits(64)), number))
+    return users
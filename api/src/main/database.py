@@ -1,22 +1,447 @@
 """
 Database setup: creates SQLAlchemy engine, session, and Base for ORM models.
+
+The connection pool is tuned from the environment:
+
+DB_POOL_SIZE: Connections kept open per worker (default 5).
+DB_MAX_OVERFLOW: Extra connections opened under load (default 10).
+DB_POOL_TIMEOUT: Seconds to wait for a free connection (default 30).
+DB_POOL_RECYCLE: Seconds before a connection is replaced (default 1800).
+DB_POOL_PRE_PING: Test connections before use (default true).
+DB_STATEMENT_TIMEOUT_MS: Postgres statement_timeout, 0 for none (default 0).
+DB_APPLICATION_NAME: application_name shown in pg_stat_activity.
+
+Each worker can hold up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections, which
+across all workers must stay under the server's max_connections.
+
+Async routes use get_async_db() and run the existing query helpers through
+run_sync(). By default that is a sync session whose run_sync() runs in the
+thread pool, so async routes work against any database. DB_ASYNC_DRIVER=true
+adds an async engine on asyncpg for Postgres URLs, with the same pool
+settings, so each worker can hold twice as many connections. Its run_sync()
+drives the ORM and serialization on the event loop, where they block every
+other request; benchmarks.async_vs_sync measured it slower than the thread
+pool, so it stays off unless a deployment measures otherwise.
+
+REPLICA_DATABASE_URL optionally adds a read replica. Read-only routes take
+their session from get_async_read_db(), which uses the replica while it is
+reachable and no more than DB_REPLICA_MAX_LAG_SECONDS (default 5) behind,
+measured at most every DB_REPLICA_CHECK_SECONDS (default 1), and falls back
+to the request's get_async_db() session otherwise, so a request never holds
+two primary connections. Every successful write response sets the
+read_primary_until cookie (see ReadYourWritesMiddleware), which keeps that
+client's reads on the primary for longer than the replica may lag, so users
+always see their own writes. Writes, access checks and anything that
+reads its own cursor or version stay on get_db() and get_async_db().
+
+Every engine is instrumented with instrument_engine(), which counts the
+statements and database time of the current request (see QueryStatsMiddleware)
+and logs statements slower than DB_SLOW_QUERY_MS (default 200, 0 to disable)
+with the route that ran them.
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
 # Session factory and engine, overridable for tests
 engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+replica_monitor = None
+
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+# Cookie keeping a client's reads on the primary after it writes
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+# Seconds since the replica last replayed a change, or 0 when it is caught up
+# or not a standby (e.g. a second database standing in for one)
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    Queue pool that records how often and how long requests wait for a
+    connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_seconds = 0.0
+        self.checkout_wait_max_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.checkout_wait_seconds += waited
+                self.checkout_wait_max_seconds = max(
+                    self.checkout_wait_max_seconds, waited
+                )
+
+    def recreate(self):
+        # Keep the counters when the pool is replaced (e.g. after dispose)
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.checkout_timeouts = self.checkout_timeouts
+        pool.checkout_wait_seconds = self.checkout_wait_seconds
+        pool.checkout_wait_max_seconds = self.checkout_wait_max_seconds
+        return pool
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_seconds": self.checkout_wait_seconds,
+                "checkout_wait_max_seconds": self.checkout_wait_max_seconds,
+            }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """
+    InstrumentedQueuePool for asyncio drivers such as asyncpg.
+    """
+
+
+class ReplicaMonitor:
+    """
+    Tracks whether the replica is reachable and how far it lags behind the
+    primary, measuring at most once per interval.
+    """
+
+    def __init__(self, engine, max_lag_seconds: float, interval: float):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.interval = interval
+        self.lag_seconds = None
+        self.checked_at = None
+        self._check_lock = threading.Lock()
+
+    def due(self) -> bool:
+        return (
+            self.checked_at is None
+            or time.monotonic() - self.checked_at >= self.interval
+        )
+
+    def check(self):
+        # One request measures while the others use the last measurement
+        if not self._check_lock.acquire(blocking=False):
+            return
+        # Keep the check out of the triggering request's query stats
+        stats_token = current_query_stats.set(None)
+        try:
+            if self.engine.dialect.name != "postgresql":
+                self.lag_seconds = 0.0
+                return
+            with self.engine.connect() as connection:
+                self.lag_seconds = float(
+                    connection.execute(REPLICA_LAG_QUERY).scalar()
+                )
+        except Exception:
+            # Treat an unreachable replica as unusable until the next check
+            self.lag_seconds = None
+        finally:
+            self.checked_at = time.monotonic()
+            current_query_stats.reset(stats_token)
+            self._check_lock.release()
+
+    def usable(self) -> bool:
+        return (
+            self.lag_seconds is not None
+            and self.lag_seconds <= self.max_lag_seconds
+        )
+
+    def sticky_seconds(self) -> float:
+        # Outlast the largest lag the replica may have between checks
+        return self.max_lag_seconds + self.interval
+
+    def stats(self) -> dict:
+        return {
+            "usable": self.usable(),
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+
+class QueryStats:
+    """
+    Statements run and time spent in the database on behalf of one request.
+    """
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope or {}
+        self.count = 0
+        self.seconds = 0.0
+
+    @property
+    def route(self) -> Optional[str]:
+        route = self.scope.get("route")
+        return getattr(route, "path", None)
+
+
+# Stats of the request being handled, shared with the threads it runs on
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, *args):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, *args):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    if DB_SLOW_QUERY_MS and elapsed * 1000 >= DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed * 1000,
+            stats.route if stats and stats.route else "-",
+            statement,
+        )
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    connection = exception_context.connection
+    started = connection.info.get("query_started") if connection else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine):
+    """
+    Adds statement counting and slow-query logging to an engine. Takes a sync
+    engine; pass async engines' sync_engine.
+    """
+
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def engine_options(database_url: str) -> dict:
+    """
+    Returns create_engine() keyword arguments for the pool settings in the
+    environment.
+    """
+
+    pre_ping = os.getenv("DB_POOL_PRE_PING", "true").lower() != "false"
+    options = {
+        "pool_pre_ping": pre_ping,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+
+    # Other backends keep their default pool
+    if make_url(database_url).get_backend_name() != "postgresql":
+        return options
 
+    connect_args = {
+        "application_name": os.getenv("DB_APPLICATION_NAME", "getloopdin-api")
+    }
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    if statement_timeout > 0:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout}"
 
-def init_engine_and_session(database_url: str):
-    global engine, SessionLocal
-    engine = create_engine(database_url)
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        connect_args=connect_args,
+    )
+    return options
+
+
+def async_engine_options(database_url: str) -> dict:
+    """
+    Returns create_async_engine() keyword arguments for asyncpg with the same
+    settings as engine_options().
+    """
+
+    options = engine_options(database_url)
+    options["poolclass"] = InstrumentedAsyncQueuePool
+    connect_args = options.pop("connect_args")
+    server_settings = {"application_name": connect_args["application_name"]}
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    if statement_timeout > 0:
+        server_settings["statement_timeout"] = str(statement_timeout)
+    options["connect_args"] = {"server_settings": server_settings}
+    return options
+
+
+def init_engine_and_session(
+    database_url: str, replica_url: Optional[str] = None
+):
+    global engine, SessionLocal, async_engine, AsyncSessionLocal
+    engine = create_engine(database_url, **engine_options(database_url))
+    instrument_engine(engine)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+    # Add the async engine for Postgres when asyncpg is available
+    async_engine = AsyncSessionLocal = None
+    url = make_url(database_url)
+    use_async = os.getenv("DB_ASYNC_DRIVER", "false").lower() == "true"
+    if use_async and asyncpg and url.get_backend_name() == "postgresql":
+        async_engine = create_async_engine(
+            url.set(drivername="postgresql+asyncpg"),
+            **async_engine_options(database_url),
+        )
+        instrument_engine(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+
+    init_replica_engine_and_session(replica_url)
+
+
+def init_replica_engine_and_session(replica_url: Optional[str]):
+    """
+    Sets up the read replica's engines and lag monitor, or removes them when
+    replica_url is empty.
+    """
+
+    global replica_engine, ReplicaSessionLocal, async_replica_engine
+    global AsyncReplicaSessionLocal, replica_monitor
+    if replica_engine is not None:
+        replica_engine.dispose()
+    replica_engine = ReplicaSessionLocal = None
+    async_replica_engine = AsyncReplicaSessionLocal = replica_monitor = None
+    if not replica_url:
+        return
+
+    options = engine_options(replica_url)
+    replica_engine = create_engine(replica_url, **options)
+    instrument_engine(replica_engine)
+    ReplicaSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=replica_engine,
+        info={"replica": True},
+    )
+    replica_monitor = ReplicaMonitor(
+        replica_engine,
+        max_lag_seconds=float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5")),
+        interval=float(os.getenv("DB_REPLICA_CHECK_SECONDS", "1")),
+    )
+
+    # Mirror the primary's async engine
+    if async_engine is not None:
+        url = make_url(replica_url)
+        async_replica_engine = create_async_engine(
+            url.set(drivername="postgresql+asyncpg"),
+            **async_engine_options(replica_url),
+        )
+        instrument_engine(async_replica_engine.sync_engine)
+        AsyncReplicaSessionLocal = async_sessionmaker(
+            async_replica_engine,
+            autoflush=False,
+            expire_on_commit=False,
+            info={"replica": True},
+        )
+
+
+async def dispose_async_engine():
+    """
+    Closes the async engines' connections. asyncpg connections belong to the
+    event loop that opened them, so call this before that loop stops.
+    """
+
+    for engine_to_dispose in (async_engine, async_replica_engine):
+        if engine_to_dispose is not None:
+            await engine_to_dispose.dispose()
+
+
+def get_pool_stats() -> dict:
+    """
+    Returns each engine's connection pool usage and checkout waits, keyed by
+    engine: primary, replica, and primary_async and replica_async for the
+    asyncpg engines. Leaves out engines that are not set up or whose pool is
+    not instrumented.
+    """
+
+    engines = {
+        "primary": engine,
+        "primary_async": async_engine,
+        "replica": replica_engine,
+        "replica_async": async_replica_engine,
+    }
+    return {
+        name: pool_engine.pool.stats()
+        for name, pool_engine in engines.items()
+        if pool_engine is not None
+        and isinstance(pool_engine.pool, InstrumentedQueuePool)
+    }
+
+
+def get_replica_stats() -> dict:
+    """
+    Returns the replica's lag and whether reads use it, or an empty dict if
+    there is no replica.
+    """
+
+    if replica_monitor is None:
+        return {}
+    return replica_monitor.stats()
+
 
 def get_db():
     if SessionLocal is None:
@@ -30,6 +455,81 @@ def get_db():
         db.close()
 
 
+class SyncSessionAdapter:
+    """
+    Gives a sync session the run_sync() interface of AsyncSession, running
+    the work in the thread pool.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    @property
+    def info(self) -> dict:
+        return self.session.info
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+@asynccontextmanager
+async def open_async_session(async_session_factory, session_factory):
+    """
+    Opens a session on an async engine, or a SyncSessionAdapter over a sync
+    session when there is no async engine.
+    """
+
+    if async_session_factory is not None:
+        async with async_session_factory() as db:
+            yield db
+        return
+
+    db = session_factory()
+    try:
+        yield SyncSessionAdapter(db)
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None and SessionLocal is None:
+        raise RuntimeError(
+            "SessionLocal is not initialized. Call init_engine_and_session(database_url) first."
+        )
+    async with open_async_session(AsyncSessionLocal, SessionLocal) as db:
+        yield db
+
+
+def reads_primary(request: Request) -> bool:
+    """
+    Checks whether a request's reads must use the primary: there is no usable
+    replica, or the client wrote recently. Call after refreshing the monitor.
+    """
+
+    if replica_monitor is None or not replica_monitor.usable():
+        return True
+    try:
+        until = float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+async def get_async_read_db(request: Request, db=Depends(get_async_db)):
+    if replica_monitor is not None and replica_monitor.due():
+        await run_in_threadpool(replica_monitor.check)
+    if reads_primary(request):
+        # Share the request's primary session rather than taking a second
+        # connection from the pool
+        yield db
+        return
+
+    async with open_async_session(
+        AsyncReplicaSessionLocal, ReplicaSessionLocal
+    ) as db:
+        yield db
+
+
 def create_tables():
     if engine is None:
         raise RuntimeError(
@@ -3,15 +3,27 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from src.main import database
 from src.main.database import engine, init_engine_and_session
 from src.main.routers import (
     auth_router,
     invite_router,
+    metrics_router,
     private_event_router,
+    profiling_router,
     public_event_router,
     question_router,
     user_router,
 )
+from src.main.utils import (
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+    email_outbox_worker,
+    invalidation_bus,
+    password_pool,
+)
 
 
 # Initialize database engine and session
@@ -20,8 +32,17 @@ async def lifespan(app: FastAPI):
     if engine is None:
         DATABASE_URL = os.getenv("DATABASE_URL")
         if DATABASE_URL:
-            init_engine_and_session(DATABASE_URL)
+            init_engine_and_session(
+                DATABASE_URL, os.getenv("REPLICA_DATABASE_URL")
+            )
+    if os.getenv("EMAIL_OUTBOX_WORKER", "true").lower() != "false":
+        email_outbox_worker.start()
+    invalidation_bus.start(database.engine)
     yield
+    invalidation_bus.stop()
+    email_outbox_worker.stop()
+    password_pool.shutdown()
+    await database.dispose_async_engine()
 
 
 # Initialize the FastAPI app
@@ -41,12 +62,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ProfilingMiddleware, routes=app.router.routes)
+# Outermost, so request timings include the other middleware
+app.add_middleware(MetricsMiddleware)
 
 # Register all routes from each router with the app
 app.include_router(auth_router.router)
 app.include_router(invite_router.router)
+app.include_router(metrics_router.router)
 app.include_router(private_event_router.router)
+app.include_router(profiling_router.router)
 app.include_router(public_event_router.router)
 app.include_router(question_router.router)
 app.include_router(user_router.router)
@@ -1,3 +1,4 @@
+from .email_outbox import *
 from .event import *
 from .invite import *
 from .question import *
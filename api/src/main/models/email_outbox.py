@@ -0,0 +1,48 @@
+"""
+SQLAlchemy ORM model for EmailOutbox entities.
+
+Defines the structure of the email_outbox table in the database. Emails are
+written to the outbox in the same transaction as the change that triggers them
+and delivered later by a background worker.
+"""
+
+from sqlalchemy import TIMESTAMP, Column, Index, Integer, String, Text, text
+from sqlalchemy.sql import func
+from src.main.database import Base
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_pending_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    # Application Data
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(
+        String, nullable=False, default="pending", server_default="pending"
+    )
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+
+    # Metadata
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now(),
+        server_default=func.now(),
+    )
+    next_attempt_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now(),
+        server_default=func.now(),
+    )
+    sent_at = Column(TIMESTAMP(timezone=True), nullable=True)
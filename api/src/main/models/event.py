@@ -5,7 +5,15 @@ Defines the structure of the events and participants, and invites tables in
 the database, including columns and constraints.
 """
 
-from sqlalchemy import TIMESTAMP, Column, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    TIMESTAMP,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import backref, relationship
 from src.main.database import Base
 
@@ -20,6 +28,11 @@ class Event(Base):
     start_time = Column(TIMESTAMP(timezone=True), nullable=False)
     end_time = Column(TIMESTAMP(timezone=True), nullable=False)
     address = Column(String, nullable=False)
+
+    # Bumped on every change to the event or its questions, categories or
+    # participants; read endpoints derive their ETags from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     participants = relationship(
         "Participant", back_populates="event", cascade="all, delete-orphan"
     )
@@ -39,6 +52,9 @@ class Event(Base):
 # many-to-many relationship between Event and User
 class Participant(Base):
     __tablename__ = "participants"
+    __table_args__ = (
+        Index("ix_participants_user_id_role", "user_id", "role"),
+    )
 
     # Application Data
     role = Column(String, nullable=False)
@@ -5,13 +5,26 @@ Defines the structure of the invites table in the database, including columns
 and constraints.
 """
 
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from src.main.database import Base
 
 
 class Invite(Base):
     __tablename__ = "invites"
+    __table_args__ = (
+        UniqueConstraint(
+            "event_id", "email", name="uq_invites_event_id_email"
+        ),
+        Index("ix_invites_user_id_status", "user_id", "status"),
+    )
 
     # Application Data
     id = Column(Integer, primary_key=True, index=True)
@@ -5,9 +5,20 @@ Defines the structure of the questions and question_askers tables in the databas
 
 Question: Stores questions associated with events and users, including text, status, and ordering fields.
 QuestionAsker: Associates users with questions they have asked, supporting many-to-many relationships between users and questions.
+QuestionTombstone: Records deleted (and, for attendees, unpublished) questions so clients can sync removals incrementally.
 """
 
-from sqlalchemy import TIMESTAMP, Boolean, Column, ForeignKey, Integer, Text
+from sqlalchemy import (
+    TIMESTAMP,
+    Boolean,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.main.database import Base
@@ -15,10 +26,25 @@ from src.main.database import Base
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        Index(
+            "ix_questions_event_id_changed_version",
+            "event_id",
+            "changed_version",
+        ),
+        Index(
+            "ix_questions_event_id_is_published_rank",
+            "event_id",
+            "is_published",
+            # Matches the rank sort key of question listings
+            text("coalesce(published_rank, draft_rank)"),
+        ),
+    )
 
     # Application Data
     answer_text = Column(Text, nullable=True)
     draft_order = Column(Integer, nullable=True)
+    draft_rank = Column(String(collation="C"), nullable=True)
     category_id = Column(
         Integer,
         ForeignKey("question_categories.id", ondelete="SET NULL"),
@@ -30,12 +56,18 @@ class Question(Base):
     id = Column(Integer, primary_key=True, index=True)
     is_published = Column(Boolean, nullable=False, default=False)
     published_order = Column(Integer, nullable=True)
+    published_rank = Column(String(collation="C"), nullable=True)
     question_text = Column(Text, nullable=False)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True
     )
 
     # Metadata
+    changed_version = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Event version the question was last published at (None for drafts)
+    published_version = Column(Integer, nullable=True)
     created_at = Column(
         TIMESTAMP(timezone=True), nullable=False, default=func.now()
     )
@@ -80,9 +112,17 @@ class QuestionAsker(Base):
 
 class QuestionCategory(Base):
     __tablename__ = "question_categories"
+    __table_args__ = (
+        Index(
+            "ix_question_categories_event_id_display_rank",
+            "event_id",
+            "display_rank",
+        ),
+    )
 
     # Application Data
     display_order = Column(Integer, nullable=False)
+    display_rank = Column(String(collation="C"), nullable=True)
     event_id = Column(
         Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False
     )
@@ -100,3 +140,31 @@ class QuestionCategory(Base):
     # Relationships
     event = relationship("Event", back_populates="question_categories")
     questions = relationship("Question", back_populates="category")
+
+
+class QuestionTombstone(Base):
+    __tablename__ = "question_tombstones"
+    __table_args__ = (
+        Index(
+            "ix_question_tombstones_event_id_version", "event_id", "version"
+        ),
+    )
+
+    # Application Data
+    event_id = Column(
+        Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False
+    )
+    id = Column(Integer, primary_key=True)
+    question_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False)
+
+    # Attendees only saw the question if it was published by their cursor
+    published_version = Column(Integer, nullable=True)
+    unpublished = Column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
+
+    # Metadata
+    deleted_at = Column(
+        TIMESTAMP(timezone=True), nullable=False, default=func.now()
+    )
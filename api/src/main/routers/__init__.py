@@ -1,6 +1,8 @@
 from .auth_router import *
 from .invite_router import *
+from .metrics_router import *
 from .private_event_router import *
+from .profiling_router import *
 from .public_event_router import *
 from .question_router import *
 from .user_router import *
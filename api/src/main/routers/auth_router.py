@@ -10,21 +10,24 @@ from fastapi import (
     Response,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from src.main.database import get_db
 from src.main.models import User
 from src.main.schemas import UserRequest, UserResponse
 from src.main.utils import (
+    CachedUser,
     get_current_user_from_token,
+    query_budget,
     set_jwt_cookie_response,
-    verify_password,
+    verify_password_async,
 )
 
 router = APIRouter(tags=["Authentication"], prefix="/api/auth")
 
 
 @router.post("/signin", response_model=UserResponse)
-def signin(user_request: UserRequest, db: Session = Depends(get_db)):
+async def signin(user_request: UserRequest, db: Session = Depends(get_db)):
     """
     Sign in a user with email and password.
 
@@ -38,8 +41,15 @@ def signin(user_request: UserRequest, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If email or password is incorrect.
     """
-    # Try to get the user from the database. Return error if not found.
-    user = db.query(User).filter(User.email == user_request.email).first()
+
+    # Try to get the user from the database, then release the session's
+    # connection so it isn't held while the password is checked
+    def fetch_user():
+        user = db.query(User).filter(User.email == user_request.email).first()
+        db.close()
+        return user
+
+    user = await run_in_threadpool(fetch_user)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,7 +57,9 @@ def signin(user_request: UserRequest, db: Session = Depends(get_db)):
         )
 
     # Verify the user's password. Return error if incorrect.
-    if not verify_password(user_request.password, user.hashed_password):
+    if not await verify_password_async(
+        user_request.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -86,12 +98,13 @@ def signout(request: Request, response: Response):
 
 
 @router.get("/me", response_model=UserResponse)
-def auth_user(user: User = Depends(get_current_user_from_token)):
+@query_budget(1)
+def auth_user(user: CachedUser = Depends(get_current_user_from_token)):
     """
     Get the current user from the JWT token in the cookie.
 
     Args:
-        user (User): Current authenticated user from token.
+        user (CachedUser): Current authenticated user from token.
 
     Returns:
         UserResponse: The current user details.
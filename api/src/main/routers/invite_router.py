@@ -1,21 +1,37 @@
-import os
 import uuid
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from src.main.database import get_db
-from src.main.models.event import Event, Participant
+from src.main.models.email_outbox import EmailOutbox
+from src.main.models.event import Participant
 from src.main.models.invite import Invite
 from src.main.models.user import User
 from src.main.schemas.invite_schema import (
+    InviteBulkCreate,
+    InviteBulkOut,
     InviteCreate,
     InviteOut,
     InviteStatusUpdate,
 )
 from src.main.utils import (
+    bump_event_version,
+    email_outbox_worker,
+    enqueue_invite_email,
     get_current_user_from_token,
-    send_invite_email,
+    get_jwt_user_data,
+    invite_email_values,
+    page_params,
+    paginate,
+    query_budget,
+    resolve_user_event_access,
+    serialize_invite,
     serialize_inviteout,
+    serialize_invites,
+    set_next_cursor,
 )
 
 router = APIRouter(tags=["Invites"], prefix="/api/invites")
@@ -29,7 +45,7 @@ router = APIRouter(tags=["Invites"], prefix="/api/invites")
 def create_invite(
     invite_details: InviteCreate = Body(...),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    jwt_payload: dict = Depends(get_jwt_user_data),
 ):
     """
     Create a new invite for a participant to an event.
@@ -37,7 +53,7 @@ def create_invite(
     Args:
         invite_details (InviteCreate): Invite details from request body, including event_id, email, and role.
         db (Session): Database session.
-        user (User): Current authenticated user (host).
+        jwt_payload (dict): JWT payload of the current user (host).
 
     Returns:
         InviteOut: The created invite object.
@@ -45,36 +61,13 @@ def create_invite(
     Raises:
         HTTPException: If not authorized or invite already exists.
     """
-    # Fetch event from the DB
-    event = db.query(Event).filter(Event.id == invite_details.event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found.")
-    is_host = (
-        db.query(Participant)
-        .filter(
-            Participant.event_id == invite_details.event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
+    # Fetch event and the current user's role in it from the DB
+    access = resolve_user_event_access(
+        db, invite_details.event_id, jwt_payload, "Event not found."
     )
-    if not is_host:
+    if not access.is_host:
         raise HTTPException(status_code=403, detail="Not authorized.")
-
-    # Handle if an invite has already been sent
-    existing_invite = (
-        db.query(Invite)
-        .filter(
-            Invite.event_id == invite_details.event_id,
-            Invite.email == invite_details.email,
-        )
-        .first()
-    )
-    if existing_invite:
-        raise HTTPException(
-            status_code=400,
-            detail="An invitation has already been sent.",
-        )
+    event = access.event
 
     # Fetch the user from the DB if registered
     invited_user = (
@@ -90,17 +83,156 @@ def create_invite(
         user_id=invited_user.id if invited_user else None,
     )
     db.add(new_invite)
+
+    # Handle if an invite has already been sent (unique per event and email)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="An invitation has already been sent.",
+        )
+
+    # Queue invite email with clickable link to the event. It is committed
+    # with the invite and delivered by the outbox worker.
+    enqueue_invite_email(
+        db, invite_details.email, new_invite.token, event.title
+    )
     db.commit()
     db.refresh(new_invite)
+    email_outbox_worker.wake()
+
+    return serialize_inviteout(new_invite, db)
+
+
+@router.post(
+    "/bulk",
+    response_model=InviteBulkOut,
+    summary="Invite many participants at once",
+)
+@query_budget(5)
+def create_invites_bulk(
+    bulk_details: InviteBulkCreate = Body(...),
+    db: Session = Depends(get_db),
+    jwt_payload: dict = Depends(get_jwt_user_data),
+):
+    """
+    Create invites for a list of emails in one request. Existing invites and
+    registered users are looked up with one query each, and all new invites
+    and their emails are inserted in bulk.
 
-    # Send invite email with clickable link to the event
-    event_link = f"{os.environ.get('UI_URL', 'http://localhost')}/events/token/{new_invite.token}"
-    register_link = f"{os.environ.get('UI_URL', 'http://localhost')}/signup?email={invite_details.email}"
-    send_invite_email(
-        invite_details.email, event.title, event_link, register_link
+    Args:
+        bulk_details (InviteBulkCreate): Event ID and the emails and roles to invite.
+        db (Session): Database session.
+        jwt_payload (dict): JWT payload of the current user (host).
+
+    Returns:
+        InviteBulkOut: The outcome for each requested email, in request order.
+
+    Raises:
+        HTTPException: If not authorized or the event does not exist.
+    """
+    # Fetch event and the current user's role in it from the DB
+    event_id = bulk_details.event_id
+    access = resolve_user_event_access(
+        db, event_id, jwt_payload, "Event not found."
     )
+    if not access.is_host:
+        raise HTTPException(status_code=403, detail="Not authorized.")
+    event = access.event
+
+    # Fetch emails that already have an invite to this event
+    emails = {invite.email for invite in bulk_details.invites}
+    already_invited = {
+        email
+        for (email,) in db.query(Invite.email).filter(
+            Invite.event_id == event_id, Invite.email.in_(emails)
+        )
+    }
 
-    return serialize_inviteout(new_invite, db)
+    # Fetch registered users for the remaining emails
+    users_by_email = {
+        user.email: user
+        for user in db.query(User).filter(
+            User.email.in_(emails - already_invited)
+        )
+    }
+
+    # Classify each requested email
+    outcomes = []
+    new_rows = []
+    seen = set()
+    for requested in bulk_details.invites:
+        if requested.email in already_invited:
+            outcomes.append((requested, "already_invited"))
+        elif requested.email in seen:
+            outcomes.append((requested, "duplicate"))
+        else:
+            seen.add(requested.email)
+            outcomes.append((requested, "created"))
+            invited_user = users_by_email.get(requested.email)
+            new_rows.append(
+                {
+                    "event_id": event_id,
+                    "email": requested.email,
+                    "role": requested.role,
+                    "token": str(uuid.uuid4()),
+                    "status": "pending",
+                    "user_id": invited_user.id if invited_user else None,
+                }
+            )
+
+    # Insert the invites and queue their emails in bulk. Invites created
+    # by a concurrent request since the lookup are skipped.
+    created_invites = {}
+    if new_rows:
+        created_invites = {
+            invite.email: invite
+            for invite in db.scalars(
+                pg_insert(Invite)
+                .values(new_rows)
+                .on_conflict_do_nothing(
+                    index_elements=[Invite.event_id, Invite.email]
+                )
+                .returning(Invite)
+            )
+        }
+    if created_invites:
+        db.execute(
+            insert(EmailOutbox),
+            [
+                invite_email_values(invite.email, invite.token, event.title)
+                for invite in created_invites.values()
+            ],
+        )
+
+    # Report the outcome for each requested email (before the commit
+    # expires the loaded rows)
+    results = []
+    for requested, outcome in outcomes:
+        invite = None
+        if outcome == "created" and requested.email not in created_invites:
+            outcome = "already_invited"
+        if outcome == "created":
+            invite = serialize_invite(
+                created_invites[requested.email],
+                event,
+                users_by_email.get(requested.email),
+            )
+        results.append(
+            {
+                "email": requested.email,
+                "role": requested.role,
+                "outcome": outcome,
+                "invite": invite,
+            }
+        )
+
+    db.commit()
+    if created_invites:
+        email_outbox_worker.wake()
+    return {"created": len(created_invites), "results": results}
 
 
 @router.put(
@@ -172,6 +304,7 @@ def update_invite(
                 event_id=invite.event_id, user_id=user.id, role=invite.role
             )
             db.add(event_participant)
+            bump_event_version(db, invite.event_id)
             db.commit()
         db.refresh(invite)
         return serialize_inviteout(invite, db)
@@ -187,7 +320,7 @@ def update_invite(
 def delete_invite(
     invite_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    jwt_payload: dict = Depends(get_jwt_user_data),
 ):
     """
     Delete an invite by its ID.
@@ -195,7 +328,7 @@ def delete_invite(
     Args:
         invite_id (int): ID of the invite to delete.
         db (Session): Database session.
-        user (User): Current authenticated user.
+        jwt_payload (dict): JWT payload of the current user.
 
     Returns:
         None
@@ -203,27 +336,21 @@ def delete_invite(
     Raises:
         HTTPException: If invite not found or not authorized.
     """
+    if not jwt_payload or "sub" not in jwt_payload:
+        raise HTTPException(status_code=401, detail="Not logged in")
+
     # Check that invite exists
     invite = db.query(Invite).filter(Invite.id == invite_id).first()
     if not invite:
         raise HTTPException(status_code=404, detail="Invite not found.")
 
-    # Fetch event from DB (for host check below)
-    event = db.query(Event).filter(Event.id == invite.event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found.")
+    # Fetch event and the current user's role in it (for host check below)
+    access = resolve_user_event_access(
+        db, invite.event_id, jwt_payload, "Event not found."
+    )
 
     # Check that user is a host
-    is_host = (
-        db.query(Participant)
-        .filter(
-            Participant.event_id == event.id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not is_host:
+    if not access.is_host:
         raise HTTPException(status_code=403, detail="Not authorized.")
 
     # Delete the invite
@@ -233,7 +360,9 @@ def delete_invite(
 
 
 @router.get("/", response_model=list[InviteOut])
+@query_budget(4)
 def get_invites(
+    response: Response,
     status: str = Query(
         None, description="Status: pending, accepted, declined, all"
     ),
@@ -241,7 +370,8 @@ def get_invites(
     user_id: int = Query(None, description="Filter by user_id"),
     event_id: int = Query(None, description="Filter by event_id"),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    jwt_payload: dict = Depends(get_jwt_user_data),
+    page: tuple = Depends(page_params),
 ):
     """
     Fetch invites filtered by user_id, event_id, and status.
@@ -252,7 +382,8 @@ def get_invites(
         user_id (int): User ID to filter invites.
         event_id (int): Event ID to filter invites.
         db (Session): Database session.
-        user (User): Current authenticated user.
+        jwt_payload (dict): JWT payload of the current user.
+        page (tuple): Cursor and limit for the page of invites to return.
 
     Returns:
         List[InviteOut]: List of invites matching the filters.
@@ -264,22 +395,11 @@ def get_invites(
 
     # Fetch invites for an event
     if event_id is not None:
-        # Check if event exists
-        event = db.query(Event).filter(Event.id == event_id).first()
-        if not event:
-            raise HTTPException(status_code=404, detail="Event not found.")
-
-        # Check if user is a host
-        is_host = (
-            db.query(Participant)
-            .filter(
-                Participant.event_id == event_id,
-                Participant.user_id == user.id,
-                Participant.role == "host",
-            )
-            .first()
+        # Check if event exists and the user is a host
+        access = resolve_user_event_access(
+            db, event_id, jwt_payload, "Event not found."
         )
-        if not is_host:
+        if not access.is_host:
             raise HTTPException(status_code=403, detail="Not authorized.")
 
         # Fetch invites from DB
@@ -287,6 +407,7 @@ def get_invites(
 
     # Fetch invites for current user
     else:
+        user = get_current_user_from_token(db, jwt_payload)
         invites = db.query(Invite).filter(Invite.user_id == user.id)
 
     # Filter invites by status
@@ -298,5 +419,9 @@ def get_invites(
             )
         invites = invites.filter(Invite.status == status)
 
+    # Fetch a page of invites by id
+    rows, next_cursor = paginate(invites, [(Invite.id, False)], *page)
+    set_next_cursor(response, next_cursor)
+
     # Return serialized invites
-    return [serialize_inviteout(invite, db) for invite in invites]
+    return serialize_invites([row[0] for row in rows], db)
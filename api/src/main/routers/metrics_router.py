@@ -0,0 +1,53 @@
+"""
+API Router for the metrics endpoint
+"""
+
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from src.main.utils import render_metrics
+
+# Bearer token required to scrape metrics. Without one, /metrics is only
+# served when METRICS_PUBLIC=true opts in (e.g. behind an internal network).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    """
+    Export request, database pool and thread pool metrics for Prometheus.
+
+    Args:
+        authorization (str, optional): "Bearer <METRICS_TOKEN>".
+
+    Returns:
+        PlainTextResponse: Metrics in the Prometheus text format.
+
+    Raises:
+        HTTPException: If the token is wrong, or if no token is configured
+            and METRICS_PUBLIC is not set.
+    """
+    # Validate the scraper's token
+    if METRICS_TOKEN:
+        if not secrets.compare_digest(
+            authorization or "", f"Bearer {METRICS_TOKEN}"
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+            )
+    elif not METRICS_PUBLIC:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Metrics are disabled without METRICS_TOKEN",
+        )
+
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,14 +1,32 @@
 from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from src.main.database import get_db
+from src.main.database import get_async_read_db, get_db
 from src.main.models import Event, Participant, User
 from src.main.schemas import EventCreate, EventOut, ParticipantOut
 from src.main.utils import (
+    CachedUser,
+    EventAccess,
+    bump_event_version,
+    get_current_user_async,
     get_current_user_from_token,
-    serialize_participantout,
+    get_user_event_access,
+    get_user_event_access_async,
+    list_participants,
+    list_user_events,
+    page_params,
+    query_budget,
+    set_next_cursor,
 )
 
 router = APIRouter(tags=["PrivateEvents"], prefix="/api/private/events")
@@ -18,7 +36,7 @@ router = APIRouter(tags=["PrivateEvents"], prefix="/api/private/events")
 def create_event(
     event_details: EventCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    user: CachedUser = Depends(get_current_user_from_token),
 ):
     """
     Create a new event hosted by the current user.
@@ -26,7 +44,7 @@ def create_event(
     Args:
         event_details (EventCreate): Event details from request body.
         db (Session): Database session.
-        user (User): Current authenticated user.
+        user (CachedUser): Current authenticated user.
 
     Returns:
         EventOut: The created event with host information.
@@ -57,11 +75,14 @@ def create_event(
 
 
 @router.get("/", response_model=List[EventOut])
-def get_events(
+@query_budget(2)
+async def get_events(
+    response: Response,
     role: str = "participant",
     time: str = "all",
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: CachedUser = Depends(get_current_user_async),
+    page: tuple = Depends(page_params),
 ):
     """
     Fetch events for the current user based on the 'type' query parameter.
@@ -70,6 +91,7 @@ def get_events(
         type (str):
             'host' - returns events the user is hosting.
             'participant' - returns events the user is participating in.
+        page (tuple): Cursor and limit for the page of events to return.
 
     Returns:
         List[EventOut]: List of events matching the query type.
@@ -77,61 +99,38 @@ def get_events(
     Raises:
         HTTPException: If an invalid type is provided.
     """
-    # Save the current time
-    now = datetime.now()
-
-    # Role-based filtering
-    if role == "host":
-        event_ids = (
-            db.query(Participant.event_id)
-            .filter(Participant.user_id == user.id, Participant.role == "host")
-            .subquery()
-        )
-        query = db.query(Event).filter(Event.id.in_(event_ids.select()))
-    elif role == "participant":
-        event_ids = (
-            db.query(Participant.event_id)
-            .filter(Participant.user_id == user.id)
-            .subquery()
-        )
-        query = db.query(Event).filter(Event.id.in_(event_ids.select()))
-    else:
+    # Validate filters
+    if role not in {"host", "participant"}:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid role parameter. Must be 'host' or 'participant'.",
         )
-
-    # Time-based filtering
-    if time == "upcoming":
-        query = query.filter(Event.start_time > now)
-    elif time == "past":
-        query = query.filter(Event.end_time < now)
-    elif time != "all":
+    if time not in {"upcoming", "past", "all"}:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid time parameter. Must be 'upcoming', 'past', or 'all'.",
         )
 
-    events = query.order_by(Event.start_time).all()
-    return [
-        EventOut.model_validate(event, from_attributes=True).model_dump()
-        for event in events
-    ]
+    # Fetch a page of events by start time
+    events, next_cursor = await db.run_sync(
+        list_user_events, user.id, role, time, *page
+    )
+    set_next_cursor(response, next_cursor)
+    return events
 
 
 @router.get("/{event_id}", response_model=EventOut)
-def get_event_by_id(
+@query_budget(1)
+async def get_event_by_id(
     event_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access_async),
 ):
     """
     Retrieve a specific event for the current user.
 
     Args:
         event_id (int): ID of the event to fetch.
-        db (Session): Database session.
-        user (User): Current authenticated user.
+        access (EventAccess): Current user's access to the event.
 
     Returns:
         EventOut: The requested event if found and accessible.
@@ -139,47 +138,35 @@ def get_event_by_id(
     Raises:
         HTTPException: If the event is not found or not accessible.
     """
-    # Fetch the event if the user is a host
-    db_event = (
-        db.query(Event)
-        .join(Participant, Participant.event_id == Event.id)
-        .filter(
-            Event.id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not db_event:
-        # If not a host, fetch the event if the user is a participant
-        db_event = (
-            db.query(Event)
-            .join(Participant, Participant.event_id == Event.id)
-            .filter(Event.id == event_id, Participant.user_id == user.id)
-            .first()
+    # Only hosts and participants can view the event
+    if not access.is_participant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
         )
-        if not db_event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
-            )
 
     # Use event_serialization utility to return an EventFullOut instance
-    return EventOut.model_validate(db_event, from_attributes=True).model_dump()
+    return EventOut.model_validate(
+        access.event, from_attributes=True
+    ).model_dump()
 
 
 @router.get("/{event_id}/participants", response_model=list[ParticipantOut])
-def get_participants_by_event_id(
+@query_budget(1)
+async def get_participants_by_event_id(
     event_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     role: str = Query(None, description="Role: 'host' or 'participant'"),
+    page: tuple = Depends(page_params),
 ):
     """
     Retrieve the list of participants for a public event, optionally filtered by role.
 
     Args:
         event_id (int): ID of the event to fetch participants for.
-        db (Session): Database session.
+        db (AsyncSession): Database session.
         role (str, optional): Role to filter by ('host' or 'participant').
+        page (tuple): Cursor and limit for the page of participants.
 
     Returns:
         List[ParticipantOut]: List of participants for the event.
@@ -187,16 +174,12 @@ def get_participants_by_event_id(
     Raises:
         HTTPException: If the event is not found.
     """
-    # Fetch participants from DB based on filter criteria
-    participants = db.query(Participant).filter(
-        Participant.event_id == event_id
+    # Fetch participants and their names from DB based on filter criteria
+    participants, next_cursor = await db.run_sync(
+        list_participants, event_id, role, *page
     )
-    if role in {"host", "participant"}:
-        participants = participants.filter(Participant.role == role)
-    return [
-        serialize_participantout(participant, db)
-        for participant in participants
-    ]
+    set_next_cursor(response, next_cursor)
+    return participants
 
 
 @router.put("/{event_id}", response_model=EventOut)
@@ -204,7 +187,7 @@ def update_event(
     event_id: int,
     event_data: EventCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
     """
     Update an existing event hosted by the current user.
@@ -213,7 +196,7 @@ def update_event(
         event_id (int): ID of the event to update.
         event_data (EventCreate): Updated event details.
         db (Session): Database session.
-        user (User): Current authenticated user.
+        access (EventAccess): Current user's access to the event.
 
     Returns:
         EventOut: The updated event.
@@ -221,28 +204,20 @@ def update_event(
     Raises:
         HTTPException: If the event is not found or not accessible.
     """
-    # Fetch the event if the user is a host
-    db_event = (
-        db.query(Event)
-        .join(Participant, Participant.event_id == Event.id)
-        .filter(
-            Event.id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not db_event:
+    # Only hosts can update the event
+    if not access.is_host:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
         )
 
     # Update the event details
+    db_event = access.event
     db_event.address = event_data.address
     db_event.description = event_data.description
     db_event.end_time = event_data.end_time
     db_event.start_time = event_data.start_time
     db_event.title = event_data.title
+    bump_event_version(db, event_id)
     db.commit()
     db.refresh(db_event)
 
@@ -253,7 +228,7 @@ def update_event(
 def delete_event(
     event_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
     """
     Delete an event hosted by the current user.
@@ -261,7 +236,7 @@ def delete_event(
     Args:
         event_id (int): ID of the event to delete.
         db (Session): Database session.
-        user (User): Current authenticated user.
+        access (EventAccess): Current user's access to the event.
 
     Returns:
         dict: Confirmation message upon successful deletion.
@@ -269,20 +244,10 @@ def delete_event(
     Raises:
         HTTPException: If the event is not found or not accessible.
     """
-    db_event = (
-        db.query(Event)
-        .join(Participant, Participant.event_id == Event.id)
-        .filter(
-            Event.id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not db_event:
+    if not access.is_host:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
         )
-    db.delete(db_event)
+    db.delete(access.event)
     db.commit()
     return {"detail": "Event deleted"}
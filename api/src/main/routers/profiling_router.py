@@ -0,0 +1,71 @@
+"""
+API Router for profiling live requests
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from src.main.schemas import ProfilingRequest, ProfilingStatusOut
+from src.main.utils import request_profiler, require_admin
+
+router = APIRouter(
+    tags=["Profiling"],
+    prefix="/api/admin/profiling",
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("", response_model=ProfilingStatusOut)
+async def get_profiling_status():
+    """
+    Show how many requests are still to be profiled and the profiles written.
+
+    Returns:
+        ProfilingStatusOut: The profiler's state and profile file names.
+    """
+    return await run_in_threadpool(request_profiler.status)
+
+
+@router.post("", response_model=ProfilingStatusOut)
+async def start_profiling(profiling: ProfilingRequest, request: Request):
+    """
+    Profile the next requests, optionally only those to one route.
+
+    Args:
+        profiling (ProfilingRequest): Number of requests to profile, and the
+            route template and method to match.
+
+    Returns:
+        ProfilingStatusOut: The profiler's state and profile file names.
+
+    Raises:
+        HTTPException: If profiling is unavailable or the route template does
+            not exist.
+    """
+    if not request_profiler.available:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Profiling is unavailable.",
+        )
+
+    # Validate the route template
+    routes = {getattr(route, "path", None) for route in request.app.routes}
+    if profiling.route and profiling.route not in routes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown route.",
+        )
+
+    request_profiler.arm(profiling.count, profiling.route, profiling.method)
+    return await run_in_threadpool(request_profiler.status)
+
+
+@router.delete("", response_model=ProfilingStatusOut)
+async def stop_profiling():
+    """
+    Stop profiling requests.
+
+    Returns:
+        ProfilingStatusOut: The profiler's state and profile file names.
+    """
+    request_profiler.disarm()
+    return await run_in_threadpool(request_profiler.status)
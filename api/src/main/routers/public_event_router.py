@@ -1,24 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from src.main.database import get_db
-from src.main.models import Event, Invite, Participant
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.main.database import get_async_db, get_async_read_db
 from src.main.schemas import EventOut, ParticipantOut
-from src.main.utils import serialize_participantout
+from src.main.utils import (
+    list_participants,
+    page_params,
+    query_budget,
+    resolve_invite,
+    resolve_invite_event,
+    resolve_on_read_db,
+    set_next_cursor,
+)
 
 router = APIRouter(tags=["PublicEvents"], prefix="/api/public/events")
 
 
 @router.get("/token/{token}", response_model=EventOut)
-def get_event_by_token(
+@query_budget(4)
+async def get_event_by_token(
     token: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     Retrieve event details using an invite token.
 
     Args:
         token (str): Invite token from the URL.
-        db (Session): Database session.
+        db (AsyncSession): Database session on the primary.
+        read_db (AsyncSession): Database session for reads (may be a
+            replica).
 
     Returns:
         EventOut: The event associated with the invite token.
@@ -26,37 +37,35 @@ def get_event_by_token(
     Raises:
         HTTPException: If the invite or event is not found or invalid.
     """
-    # Fetch invite from DB
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
-        raise HTTPException(
-            status_code=404, detail="Invalid or expired invite token."
-        )
-
-    # Fetch event associated with invite
-    event = db.query(Event).filter(Event.id == invite.event_id).first()
-    if not event:
-        raise HTTPException(
-            status_code=404, detail="Event not found for this invite."
-        )
+    # Fetch the invite and its event, from the primary if the replica lags
+    event, _ = await resolve_on_read_db(
+        read_db, db, resolve_invite_event, token
+    )
 
     # Return event after converting from a DB object to an EventOut
     return EventOut.model_validate(event, from_attributes=True).model_dump()
 
 
 @router.get("/token/{token}/participants", response_model=list[ParticipantOut])
-def get_participants_by_event_token(
+@query_budget(3)
+async def get_participants_by_event_token(
     token: str,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
     role: str = Query(None, description="Role: 'host' or 'participant'"),
+    page: tuple = Depends(page_params),
 ):
     """
     Retrieve the list of participants for a public event using the event token, optionally filtered by role.
 
     Args:
         token (str): Invite token from the URL.
-        db (Session): Database session.
+        db (AsyncSession): Database session on the primary.
+        read_db (AsyncSession): Database session for reads (may be a
+            replica).
         role (str, optional): Role to filter by ('host' or 'participant').
+        page (tuple): Cursor and limit for the page of participants.
 
     Returns:
         List[ParticipantOut]: List of participants for the event.
@@ -64,20 +73,14 @@ def get_participants_by_event_token(
     Raises:
         HTTPException: If the invite or event is not found or invalid.
     """
-    # Fetch invite from DB
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
-        raise HTTPException(
-            status_code=404, detail="Invalid or expired invite token."
-        )
+    # Fetch invite from DB, from the primary if the replica lags
+    invite, read_db = await resolve_on_read_db(
+        read_db, db, resolve_invite, token
+    )
 
-    # Fetch participants from DB based on filter criteria
-    participants = db.query(Participant).filter(
-        Participant.event_id == invite.event_id
+    # Fetch participants and their names from DB based on filter criteria
+    participants, next_cursor = await read_db.run_sync(
+        list_participants, invite.event_id, role, *page
     )
-    if role in {"host", "participant"}:
-        participants = participants.filter(Participant.role == role)
-    return [
-        serialize_participantout(participant, db)
-        for participant in participants
-    ]
+    set_next_cursor(response, next_cursor)
+    return participants
@@ -1,12 +1,32 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import asc, desc
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    String,
+    asc,
+    case,
+    cast,
+    column,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
-from src.main.database import get_db
+from src.main.database import get_async_db, get_async_read_db, get_db
 from src.main.models import (
-    Event,
     Invite,
     Participant,
     Question,
@@ -16,52 +36,72 @@ from src.main.models import (
 from src.main.schemas import (
     OrderUpdate,
     QuestionCategoryCreate,
+    QuestionCategoryMove,
     QuestionCategoryOrderUpdate,
     QuestionCategoryOut,
     QuestionCategoryUpdate,
+    QuestionChangesOut,
     QuestionCreate,
+    QuestionMove,
     QuestionOut,
     QuestionUpdate,
 )
-from src.main.utils import get_current_user_from_token, serialize_questionout
+from src.main.utils import (
+    MAX_ORDER,
+    EventAccess,
+    bump_event_version,
+    check_etag,
+    etag_headers,
+    event_etag,
+    get_event_access,
+    get_event_access_async,
+    get_published_questions_json,
+    get_question_changes,
+    get_user_event_access,
+    has_event_version,
+    list_question_categories,
+    list_question_page,
+    needs_rebalance,
+    order_rank,
+    page_params,
+    query_budget,
+    rank_after,
+    rank_for_move,
+    rebalance_event_ranks,
+    serialize_questionout,
+    set_next_cursor,
+    stream_questions,
+    tombstone_question,
+    tombstone_unpublished_questions,
+)
 
 router = APIRouter(prefix="/api", tags=["Questions"])
 
 
-@router.get("/events/{event_id}/questions", response_model=list[QuestionOut])
-def get_questions(
+def authorize_question_reader(
+    db: Session,
     event_id: int,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
-    invite_token: Optional[str] = None,
+    access: EventAccess,
+    invite_token: Optional[str],
 ):
-    # Fetch event
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    is_host = False
-    authorized = False
-
-    # Validate authentication (path 1: registered user)
-    if user:
-        participant = (
-            db.query(Participant)
+    """
+    Checks that the request may read the event's questions, either as a
+    participant (path 1) or with an invite token for the event (path 2).
+    Raises HTTP 401 otherwise.
+    """
+    authorized = access.is_participant
+
+    # Validate authentication (path 2: invite token)
+    if not access.user and invite_token:
+        invite = (
+            db.query(Invite)
             .filter(
-                Participant.event_id == event_id,
-                Participant.user_id == user.id,
+                Invite.token == invite_token,
+                Invite.event_id == event_id,
             )
             .first()
         )
-        if participant:
-            authorized = True
-            if participant.role == "host":
-                is_host = True
-
-    # Validate authentication (path 2: invite token)
-    elif invite_token:
-        invite = db.query(Invite).filter(Invite.token == invite_token).first()
-        if invite and invite.event_id == event_id:
+        if invite:
             authorized = True
 
     if not authorized:
@@ -70,90 +110,120 @@ def get_questions(
             detail="Authentication required",
         )
 
-    # Query questions
-    query = db.query(Question).filter(Question.event_id == event_id)
-    if not is_host:
-        query = query.filter(Question.is_published == True)
 
-    questions = query.order_by(
-        desc(Question.is_published),
-        asc(Question.published_order),
-        asc(Question.draft_order),
-    ).all()
+@router.get("/events/{event_id}/questions", response_model=list[QuestionOut])
+@query_budget(3)
+async def get_questions(
+    event_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+    access: EventAccess = Depends(get_event_access_async),
+    invite_token: Optional[str] = None,
+    page: tuple = Depends(page_params),
+):
+    is_host = access.is_host
+    await db.run_sync(
+        authorize_question_reader, event_id, access, invite_token
+    )
 
-    return [serialize_questionout(question) for question in questions]
+    # Answer from the client's copy when nothing has changed
+    cursor, limit = page
+    paged = cursor is not None or limit is not None
+    variant = "questions-host" if is_host else "questions"
+    if paged:
+        variant = f"{variant}-{limit}-{cursor}"
+    etag = event_etag(access.event, variant)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    # Read from the replica once it has the version the ETag names
+    if not await read_db.run_sync(has_event_version, access.event):
+        read_db = db
+
+    # Serve attendees the shared, pre-serialized published list
+    if not is_host and not paged:
+        return Response(
+            content=await read_db.run_sync(
+                get_published_questions_json, access.event
+            ),
+            media_type="application/json",
+            headers=etag_headers(etag),
+        )
+
+    # Query questions and their askers together
+    questions, next_cursor = await read_db.run_sync(
+        list_question_page,
+        event_id,
+        published_only=not is_host,
+        cursor=cursor,
+        limit=limit,
+    )
+    set_next_cursor(response, next_cursor)
+    return questions
 
 
-@router.post("/events/{event_id}/questions", response_model=QuestionOut)
-def create_question(
+@router.get("/events/{event_id}/questions/stream")
+def stream_event_questions(
     event_id: int,
-    payload: QuestionCreate,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_event_access),
+    invite_token: Optional[str] = None,
 ):
-    event = None
-    asker_user_id = None
-
-    # Validate authentication (path 1: registered user)
-    if user:
-        asker_user_id = user.id
-        event = db.query(Event).filter(Event.id == event_id).first()
-        if not event:
-            raise HTTPException(status_code=404, detail="Event not found")
-
-        # Host validation to publish
-        if payload.is_published:
-            is_host = (
-                db.query(Participant)
-                .filter(
-                    Participant.event_id == event_id,
-                    Participant.user_id == user.id,
-                    Participant.role == "host",
-                )
-                .first()
-            )
-            if not is_host:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Only hosts can publish questions",
-                )
+    authorize_question_reader(db, event_id, access, invite_token)
 
-    # Validate authentication (path 2: invite token)
-    else:
-        if not payload.invite_token:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication required",
-            )
+    # Release the connection; the stream reads through the shared hub
+    db.close()
 
-        invite = (
-            db.query(Invite)
-            .filter(Invite.token == payload.invite_token)
-            .first()
-        )
-        if not invite:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Invalid or expired invite token",
-            )
+    # Push a snapshot, then live changes, over server-sent events
+    return StreamingResponse(
+        stream_questions(event_id, access.is_host),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-        # Enforce: invite must match event
-        if event_id != invite.event_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Invite token does not match event",
-            )
 
-        event = db.query(Event).filter(Event.id == invite.event_id).first()
-        if not event:
-            raise HTTPException(status_code=404, detail="Event not found")
+@router.get(
+    "/events/{event_id}/questions/changes",
+    response_model=QuestionChangesOut,
+)
+@query_budget(4)
+async def get_question_changes_since(
+    event_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    access: EventAccess = Depends(get_event_access_async),
+    cursor: Optional[int] = Query(None, ge=0),
+    invite_token: Optional[str] = None,
+):
+    await db.run_sync(
+        authorize_question_reader, event_id, access, invite_token
+    )
 
-        # Anonymous users cannot publish
-        if payload.is_published:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Anonymous users cannot publish questions",
-            )
+    # Return only what changed since the client's last sync
+    return await db.run_sync(
+        get_question_changes, access.event, cursor, access.is_host
+    )
+
+
+@router.post("/events/{event_id}/questions", response_model=QuestionOut)
+def create_question(
+    event_id: int,
+    payload: QuestionCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    access: EventAccess = Depends(get_user_event_access),
+):
+    event = access.event
+    asker_user_id = access.user.id
+
+    # Host validation to publish
+    if payload.is_published and not access.is_host:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only hosts can publish questions",
+        )
 
     # Validate published questions must have answer
     if payload.is_published and not payload.answer_text:
@@ -178,36 +248,25 @@ def create_question(
                 detail="Invalid category for this event",
             )
 
-    # Handle ordering
-    draft_order = None
-    published_order = None
-
-    if payload.is_published:
-        max_published = (
-            db.query(Question.published_order)
-            .filter(
-                Question.event_id == event.id,
-                Question.is_published == True,
-            )
-            .order_by(Question.published_order.desc())
-            .first()
-        )
-        published_order = (
-            (max_published[0] + 1) if max_published and max_published[0] else 1
-        )
-    else:
-        max_draft = (
-            db.query(Question.draft_order)
-            .filter(
-                Question.event_id == event.id,
-                Question.is_published == False,
-            )
-            .order_by(Question.draft_order.desc())
-            .first()
+    # Handle ordering (append to the end of the list)
+    order_column, rank_column = (
+        (Question.published_order, Question.published_rank)
+        if payload.is_published
+        else (Question.draft_order, Question.draft_rank)
+    )
+    max_order, max_rank = (
+        db.query(func.max(order_column), func.max(rank_column))
+        .filter(
+            Question.event_id == event.id,
+            Question.is_published == payload.is_published,
         )
-        draft_order = (max_draft[0] + 1) if max_draft and max_draft[0] else 1
+        .one()
+    )
+    order = (max_order or 0) + 1
+    rank = rank_after(max_rank)
 
     # Create question
+    version = bump_event_version(db, event_id)
     question = Question(
         question_text=payload.question_text,
         answer_text=payload.answer_text,
@@ -215,8 +274,12 @@ def create_question(
         user_id=asker_user_id,
         category_id=payload.category_id,
         is_published=payload.is_published,
-        published_order=published_order,
-        draft_order=draft_order,
+        published_order=order if payload.is_published else None,
+        draft_order=None if payload.is_published else order,
+        published_rank=rank if payload.is_published else None,
+        draft_rank=None if payload.is_published else rank,
+        changed_version=version,
+        published_version=version if payload.is_published else None,
     )
 
     db.add(question)
@@ -233,69 +296,264 @@ def create_question(
 
     db.commit()
     db.refresh(question)
+
+    # Appends only outgrow the limit once the end of the key space is used
+    if needs_rebalance(rank):
+        background_tasks.add_task(rebalance_event_ranks, event_id)
     return serialize_questionout(question)
 
 
 @router.put("/events/{event_id}/questions/order", status_code=204)
+@query_budget(6)
 def reorder_questions(
     event_id: int,
     payload: OrderUpdate,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
-    # Validate authentication
-    if not user:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
     # Validate host
-    is_host = (
-        db.query(Participant)
-        .filter(
-            Participant.event_id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
+    if not access.is_host:
+        raise HTTPException(
+            status_code=403, detail="Only hosts can reorder questions"
         )
-        .first()
+
+    # Keep the last change per question, as applying them in order would
+    items = list({item.question_id: item for item in payload.items}.values())
+    if not items:
+        return
+
+    # Fetch all questions being reordered in one query
+    answers = dict(
+        db.query(Question.id, Question.answer_text).filter(
+            Question.id.in_([item.question_id for item in items]),
+            Question.event_id == event_id,
+        )
+    )
+    for item in payload.items:
+        if item.question_id not in answers:
+            raise HTTPException(status_code=404, detail="Question not found")
+
+        # Every question sorts by the rank of the list it ends up in
+        orders = (item.published_order, item.draft_order)
+        if orders[0 if item.is_published else 1] is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Questions must have an order in their list",
+            )
+        if any(
+            order is not None and not 1 <= order <= MAX_ORDER
+            for order in orders
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Orders must be between 1 and {MAX_ORDER}",
+            )
+
+        # Publishing requires answer
+        if item.is_published and not answers[item.question_id]:
+            raise HTTPException(
+                status_code=400,
+                detail="Published questions must include an answer",
+            )
+
+    # Apply every change with a single UPDATE ... FROM (VALUES ...)
+    version = bump_event_version(db, event_id)
+    unpublished_ids = [
+        item.question_id for item in items if not item.is_published
+    ]
+    if unpublished_ids:
+        tombstone_unpublished_questions(db, event_id, unpublished_ids, version)
+    changes = values(
+        column("id", Integer),
+        column("is_published", Boolean),
+        column("category_id", Integer),
+        column("published_order", Integer),
+        column("draft_order", Integer),
+        column("published_rank", String),
+        column("draft_rank", String),
+        name="changes",
+    ).data(
+        [
+            (
+                item.question_id,
+                item.is_published,
+                item.category_id,
+                item.published_order,
+                item.draft_order,
+                # Keep rank keys in step with the integer orders
+                (
+                    order_rank(item.published_order)
+                    if item.published_order is not None
+                    else None
+                ),
+                (
+                    order_rank(item.draft_order)
+                    if item.draft_order is not None
+                    else None
+                ),
+            )
+            for item in items
+        ]
     )
-    if not is_host:
+    is_published = cast(changes.c.is_published, Boolean)
+    db.execute(
+        update(Question)
+        .where(
+            Question.id == changes.c.id,
+            Question.event_id == event_id,
+        )
+        .values(
+            is_published=is_published,
+            category_id=cast(changes.c.category_id, Integer),
+            published_order=cast(changes.c.published_order, Integer),
+            draft_order=cast(changes.c.draft_order, Integer),
+            published_rank=cast(changes.c.published_rank, String),
+            draft_rank=cast(changes.c.draft_rank, String),
+            changed_version=version,
+            updated_at=func.now(),
+            published_at=case(
+                (
+                    is_published,
+                    func.coalesce(Question.published_at, func.now()),
+                ),
+                else_=None,
+            ),
+            published_version=case(
+                (
+                    is_published,
+                    func.coalesce(Question.published_version, version),
+                ),
+                else_=None,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+@router.put("/events/{event_id}/questions/{question_id}/move", status_code=204)
+@query_budget(8)
+def move_question(
+    event_id: int,
+    question_id: int,
+    payload: QuestionMove,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    access: EventAccess = Depends(get_user_event_access),
+):
+    # Validate host
+    if not access.is_host:
         raise HTTPException(
             status_code=403, detail="Only hosts can reorder questions"
         )
 
-    # Fetch question
-    now = func.now()
-    for item in payload.items:
-        question = (
-            db.query(Question)
+    # Fetch the question and its new neighbours in one query
+    neighbour_ids = {payload.previous_id, payload.next_id} - {None}
+    if question_id in neighbour_ids:
+        raise HTTPException(
+            status_code=400, detail="A question cannot be its own neighbour"
+        )
+    questions = {
+        question.id: question
+        for question in db.query(Question)
+        .filter(
+            Question.id.in_(neighbour_ids | {question_id}),
+            Question.event_id == event_id,
+        )
+        .with_for_update()
+    }
+    if len(questions) != len(neighbour_ids) + 1:
+        raise HTTPException(status_code=404, detail="Question not found")
+    if any(
+        questions[neighbour_id].is_published != payload.is_published
+        for neighbour_id in neighbour_ids
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Neighbouring questions must be in the destination list",
+        )
+
+    # Publishing requires answer
+    question = questions[question_id]
+    if payload.is_published and not question.answer_text:
+        raise HTTPException(
+            status_code=400,
+            detail="Published questions must include an answer",
+        )
+
+    # Validate category
+    if payload.category_id is not None:
+        category = (
+            db.query(QuestionCategory.id)
             .filter(
-                Question.id == item.question_id,
-                Question.event_id == event_id,
+                QuestionCategory.id == payload.category_id,
+                QuestionCategory.event_id == event_id,
             )
             .first()
         )
-        if not question:
-            raise HTTPException(status_code=404, detail="Question not found")
-
-        # Publishing requires answer
-        if item.is_published and not question.answer_text:
+        if not category:
             raise HTTPException(
                 status_code=400,
-                detail="Published questions must include an answer",
+                detail="Invalid category for this event",
             )
 
-        question.is_published = item.is_published
-        question.category_id = item.category_id
-        question.published_order = item.published_order
-        question.draft_order = item.draft_order
-        question.updated_at = now
+    # Generate a rank between the new neighbours
+    rank_column = (
+        Question.published_rank
+        if payload.is_published
+        else Question.draft_rank
+    )
+    others = db.query(Question).filter(
+        Question.event_id == event_id,
+        Question.is_published == payload.is_published,
+        Question.id != question_id,
+    )
+    ranks = {
+        neighbour_id: getattr(questions[neighbour_id], rank_column.key)
+        for neighbour_id in neighbour_ids
+    }
+    try:
+        rank = rank_for_move(
+            others,
+            rank_column,
+            ranks.get(payload.previous_id),
+            ranks.get(payload.next_id),
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="previous_id must come before next_id",
+        )
+
+    # Bump first so the row is written in a single UPDATE
+    version = bump_event_version(db, event_id)
 
-        if item.is_published:
-            question.published_at = question.published_at or now
-        else:
-            question.published_at = None
+    # Integer orders of the old list no longer apply after a list change
+    if question.is_published != payload.is_published:
+        question.published_order = None
+        question.draft_order = None
+        if question.is_published:
+            tombstone_question(db, question, version, unpublished=True)
+        question.published_version = version if payload.is_published else None
 
+    question.is_published = payload.is_published
+    question.category_id = payload.category_id
+    question.published_rank = rank if payload.is_published else None
+    question.draft_rank = None if payload.is_published else rank
+    question.updated_at = func.now()
+
+    if payload.is_published:
+        question.published_at = question.published_at or func.now()
+    else:
+        question.published_at = None
+
+    question.changed_version = version
     db.commit()
 
+    # Shorten the event's keys once they have grown too long
+    if needs_rebalance(rank):
+        background_tasks.add_task(rebalance_event_ranks, event_id)
+
 
 @router.put(
     "/events/{event_id}/questions/{question_id}", response_model=QuestionOut
@@ -305,23 +563,10 @@ def update_question(
     question_id: int,
     payload: QuestionUpdate,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
-    # Validate auth
-    if not user:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
     # Validate host
-    is_host = (
-        db.query(Participant)
-        .filter(
-            Participant.event_id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not is_host:
+    if not access.is_host:
         raise HTTPException(
             status_code=403, detail="Only hosts can update questions"
         )
@@ -339,6 +584,7 @@ def update_question(
         raise HTTPException(status_code=404, detail="Question not found")
 
     # Update question
+    question.changed_version = bump_event_version(db, event_id)
     if payload.question_text is not None:
         question.question_text = payload.question_text
 
@@ -387,23 +633,10 @@ def delete_question(
     event_id: int,
     question_id: int,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
-    # Validate authentication (registered user)
-    if not user:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
     # Validate authorization (host)
-    is_host = (
-        db.query(Participant)
-        .filter(
-            Participant.event_id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not is_host:
+    if not access.is_host:
         raise HTTPException(
             status_code=403, detail="Only hosts can delete questions"
         )
@@ -420,6 +653,8 @@ def delete_question(
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
 
+    # Leave a tombstone for clients syncing incrementally
+    tombstone_question(db, question, bump_event_version(db, event_id))
     db.delete(question)
     db.commit()
 
@@ -428,53 +663,27 @@ def delete_question(
     "/events/{event_id}/question-categories",
     response_model=list[QuestionCategoryOut],
 )
-def get_question_categories(
+@query_budget(2)
+async def get_question_categories(
     event_id: int,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    access: EventAccess = Depends(get_event_access_async),
     invite_token: Optional[str] = None,
 ):
-    # Fetch event
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    authorized = False
-
-    # Authenticate user (path 1: registered user)
-    if user:
-        participant = (
-            db.query(Participant)
-            .filter(
-                Participant.event_id == event_id,
-                Participant.user_id == user.id,
-            )
-            .first()
-        )
-        if participant:
-            authorized = True
-
-    # Authenticate user (path 2: invite token)
-    elif invite_token:
-        invite = (
-            db.query(Invite)
-            .filter(
-                Invite.token == invite_token,
-                Invite.event_id == event_id,
-            )
-            .first()
-        )
-        if invite:
-            authorized = True
-    if not authorized:
-        raise HTTPException(status_code=401, detail="Authentication required")
+    await db.run_sync(
+        authorize_question_reader, event_id, access, invite_token
+    )
 
-    return (
-        db.query(QuestionCategory)
-        .filter(QuestionCategory.event_id == event_id)
-        .order_by(asc(QuestionCategory.display_order))
-        .all()
+    # Answer from the client's copy when nothing has changed
+    not_modified = check_etag(
+        request, response, event_etag(access.event, "categories")
     )
+    if not_modified:
+        return not_modified
+
+    return await db.run_sync(list_question_categories, event_id)
 
 
 @router.post(
@@ -484,42 +693,39 @@ def get_question_categories(
 def create_question_category(
     event_id: int,
     payload: QuestionCategoryCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
-    if not user:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    is_host = (
-        db.query(Participant)
-        .filter(
-            Participant.event_id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not is_host:
+    if not access.is_host:
         raise HTTPException(
             status_code=403, detail="Only hosts can create categories"
         )
 
-    max_order = (
-        db.query(QuestionCategory.display_order)
+    # Append to the end of the list
+    max_order, max_rank = (
+        db.query(
+            func.max(QuestionCategory.display_order),
+            func.max(QuestionCategory.display_rank),
+        )
         .filter(QuestionCategory.event_id == event_id)
-        .order_by(QuestionCategory.display_order.desc())
-        .first()
+        .one()
     )
 
     category = QuestionCategory(
         event_id=event_id,
         name=payload.name,
-        display_order=(max_order[0] + 1) if max_order else 1,
+        display_order=(max_order or 0) + 1,
+        display_rank=rank_after(max_rank),
     )
 
     db.add(category)
+    bump_event_version(db, event_id)
     db.commit()
     db.refresh(category)
+
+    if needs_rebalance(category.display_rank):
+        background_tasks.add_task(rebalance_event_ranks, event_id)
     return category
 
 
@@ -531,23 +737,10 @@ def reorder_question_categories(
     event_id: int,
     payload: QuestionCategoryOrderUpdate,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
-    # Validate authentication
-    if not user:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
     # Validation authorization (host)
-    is_host = (
-        db.query(Participant)
-        .filter(
-            Participant.event_id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not is_host:
+    if not access.is_host:
         raise HTTPException(
             status_code=403, detail="Only hosts can reorder categories"
         )
@@ -583,36 +776,94 @@ def reorder_question_categories(
             raise HTTPException(status_code=404, detail="Category not found")
 
         category.display_order = item.display_order
+        category.display_rank = order_rank(item.display_order)
         category.updated_at = now
 
+    bump_event_version(db, event_id)
     db.commit()
     return category
 
 
 @router.put(
-    "/events/{event_id}/question-categories/{category_id}",
-    response_model=QuestionCategoryOut,
+    "/events/{event_id}/question-categories/{category_id}/move",
+    status_code=204,
 )
-def update_question_category(
+def move_question_category(
     event_id: int,
     category_id: int,
-    payload: QuestionCategoryUpdate,
+    payload: QuestionCategoryMove,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
-    if not user:
-        raise HTTPException(status_code=401, detail="Authentication required")
+    if not access.is_host:
+        raise HTTPException(
+            status_code=403, detail="Only hosts can reorder categories"
+        )
 
-    is_host = (
-        db.query(Participant)
+    # Fetch the category and its new neighbours in one query
+    neighbour_ids = {payload.previous_id, payload.next_id} - {None}
+    if category_id in neighbour_ids:
+        raise HTTPException(
+            status_code=400, detail="A category cannot be its own neighbour"
+        )
+    categories = {
+        category.id: category
+        for category in db.query(QuestionCategory)
         .filter(
-            Participant.event_id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
+            QuestionCategory.id.in_(neighbour_ids | {category_id}),
+            QuestionCategory.event_id == event_id,
         )
-        .first()
+        .with_for_update()
+    }
+    if len(categories) != len(neighbour_ids) + 1:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    # Generate a rank between the new neighbours
+    others = db.query(QuestionCategory).filter(
+        QuestionCategory.event_id == event_id,
+        QuestionCategory.id != category_id,
     )
-    if not is_host:
+    ranks = {
+        neighbour_id: categories[neighbour_id].display_rank
+        for neighbour_id in neighbour_ids
+    }
+    try:
+        rank = rank_for_move(
+            others,
+            QuestionCategory.display_rank,
+            ranks.get(payload.previous_id),
+            ranks.get(payload.next_id),
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="previous_id must come before next_id",
+        )
+
+    category = categories[category_id]
+    category.display_rank = rank
+    category.updated_at = func.now()
+    bump_event_version(db, event_id)
+    db.commit()
+
+    # Shorten the event's keys once they have grown too long
+    if needs_rebalance(rank):
+        background_tasks.add_task(rebalance_event_ranks, event_id)
+
+
+@router.put(
+    "/events/{event_id}/question-categories/{category_id}",
+    response_model=QuestionCategoryOut,
+)
+def update_question_category(
+    event_id: int,
+    category_id: int,
+    payload: QuestionCategoryUpdate,
+    db: Session = Depends(get_db),
+    access: EventAccess = Depends(get_user_event_access),
+):
+    if not access.is_host:
         raise HTTPException(
             status_code=403, detail="Only hosts can update categories"
         )
@@ -632,6 +883,7 @@ def update_question_category(
         category.name = payload.name
 
     category.updated_at = func.now()
+    bump_event_version(db, event_id)
     db.commit()
     db.refresh(category)
     return category
@@ -645,21 +897,9 @@ def delete_question_category(
     event_id: int,
     category_id: int,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user_from_token),
+    access: EventAccess = Depends(get_user_event_access),
 ):
-    if not user:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    is_host = (
-        db.query(Participant)
-        .filter(
-            Participant.event_id == event_id,
-            Participant.user_id == user.id,
-            Participant.role == "host",
-        )
-        .first()
-    )
-    if not is_host:
+    if not access.is_host:
         raise HTTPException(
             status_code=403, detail="Only hosts can delete categories"
         )
@@ -675,5 +915,10 @@ def delete_question_category(
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
+    # Its questions lose their category
+    version = bump_event_version(db, event_id)
+    db.query(Question).filter(Question.category_id == category_id).update(
+        {Question.changed_version: version}, synchronize_session=False
+    )
     db.delete(category)
     db.commit()
@@ -3,13 +3,18 @@ API Router for User CRUD endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from src.main.database import get_db
 from src.main.models import Invite, User
 from src.main.schemas import UserCreate, UserResponse
 from src.main.utils import (
+    CachedUser,
+    bump_user_event_versions,
     get_current_user_from_token,
-    hash_password,
+    hash_password_async,
+    invalidate_cached_user,
+    record_user_question_changes,
     set_jwt_cookie_response,
 )
 
@@ -17,7 +22,7 @@ router = APIRouter(tags=["Users"], prefix="/api/users")
 
 
 @router.post("/", response_model=UserResponse)
-def create_user(
+async def create_user(
     user: UserCreate, db: Session = Depends(get_db), response: Response = None
 ):
     """
@@ -34,45 +39,73 @@ def create_user(
     Raises:
         HTTPException: If an account already exists for the email.
     """
-    existing_user = db.query(User).filter(User.email == user.email).first()
-    if existing_user and existing_user.is_registered == True:
+
+    def is_registered():
+        registered = (
+            db.query(User.id)
+            .filter(User.email == user.email, User.is_registered == True)
+            .first()
+        )
+        # Return the connection so none is held while waiting on bcrypt
+        db.rollback()
+        return registered is not None
+
+    # Reject existing accounts before paying for a hash
+    if await run_in_threadpool(is_registered):
         raise HTTPException(
-            status_code=400, detail="An account already exists for this email."
+            status_code=400,
+            detail="An account already exists for this email.",
         )
+    hashed_password = await hash_password_async(user.password)
 
-    # Register the user's account if email already exists in the DB
-    if existing_user and existing_user.is_registered == False:
-        existing_user.first_name = user.first_name
-        existing_user.last_name = user.last_name
-        existing_user.is_registered = True
-        existing_user.hashed_password = hash_password(user.password)
-        db.commit()
-        db.refresh(existing_user)
-        user_obj = existing_user
-
-    # Otherwise, create a new user
-    else:
-        new_user = User(
-            email=user.email,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            is_registered=True,
-            hashed_password=hash_password(user.password),
+    def save_user():
+        existing_user = db.query(User).filter(User.email == user.email).first()
+        if existing_user and existing_user.is_registered == True:
+            raise HTTPException(
+                status_code=400,
+                detail="An account already exists for this email.",
+            )
+
+        # Register the user's account if email already exists in the DB
+        if existing_user and existing_user.is_registered == False:
+            existing_user.first_name = user.first_name
+            existing_user.last_name = user.last_name
+            existing_user.is_registered = True
+            existing_user.hashed_password = hashed_password
+
+            # Drop any cached copy of the user now that the account changed
+            invalidate_cached_user(db, existing_user.email)
+            db.commit()
+            db.refresh(existing_user)
+            user_obj = existing_user
+
+        # Otherwise, create a new user
+        else:
+            new_user = User(
+                email=user.email,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                is_registered=True,
+                hashed_password=hashed_password,
+            )
+            db.add(new_user)
+            db.commit()
+            db.refresh(new_user)
+            user_obj = new_user
+
+        # Backfill invites for this email
+        invites = (
+            db.query(Invite)
+            .filter(Invite.email == user_obj.email, Invite.user_id == None)
+            .all()
         )
-        db.add(new_user)
+        for invite in invites:
+            invite.user_id = user_obj.id
         db.commit()
-        db.refresh(new_user)
-        user_obj = new_user
-
-    # Backfill invites for this email
-    invites = (
-        db.query(Invite)
-        .filter(Invite.email == user_obj.email, Invite.user_id == None)
-        .all()
-    )
-    for invite in invites:
-        invite.user_id = user_obj.id
-    db.commit()
+        db.refresh(user_obj)
+        return user_obj
+
+    user_obj = await run_in_threadpool(save_user)
 
     # Sign in the user upon creation by setting the JWT cookie
     return set_jwt_cookie_response(user_obj, response_model=UserResponse)
@@ -81,14 +114,14 @@ def create_user(
 @router.delete("/me", status_code=204)
 def delete_current_user(
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user_from_token),
+    user: CachedUser = Depends(get_current_user_from_token),
 ):
     """
     Delete the current user and their invites.
 
     Args:
         db (Session): Database session.
-        user (User): Current authenticated user.
+        user (CachedUser): Current authenticated user.
 
     Returns:
         None
@@ -99,5 +132,13 @@ def delete_current_user(
     ).delete(synchronize_session=False)
     db.commit()
     # Delete the current user from the database. Commit changes.
-    db.delete(user)
-    db.commit()
+    db_user = db.get(User, user.id)
+    if db_user:
+        # Invalidate cached reads of the events the user took part in
+        bump_user_event_versions(db, db_user.id)
+        record_user_question_changes(db, db_user.id)
+
+        # Drop the cached copy so the deleted user's token stops working
+        invalidate_cached_user(db, user.email)
+        db.delete(db_user)
+        db.commit()
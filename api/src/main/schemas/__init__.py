@@ -1,4 +1,5 @@
 from .event_schema import *
 from .invite_schema import *
+from .profiling_schema import *
 from .question_schema import *
 from .user_schema import *
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from .event_schema import EventOut
 
@@ -22,5 +22,21 @@ class InviteOut(InviteBase):
     user_name: Optional[str] = None
 
 
+class InviteBulkCreate(BaseModel):
+    event_id: int
+    invites: list[InviteBase] = Field(..., max_length=5000)
+
+
+class InviteBulkResult(InviteBase):
+    # "created", "already_invited" or "duplicate" (repeated in the request)
+    outcome: str
+    invite: Optional[InviteOut] = None
+
+
+class InviteBulkOut(BaseModel):
+    created: int
+    results: list[InviteBulkResult]
+
+
 class InviteStatusUpdate(BaseModel):
     status: str = "pending"
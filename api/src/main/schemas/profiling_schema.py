@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfilingRequest(BaseModel):
+    count: int = Field(1, ge=1, le=100)
+    route: Optional[str] = None
+    method: Optional[str] = None
+
+
+class ProfilingStatusOut(BaseModel):
+    remaining: int
+    route: Optional[str] = None
+    method: Optional[str] = None
+    directory: str
+    profiles: list[str]
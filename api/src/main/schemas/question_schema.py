@@ -35,6 +35,15 @@ class OrderUpdate(BaseModel):
     items: list[OrderUpdateItem]
 
 
+class QuestionMove(BaseModel):
+    is_published: bool
+    category_id: Optional[int] = None
+
+    # Neighbours in the destination list (None for the start or end)
+    previous_id: Optional[int] = None
+    next_id: Optional[int] = None
+
+
 class QuestionOut(BaseModel):
     id: int
     event_id: int
@@ -44,6 +53,8 @@ class QuestionOut(BaseModel):
     is_published: bool
     published_order: Optional[int] = None
     draft_order: Optional[int] = None
+    published_rank: Optional[str] = None
+    draft_rank: Optional[str] = None
     user_id: Optional[int] = None
     asker_user_ids: list[int] = []
 
@@ -51,6 +62,12 @@ class QuestionOut(BaseModel):
         orm_mode = True
 
 
+class QuestionChangesOut(BaseModel):
+    cursor: int
+    questions: list[QuestionOut]
+    deleted_ids: list[int]
+
+
 # --- Categories ---
 class QuestionCategoryCreate(BaseModel):
     name: str
@@ -69,11 +86,18 @@ class QuestionCategoryOrderUpdate(BaseModel):
     items: list[QuestionCategoryOrderItem]
 
 
+class QuestionCategoryMove(BaseModel):
+    # Neighbours in the category list (None for the start or end)
+    previous_id: Optional[int] = None
+    next_id: Optional[int] = None
+
+
 class QuestionCategoryOut(BaseModel):
     id: int
     event_id: int
     name: str
     display_order: int
+    display_rank: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
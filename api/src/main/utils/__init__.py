@@ -1,5 +1,20 @@
 from .authentication import *
 from .email import *
+from .email_outbox import *
+from .event_access import *
 from .event_serialization import *
+from .event_version import *
+from .invalidation import *
 from .invite_serialization import *
+from .metrics import *
+from .pagination import *
+from .password_executor import *
+from .profiling import *
+from .query_stats import *
+from .question_cache import *
+from .question_changes import *
 from .question_serialization import *
+from .question_stream import *
+from .ranking import *
+from .read_your_writes import *
+from .user_cache import *
@@ -10,11 +10,19 @@ from fastapi import Cookie, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from jose import JWTError, jwt
 from jose.constants import ALGORITHMS
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from src.main.database import get_db
+from src.main.database import get_async_db, get_db
 from src.main.models import User
 from src.main.schemas import UserRequest
 
+from .user_cache import (
+    CachedUser,
+    current_user_cache,
+    get_cached_user,
+    user_version,
+)
+
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 if not JWT_SECRET_KEY:
     raise ValueError("JWT_SECRET_KEY environment variable is not set.")
@@ -48,6 +56,9 @@ def generate_jwt_token(user: UserRequest) -> str:
     """
 
     payload = {"sub": user.email}
+    # Only add version if present (see user_cache)
+    if getattr(user, "version", None) is not None:
+        payload["ver"] = user.version
     # Only add role if present
     if hasattr(user, "role") and user.role is not None:
         payload["role"] = user.role
@@ -89,17 +100,44 @@ def get_jwt_user_data(
 def get_current_user_from_token(
     db: Session = Depends(get_db),
     jwt_payload: dict = Depends(get_jwt_user_data),
-) -> Optional[User]:
+) -> Optional[CachedUser]:
+    """
+    Dependency to get the current user from the JWT token in the cookie.
+    Returns a cached snapshot of the User if authenticated, else raises
+    HTTPException. Only queries the users table on a cache miss.
+    """
+    if not jwt_payload or "sub" not in jwt_payload:
+        raise HTTPException(status_code=401, detail="Not logged in")
+    cached_user = get_cached_user(jwt_payload)
+    if cached_user:
+        return cached_user
+    return fetch_current_user(db, jwt_payload)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    jwt_payload: dict = Depends(get_jwt_user_data),
+) -> Optional[CachedUser]:
     """
-    Dependency to get the current User object from the JWT token in the cookie.
-    Returns the User if authenticated, else raises HTTPException.
+    Async version of get_current_user_from_token() for async routes.
     """
     if not jwt_payload or "sub" not in jwt_payload:
         raise HTTPException(status_code=401, detail="Not logged in")
+    cached_user = get_cached_user(jwt_payload)
+    if cached_user:
+        return cached_user
+    return await db.run_sync(fetch_current_user, jwt_payload)
+
+
+def fetch_current_user(db: Session, jwt_payload: dict) -> CachedUser:
+    """
+    Loads the user named by a JWT payload into the user cache. Raises HTTP
+    401 if they do not exist.
+    """
     user = db.query(User).filter(User.email == jwt_payload["sub"]).first()
     if not user:
         raise HTTPException(status_code=401, detail="Not logged in")
-    return user
+    return current_user_cache.put(user)
 
 
 def require_admin(jwt_payload: dict = Depends(get_jwt_user_data)):
@@ -122,12 +160,14 @@ def set_jwt_cookie_response(user, response_model=None, custom_content=None):
     """
 
     class UserObj:
-        def __init__(self, email, role=None):
+        def __init__(self, email, role=None, version=None):
             self.email = email
             self.role = role
+            self.version = version
 
     role = getattr(user, "role", None)
-    jwt_token = generate_jwt_token(UserObj(user.email, role))
+    version = user_version(user) if hasattr(user, "hashed_password") else None
+    jwt_token = generate_jwt_token(UserObj(user.email, role, version))
     if custom_content is not None:
         content = custom_content
     elif response_model:
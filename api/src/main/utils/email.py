@@ -6,45 +6,53 @@ from email.message import EmailMessage
 ENV = os.getenv("ENV")
 
 
-def send_invite_email(
-    to_email: str, title: str, event_link: str, register_link: str
-):
+def invite_email_content(title: str, event_link: str, register_link: str):
+    subject = f"You're invited to {title}!"
+    body = (
+        f"Hello! You've been invited to {title}. "
+        f"Click here to <a href='{event_link}'>view the event</a> or "
+        f"register <a href='{register_link}'>here</a>!"
+    )
+    return subject, body
+
+
+def build_email_message(to_email: str, subject: str, body: str):
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    if ENV == "prod":
+        msg["From"] = os.getenv("SES_FROM_EMAIL")
+    else:
+        msg["From"] = "noreply@yourapp.local"
+    msg["To"] = to_email
+    msg.set_content(body, subtype="html")
+    return msg
+
+
+def open_smtp_connection():
     # Use Amazon SES SMTP in production
     if ENV == "prod":
         SMTP_HOST = os.getenv("SES_SMTP_HOST")
         SMTP_PORT = int(os.getenv("SES_SMTP_PORT"))
         SMTP_USER = os.getenv("SES_SMTP_USERNAME")
         SMTP_PASS = os.getenv("SES_SMTP_PASSWORD")
-        FROM_EMAIL = os.getenv("SES_FROM_EMAIL")
-
-        msg = EmailMessage()
-        msg["Subject"] = f"You're invited to {title}!"
-        msg["From"] = FROM_EMAIL
-        msg["To"] = to_email
-        msg.set_content(
-            f"Hello! You've been invited to {title}. "
-            f"Click here to <a href='{event_link}'>view the event</a> or "
-            f"register <a href='{register_link}'>here</a>!",
-            subtype="html",
-        )
 
         context = ssl.create_default_context()
 
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as smtp:
-            smtp.starttls(context=context)
-            smtp.login(SMTP_USER, SMTP_PASS)
-            smtp.send_message(msg)
+        smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+        smtp.starttls(context=context)
+        smtp.login(SMTP_USER, SMTP_PASS)
+        return smtp
 
     # Use Mailhog in development
     else:
-        msg = EmailMessage()
-        msg["Subject"] = f"You're invited to {title}!"
-        msg["From"] = "noreply@yourapp.local"
-        msg["To"] = to_email
-        msg.set_content(
-            f"Hello! You've been invited to {title}. Click here to <a href='{event_link}'>view the event</a> or register <a href='{register_link}'>here</a>!",
-            subtype="html",
-        )
-
-        with smtplib.SMTP("mailhog", 1025) as smtp:
-            smtp.send_message(msg)
+        return smtplib.SMTP("mailhog", 1025)
+
+
+def send_invite_email(
+    to_email: str, title: str, event_link: str, register_link: str
+):
+    subject, body = invite_email_content(title, event_link, register_link)
+    msg = build_email_message(to_email, subject, body)
+
+    with open_smtp_connection() as smtp:
+        smtp.send_message(msg)
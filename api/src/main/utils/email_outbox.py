@@ -0,0 +1,222 @@
+"""
+Helper functions for queueing and delivering emails through the outbox
+
+Handlers add emails to the email_outbox table in the same transaction as the
+change that triggers them, so request latency no longer depends on the SMTP
+server. A background worker delivers pending emails in batches over a single
+SMTP connection and retries failures with exponential backoff.
+"""
+
+import logging
+import os
+import smtplib
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from src.main import database
+from src.main.models import EmailOutbox
+
+from .email import (
+    build_email_message,
+    invite_email_content,
+    open_smtp_connection,
+)
+
+logger = logging.getLogger(__name__)
+
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+EMAIL_OUTBOX_BACKOFF_SECONDS = float(
+    os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "30")
+)
+EMAIL_OUTBOX_LEASE_SECONDS = float(
+    os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300")
+)
+
+
+def enqueue_email(
+    db: Session, to_email: str, subject: str, body: str
+) -> EmailOutbox:
+    """
+    Adds an email to the outbox. Does not commit; the email is delivered only
+    if the caller's transaction commits.
+    """
+
+    email = EmailOutbox(to_email=to_email, subject=subject, body=body)
+    db.add(email)
+    return email
+
+
+def invite_email_values(to_email: str, token: str, title: str) -> dict:
+    """
+    Returns the outbox column values for an invite email with clickable links
+    to the event and the signup page. Used for bulk inserts.
+    """
+
+    ui_url = os.environ.get("UI_URL", "http://localhost")
+    event_link = f"{ui_url}/events/token/{token}"
+    register_link = f"{ui_url}/signup?email={to_email}"
+    subject, body = invite_email_content(title, event_link, register_link)
+    return {"to_email": to_email, "subject": subject, "body": body}
+
+
+def enqueue_invite_email(
+    db: Session, to_email: str, token: str, title: str
+) -> EmailOutbox:
+    """
+    Adds an invite email to the outbox. Does not commit.
+    """
+
+    return enqueue_email(db, **invite_email_values(to_email, token, title))
+
+
+def _failure_values(attempts: int, error: Exception, now: datetime) -> dict:
+    attempts += 1
+    values = {"attempts": attempts, "last_error": str(error)[:1000]}
+    if attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS:
+        values["status"] = "failed"
+    else:
+        delay = EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1)
+        values["status"] = "pending"
+        values["next_attempt_at"] = now + timedelta(seconds=delay)
+    return values
+
+
+def _update_email(db: Session, email_id: int, values: dict):
+    db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def deliver_pending_emails(
+    db: Session,
+    batch_size: int = EMAIL_OUTBOX_BATCH_SIZE,
+    connect=open_smtp_connection,
+) -> int:
+    """
+    Sends up to batch_size due emails over one SMTP connection. Rows are
+    locked with SKIP LOCKED and claimed for EMAIL_OUTBOX_LEASE_SECONDS, so
+    several workers can drain the outbox concurrently, and each email's
+    outcome is committed as soon as it is known. Returns the number of
+    emails processed.
+    """
+
+    now = datetime.now(timezone.utc)
+    emails = (
+        db.query(EmailOutbox)
+        .filter(
+            EmailOutbox.status == "pending",
+            EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not emails:
+        db.commit()
+        return 0
+
+    # Claim the batch so other workers skip it once the locks are released
+    batch = [
+        (email.id, email.to_email, email.subject, email.body, email.attempts)
+        for email in emails
+    ]
+    lease = now + timedelta(seconds=EMAIL_OUTBOX_LEASE_SECONDS)
+    for email in emails:
+        email.next_attempt_at = lease
+    db.commit()
+
+    # Open one connection for the whole batch
+    try:
+        smtp = connect()
+    except Exception as error:
+        logger.warning("Could not connect to SMTP server: %s", error)
+        for email_id, _, _, _, attempts in batch:
+            _update_email(
+                db, email_id, _failure_values(attempts or 0, error, now)
+            )
+        db.commit()
+        return len(batch)
+
+    try:
+        with smtp:
+            for email_id, to_email, subject, body, attempts in batch:
+                try:
+                    smtp.send_message(
+                        build_email_message(to_email, subject, body)
+                    )
+                    values = {"status": "sent", "sent_at": now}
+                except Exception as error:
+                    logger.warning(
+                        "Could not send email %s: %s", email_id, error
+                    )
+                    values = _failure_values(attempts or 0, error, now)
+                _update_email(db, email_id, values)
+                db.commit()
+    except (smtplib.SMTPException, OSError) as error:
+        # Every email's outcome is already committed
+        logger.warning("Could not close SMTP connection: %s", error)
+    return len(batch)
+
+
+class EmailOutboxWorker:
+    """
+    Background thread that drains the outbox. Polls every poll_seconds, or
+    sooner when wake() is called after an email is queued.
+    """
+
+    def __init__(self, poll_seconds: float = EMAIL_OUTBOX_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="email-outbox", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            try:
+                self._drain()
+            except Exception:
+                logger.exception("Email outbox delivery failed")
+
+    def _drain(self):
+        if database.SessionLocal is None:
+            return
+        db = database.SessionLocal()
+        try:
+            while not self._stop.is_set():
+                if deliver_pending_emails(db) < EMAIL_OUTBOX_BATCH_SIZE:
+                    break
+        finally:
+            db.close()
+
+
+email_outbox_worker = EmailOutboxWorker()
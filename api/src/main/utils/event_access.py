@@ -0,0 +1,225 @@
+"""
+Helper functions for resolving a user's access to an event
+
+The current user, the event and the user's role in that event are resolved
+together with a single joined query. FastAPI caches dependency results for the
+duration of a request, so handlers and sub-dependencies that share these
+dependencies reuse one lookup instead of re-querying.
+"""
+
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from src.main.database import get_async_db, get_db
+from src.main.models import Event, Invite, Participant, User
+
+from .authentication import get_jwt_user_data
+from .user_cache import CachedUser, current_user_cache, get_cached_user
+
+
+class EventAccess:
+    """
+    The event being accessed, the current user (None for anonymous requests)
+    and the user's role in the event (None if they are not a participant).
+    """
+
+    def __init__(
+        self,
+        event: Event,
+        user: Optional[CachedUser] = None,
+        role: Optional[str] = None,
+    ):
+        self.event = event
+        self.user = user
+        self.role = role
+
+    @property
+    def is_host(self) -> bool:
+        return self.role == "host"
+
+    @property
+    def is_participant(self) -> bool:
+        return self.role is not None
+
+
+def resolve_event_access(
+    db: Session, event_id: int, jwt_payload: Optional[dict]
+) -> Optional[EventAccess]:
+    """
+    Fetches the event, the user named by the JWT payload and their participant
+    role in one query (the user comes from the user cache when possible).
+    Returns None if the event does not exist.
+    """
+
+    # Skip the users table when the user is already cached
+    cached_user = get_cached_user(jwt_payload)
+    if cached_user:
+        row = (
+            db.query(Event, Participant.role)
+            .outerjoin(
+                Participant,
+                and_(
+                    Participant.event_id == Event.id,
+                    Participant.user_id == cached_user.id,
+                ),
+            )
+            .filter(Event.id == event_id)
+            .first()
+        )
+        if not row:
+            return None
+        event, role = row
+        return EventAccess(event, cached_user, role)
+
+    email = jwt_payload.get("sub") if jwt_payload else None
+    row = (
+        db.query(Event, User, Participant.role)
+        .select_from(Event)
+        .outerjoin(User, User.email == email)
+        .outerjoin(
+            Participant,
+            and_(
+                Participant.event_id == Event.id,
+                Participant.user_id == User.id,
+            ),
+        )
+        .filter(Event.id == event_id)
+        .first()
+    )
+    if not row:
+        return None
+    event, user, role = row
+    return EventAccess(
+        event, current_user_cache.put(user) if user else None, role
+    )
+
+
+def get_event_access(
+    event_id: int,
+    db: Session = Depends(get_db),
+    jwt_payload: Optional[dict] = Depends(get_jwt_user_data),
+) -> EventAccess:
+    """
+    Dependency to get the access context for the event in the path. Allows
+    anonymous requests (user is None). Raises HTTP 404 if the event does not
+    exist.
+    """
+
+    access = resolve_event_access(db, event_id, jwt_payload)
+    if not access:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return access
+
+
+async def get_event_access_async(
+    event_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    jwt_payload: Optional[dict] = Depends(get_jwt_user_data),
+) -> EventAccess:
+    """
+    Async version of get_event_access() for async routes.
+    """
+
+    access = await db.run_sync(resolve_event_access, event_id, jwt_payload)
+    if not access:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return access
+
+
+def resolve_user_event_access(
+    db: Session,
+    event_id: int,
+    jwt_payload: Optional[dict],
+    not_found_detail: str = "Event not found",
+) -> EventAccess:
+    """
+    Resolves the access context for a logged-in user. Raises HTTP 401 if not
+    logged in and HTTP 404 if the event does not exist.
+    """
+
+    if not jwt_payload or "sub" not in jwt_payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not logged in"
+        )
+    access = resolve_event_access(db, event_id, jwt_payload)
+    if not access:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    if not access.user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not logged in"
+        )
+    return access
+
+
+def get_user_event_access(
+    event_id: int,
+    db: Session = Depends(get_db),
+    jwt_payload: Optional[dict] = Depends(get_jwt_user_data),
+) -> EventAccess:
+    """
+    Dependency to get the access context for the event in the path for a
+    logged-in user.
+    """
+
+    return resolve_user_event_access(db, event_id, jwt_payload)
+
+
+async def get_user_event_access_async(
+    event_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    jwt_payload: Optional[dict] = Depends(get_jwt_user_data),
+) -> EventAccess:
+    """
+    Async version of get_user_event_access() for async routes.
+    """
+
+    return await db.run_sync(resolve_user_event_access, event_id, jwt_payload)
+
+
+def resolve_invite(db: Session, token: str) -> Invite:
+    """
+    Fetches the invite for a token. Raises HTTP 404 if there is none.
+    """
+
+    invite = db.query(Invite).filter(Invite.token == token).first()
+    if not invite:
+        raise HTTPException(
+            status_code=404, detail="Invalid or expired invite token."
+        )
+    return invite
+
+
+def resolve_invite_event(db: Session, token: str) -> Event:
+    """
+    Fetches the event an invite token belongs to. Raises HTTP 404 if the
+    invite or its event does not exist.
+    """
+
+    invite = resolve_invite(db, token)
+    event = db.query(Event).filter(Event.id == invite.event_id).first()
+    if not event:
+        raise HTTPException(
+            status_code=404, detail="Event not found for this invite."
+        )
+    return event
+
+
+async def resolve_on_read_db(
+    read_db: AsyncSession, db: AsyncSession, fn, *args
+):
+    """
+    Runs an invite resolver such as resolve_invite() on the read session.
+    If a replica answers 404, retries on the primary before giving up, as a
+    fresh invite may not have reached the replica yet. Returns the result and
+    the session that found it, so follow-up reads stay on the primary.
+    """
+
+    try:
+        return await read_db.run_sync(fn, *args), read_db
+    except HTTPException as exc:
+        if exc.status_code != 404 or not read_db.info.get("replica"):
+            raise
+    return await db.run_sync(fn, *args), db
@@ -1,17 +1,98 @@
-from src.main.models import User
+from datetime import datetime
+from typing import Optional
 
+from sqlalchemy.orm import Session
+from src.main.models import Event, Participant, User
+from src.main.schemas import EventOut
 
-def serialize_participantout(participant, db):
-    # Build name attribute
-    user = db.query(User).filter(User.id == participant.user_id).first()
-    if user:
-        name = (
-            f"{user.first_name or ''} {user.last_name or ''}".strip()
-            or user.email
+from .pagination import paginate
+
+
+def participant_name(first_name, last_name, email) -> str:
+    return f"{first_name or ''} {last_name or ''}".strip() or email
+
+
+def list_participants(
+    db: Session,
+    event_id: int,
+    role: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Fetch and serialize a page of an event's participants with their names in
+    a single joined query, ordered by user id. Returns the participants and
+    the cursor for the next page.
+    """
+    query = (
+        db.query(
+            Participant.user_id,
+            Participant.role,
+            User.first_name,
+            User.last_name,
+            User.email,
+        )
+        .join(User, User.id == Participant.user_id)
+        .filter(Participant.event_id == event_id)
+    )
+    if role in {"host", "participant"}:
+        query = query.filter(Participant.role == role)
+    rows, next_cursor = paginate(
+        query, [(Participant.user_id, False)], cursor, limit
+    )
+
+    participants = [
+        {
+            "id": row.user_id,
+            "name": participant_name(row.first_name, row.last_name, row.email),
+            "role": row.role,
+        }
+        for row in rows
+    ]
+    return participants, next_cursor
+
+
+def list_user_events(
+    db: Session,
+    user_id: int,
+    role: str = "participant",
+    time: str = "all",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Fetch and serialize a page of the events a user hosts (role 'host') or
+    takes part in (role 'participant'), optionally only upcoming or past
+    ones, ordered by start time. Returns the events and the cursor for the
+    next page.
+    """
+    # Role-based filtering
+    if role == "host":
+        event_ids = (
+            db.query(Participant.event_id)
+            .filter(Participant.user_id == user_id, Participant.role == "host")
+            .subquery()
         )
+    else:
+        event_ids = (
+            db.query(Participant.event_id)
+            .filter(Participant.user_id == user_id)
+            .subquery()
+        )
+    query = db.query(Event).filter(Event.id.in_(event_ids.select()))
+
+    # Time-based filtering
+    now = datetime.now()
+    if time == "upcoming":
+        query = query.filter(Event.start_time > now)
+    elif time == "past":
+        query = query.filter(Event.end_time < now)
 
-    return {
-        "id": participant.user_id,
-        "name": name,
-        "role": participant.role,
-    }
+    rows, next_cursor = paginate(
+        query, [(Event.start_time, False), (Event.id, False)], cursor, limit
+    )
+    events = [
+        EventOut.model_validate(row[0], from_attributes=True).model_dump()
+        for row in rows
+    ]
+    return events, next_cursor
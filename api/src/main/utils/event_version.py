@@ -0,0 +1,130 @@
+"""
+Helper functions for per-event versions and ETags
+
+Every change to an event, its questions, categories or participants bumps
+events.version in the same transaction and invalidates the event's cached
+reads on every worker. Read endpoints derive a strong ETag
+from the version, which the access query has already loaded, so a request
+whose If-None-Match is still current is answered with 304 without touching
+the rows. The version is read before the rows, so a concurrent write can only
+make an ETag look older than its body, never newer.
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+from src.main.models import Event, Participant, Question
+
+from .invalidation import EVENT, invalidate_on_commit
+
+
+def bump_event_version(db: Session, event_id: int) -> Optional[int]:
+    """
+    Increments an event's version and returns the new version. Does not
+    commit; call it in the same transaction as the change it versions.
+    """
+
+    version = db.scalar(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(version=Event.version + 1)
+        .returning(Event.version)
+        .execution_options(synchronize_session=False)
+    )
+    invalidate_on_commit(db, EVENT, event_id)
+    return version
+
+
+def bump_user_event_versions(db: Session, user_id: int):
+    """
+    Increments the version of every event a user takes part in or asked a
+    question in. Call before deleting the user. Does not commit.
+    """
+
+    event_ids = db.scalars(
+        update(Event)
+        .where(
+            or_(
+                Event.id.in_(
+                    select(Participant.event_id).where(
+                        Participant.user_id == user_id
+                    )
+                ),
+                Event.id.in_(
+                    select(Question.event_id).where(
+                        Question.user_id == user_id
+                    )
+                ),
+            )
+        )
+        .values(version=Event.version + 1)
+        .returning(Event.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    for event_id in event_ids:
+        invalidate_on_commit(db, EVENT, event_id)
+
+
+def has_event_version(db: Session, event: Event) -> bool:
+    """
+    Checks that a read session sees at least the version of an event loaded
+    from the primary, so a replica that is behind cannot serve rows older
+    than the ETag they go out under.
+    """
+
+    if not db.info.get("replica"):
+        return True
+    version = db.scalar(select(Event.version).where(Event.id == event.id))
+    return version is not None and version >= event.version
+
+
+def event_etag(event: Event, variant: str) -> str:
+    """
+    Returns a strong ETag for one representation (variant) of an event's data.
+    """
+
+    return f'"{event.id}-{event.version}-{variant}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks an If-None-Match header against an ETag using weak comparison, as
+    required for If-None-Match.
+    """
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def etag_headers(etag: str) -> dict:
+    """
+    Returns the caching headers for a response carrying an ETag. Clients must
+    revalidate before reusing their copy.
+    """
+
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def check_etag(
+    request: Request, response: Response, etag: str
+) -> Optional[Response]:
+    """
+    Returns a 304 response if the client's copy is current. Otherwise sets the
+    ETag on the outgoing response and returns None.
+    """
+
+    headers = etag_headers(etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,202 @@
+"""
+Helper functions for invalidating in-process caches across workers
+
+Each uvicorn worker keeps its own user and question list caches. Write paths
+queue invalidations on their session with invalidate_on_commit(); when the
+session commits they are applied to the local caches straight away and, with
+the Postgres bus, also sent to every other worker with pg_notify in the same
+transaction (so rolled back writes never notify). A listener thread started in
+the app lifespan LISTENs on the channel and evicts the matching entries. The
+in-memory bus only applies invalidations locally, for tests and single-process
+deployments.
+"""
+
+import logging
+import os
+import select
+import threading
+from collections import defaultdict
+from typing import Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION_BUS = os.getenv("CACHE_INVALIDATION_BUS", "postgres")
+CACHE_INVALIDATION_CHANNEL = os.getenv(
+    "CACHE_INVALIDATION_CHANNEL", "cache_invalidation"
+)
+
+# Kinds of cache entries that can be invalidated
+EVENT = "event"
+USER = "user"
+
+_PENDING_KEY = "pending_invalidations"
+
+
+class InvalidationBus:
+    """
+    In-memory bus. Delivers invalidations to this process's handlers once the
+    session that queued them commits.
+    """
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+        self._reset_handlers = []
+
+    def subscribe(self, kind: str, handler: Callable[[str], None]):
+        """
+        Registers a handler called with the key of each invalidation of kind.
+        """
+
+        self._handlers[kind].append(handler)
+
+    def subscribe_reset(self, handler: Callable[[], None]):
+        """
+        Registers a handler called when invalidations may have been missed
+        and the whole cache should be dropped.
+        """
+
+        self._reset_handlers.append(handler)
+
+    def dispatch(self, kind: str, key: str):
+        for handler in self._handlers[kind]:
+            try:
+                handler(key)
+            except Exception:
+                logger.exception("Could not invalidate %s %s", kind, key)
+
+    def reset(self):
+        for handler in self._reset_handlers:
+            handler()
+
+    def publish(self, db: Session, messages: set):
+        pass
+
+    def start(self, engine):
+        pass
+
+    def stop(self):
+        pass
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """
+    Bus that also sends invalidations to other workers with NOTIFY and
+    applies theirs from a LISTEN thread.
+    """
+
+    def __init__(self, channel: str, poll_seconds: float = 1.0):
+        super().__init__()
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self._engine = None
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+        self._thread = None
+
+    def publish(self, db: Session, messages: set):
+        db.execute(
+            text(
+                "SELECT pg_notify(:channel, payload) "
+                "FROM unnest(CAST(:payloads AS text[])) AS payload"
+            ),
+            {
+                "channel": self.channel,
+                "payloads": [f"{kind}:{key}" for kind, key in messages],
+            },
+        )
+
+    def start(self, engine):
+        if self._thread is not None or engine is None:
+            return
+        if engine.dialect.name != "postgresql":
+            return
+        self._engine = engine
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cache-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._listening.clear()
+
+    def wait_until_listening(self, timeout: float = None) -> bool:
+        return self._listening.wait(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Cache invalidation listener failed")
+                self._listening.clear()
+                self._stop.wait(self.poll_seconds)
+
+    def _listen(self):
+        # Use a dedicated connection outside the pool for the whole session
+        connection = self._engine.raw_connection()
+        driver_connection = connection.driver_connection
+        connection.detach()
+        try:
+            driver_connection.autocommit = True
+            with driver_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+
+            # Anything sent while we were not listening has been missed
+            self.reset()
+            self._listening.set()
+
+            while not self._stop.is_set():
+                ready, _, _ = select.select(
+                    [driver_connection], [], [], self.poll_seconds
+                )
+                if not ready:
+                    continue
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    notify = driver_connection.notifies.pop(0)
+                    kind, _, key = notify.payload.partition(":")
+                    self.dispatch(kind, key)
+        finally:
+            connection.close()
+
+
+if CACHE_INVALIDATION_BUS == "postgres":
+    invalidation_bus = PostgresInvalidationBus(CACHE_INVALIDATION_CHANNEL)
+else:
+    invalidation_bus = InvalidationBus()
+
+
+def invalidate_on_commit(db: Session, kind: str, key):
+    """
+    Queues a cache invalidation to be applied on every worker if the
+    session's transaction commits.
+    """
+
+    db.info.setdefault(_PENDING_KEY, set()).add((kind, str(key)))
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_pending_invalidations(session: Session):
+    messages = session.info.get(_PENDING_KEY)
+    if messages:
+        invalidation_bus.publish(session, messages)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_pending_invalidations(session: Session):
+    for kind, key in session.info.pop(_PENDING_KEY, ()):
+        invalidation_bus.dispatch(kind, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session):
+    session.info.pop(_PENDING_KEY, None)
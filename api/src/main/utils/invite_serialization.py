@@ -1,9 +1,8 @@
 from src.main.models import Event, User
 
 
-def serialize_inviteout(invite, db):
-    # Fetch and serialize associated event
-    event = db.query(Event).filter(Event.id == invite.event_id).first()
+def serialize_invite(invite, event, user) -> dict:
+    # Serialize associated event
     serialized_event = None
     if event:
         serialized_event = {
@@ -16,7 +15,6 @@ def serialize_inviteout(invite, db):
         }
 
     # Build user_name attribute
-    user = db.query(User).filter(User.id == invite.user_id).first()
     if user:
         user_name = (
             f"{user.first_name or ''} {user.last_name or ''}".strip()
@@ -34,3 +32,37 @@ def serialize_inviteout(invite, db):
         "token": invite.token,
         "user_name": user_name,
     }
+
+
+def serialize_inviteout(invite, db):
+    # Fetch associated event and user
+    event = db.query(Event).filter(Event.id == invite.event_id).first()
+    user = db.query(User).filter(User.id == invite.user_id).first()
+    return serialize_invite(invite, event, user)
+
+
+def serialize_invites(invites, db) -> list[dict]:
+    # Prefetch associated events and users with one query each instead of
+    # two queries per invite
+    invites = list(invites)
+    event_ids = {invite.event_id for invite in invites}
+    user_ids = {invite.user_id for invite in invites if invite.user_id}
+    events = {}
+    if event_ids:
+        events = {
+            event.id: event
+            for event in db.query(Event).filter(Event.id.in_(event_ids))
+        }
+    users = {}
+    if user_ids:
+        users = {
+            user.id: user
+            for user in db.query(User).filter(User.id.in_(user_ids))
+        }
+
+    return [
+        serialize_invite(
+            invite, events.get(invite.event_id), users.get(invite.user_id)
+        )
+        for invite in invites
+    ]
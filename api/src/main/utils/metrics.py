@@ -0,0 +1,332 @@
+"""
+Helper functions for request metrics in the Prometheus text format
+
+MetricsMiddleware times every HTTP request and counts responses by method,
+route template (e.g. /api/events/{event_id}/questions, never the raw path)
+and status, and tracks how many requests are in flight. Requests that match
+no route are grouped under "unmatched" so scanners cannot blow up the label
+set. The middleware and the /metrics endpoint both run on the event loop, so
+the counters need no lock and a request costs a few microseconds: two clock
+reads, a bisect and a few dict updates.
+
+Each worker process keeps its own counters; scrape every worker, or run one
+worker per container, to see the whole picture.
+"""
+
+import time
+from bisect import bisect_left
+
+from anyio.to_thread import current_default_thread_limiter
+from src.main import database
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .password_executor import password_pool
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+# Metric name, type, help text and get_pool_stats() key of each pool metric
+POOL_METRICS = [
+    *(
+        (
+            f"db_pool_{key}",
+            "gauge",
+            f"Database pool connections: {key.replace('_', ' ')}.",
+            key,
+        )
+        for key in ("size", "checked_in", "checked_out", "overflow")
+    ),
+    (
+        "db_pool_max_overflow",
+        "gauge",
+        "Database pool overflow limit.",
+        "max_overflow",
+    ),
+    (
+        "db_pool_checkouts_total",
+        "counter",
+        "Database connection checkouts.",
+        "checkouts",
+    ),
+    (
+        "db_pool_checkout_timeouts_total",
+        "counter",
+        "Database connection checkouts that timed out.",
+        "checkout_timeouts",
+    ),
+    (
+        "db_pool_checkout_wait_seconds_total",
+        "counter",
+        "Time spent waiting for a database connection.",
+        "checkout_wait_seconds",
+    ),
+    (
+        "db_pool_checkout_wait_max_seconds",
+        "gauge",
+        "Longest wait for a database connection.",
+        "checkout_wait_max_seconds",
+    ),
+]
+
+
+class RequestMetrics:
+    """
+    Latency histograms and status counts per route, and the number of
+    requests in flight. Only touch it from the event loop.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.in_flight = 0
+        # (method, route) -> [per-bucket counts + overflow, total seconds]
+        self.latencies = {}
+        # (method, route, status) -> count
+        self.responses = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route)
+        latency = self.latencies.get(key)
+        if latency is None:
+            latency = self.latencies[key] = [[0] * (len(self.buckets) + 1), 0]
+        latency[0][bisect_left(self.buckets, seconds)] += 1
+        latency[1] += seconds
+
+        response_key = (method, route, status)
+        self.responses[response_key] = self.responses.get(response_key, 0) + 1
+
+    def reset(self):
+        self.latencies.clear()
+        self.responses.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Returns the path template of the route that handled a request.
+    """
+
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that records every HTTP request in request_metrics.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = None):
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(
+                scope["method"],
+                route_template(scope),
+                status,
+                time.perf_counter() - started,
+            )
+
+
+def _escape_label(value) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label(value)}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+class MetricsWriter:
+    """
+    Builds a Prometheus text exposition, one metric family at a time.
+    """
+
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value, labels: dict = None):
+        self.lines.append(
+            f"{name}{_format_labels(labels)} {_format_value(value)}"
+        )
+
+    def gauge(self, name: str, help_text: str, value, labels: dict = None):
+        self.family(name, "gauge", help_text)
+        self.sample(name, value, labels)
+
+    def counter(self, name: str, help_text: str, value, labels: dict = None):
+        self.family(name, "counter", help_text)
+        self.sample(name, value, labels)
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _write_request_metrics(writer: MetricsWriter, metrics: RequestMetrics):
+    writer.gauge(
+        "http_requests_in_flight",
+        "HTTP requests being handled.",
+        metrics.in_flight,
+    )
+
+    writer.family(
+        "http_request_duration_seconds",
+        "histogram",
+        "HTTP request latency by route.",
+    )
+    bounds = [_format_value(bound) for bound in metrics.buckets] + ["+Inf"]
+    for (method, route), (counts, total) in sorted(metrics.latencies.items()):
+        labels = {"method": method, "route": route}
+        cumulative = 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            writer.sample(
+                "http_request_duration_seconds_bucket",
+                cumulative,
+                {**labels, "le": bound},
+            )
+        writer.sample("http_request_duration_seconds_sum", total, labels)
+        writer.sample(
+            "http_request_duration_seconds_count", cumulative, labels
+        )
+
+    writer.family(
+        "http_responses_total",
+        "counter",
+        "HTTP responses by route and status.",
+    )
+    for (method, route, status), count in sorted(metrics.responses.items()):
+        writer.sample(
+            "http_responses_total",
+            count,
+            {"method": method, "route": route, "status": status},
+        )
+
+
+def _write_pool_metrics(writer: MetricsWriter):
+    # One series per engine (primary, replica and their asyncpg engines)
+    pools = database.get_pool_stats()
+    if pools:
+        for name, kind, help_text, key in POOL_METRICS:
+            writer.family(name, kind, help_text)
+            for engine_name, pool in sorted(pools.items()):
+                writer.sample(name, pool[key], {"engine": engine_name})
+
+    replica = database.get_replica_stats()
+    if replica:
+        writer.gauge(
+            "db_replica_usable",
+            "Whether reads are routed to the replica.",
+            replica["usable"],
+        )
+        if replica["lag_seconds"] is not None:
+            writer.gauge(
+                "db_replica_lag_seconds",
+                "Replica lag at the last check.",
+                replica["lag_seconds"],
+            )
+
+
+def _write_executor_metrics(writer: MetricsWriter):
+    # AnyIO's limiter bounds the threads running sync routes and run_sync()
+    threads = current_default_thread_limiter().statistics()
+    writer.gauge(
+        "threadpool_threads_total",
+        "Worker threads available to sync handlers.",
+        threads.total_tokens,
+    )
+    writer.gauge(
+        "threadpool_threads_busy",
+        "Worker threads in use.",
+        threads.borrowed_tokens,
+    )
+    writer.gauge(
+        "threadpool_tasks_waiting",
+        "Tasks waiting for a worker thread.",
+        threads.tasks_waiting,
+    )
+
+    passwords = password_pool.stats()
+    writer.gauge(
+        "password_pool_pending",
+        "Password hashing calls running or queued.",
+        passwords["pending"],
+    )
+    writer.gauge(
+        "password_pool_queue_depth",
+        "Password hashing calls waiting for a worker.",
+        passwords["queue_depth"],
+    )
+    writer.counter(
+        "password_pool_rejected_total",
+        "Password hashing calls rejected because the queue was full.",
+        passwords["rejected"],
+    )
+
+
+def render_metrics(metrics: RequestMetrics = None) -> str:
+    """
+    Returns the current metrics in the Prometheus text format. Call from the
+    event loop.
+    """
+
+    writer = MetricsWriter()
+    _write_request_metrics(writer, metrics or request_metrics)
+    _write_pool_metrics(writer)
+    _write_executor_metrics(writer)
+    return writer.text()
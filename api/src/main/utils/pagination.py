@@ -0,0 +1,152 @@
+"""
+Helper functions for keyset pagination
+
+List endpoints accept an optional limit and an opaque cursor. A page is
+ordered by a fixed set of sort keys that ends in a unique column, and the
+cursor holds the keys of the last row served, so the next page starts with a
+WHERE on those keys instead of an OFFSET: every page costs the same however
+deep into the list it is. The cursor for the next page is sent in the
+X-Next-Cursor header, leaving response bodies unchanged; it is absent on the
+last page.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import DateTime, and_, false, literal, or_
+from sqlalchemy.orm import Query as SQLQuery
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+# Sort keys are (expression, descending) pairs
+SortKey = tuple[Any, bool]
+
+
+def page_params(
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the previous page's X-Next-Cursor"
+    ),
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Maximum items to return"
+    ),
+) -> tuple[Optional[str], Optional[int]]:
+    """
+    Dependency for the cursor and limit query parameters.
+    """
+
+    return cursor, limit
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Encodes the sort key values of a row as an opaque cursor.
+    """
+
+    payload = json.dumps(jsonable_encoder(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: list[SortKey]) -> list:
+    """
+    Decodes a cursor made by encode_cursor() for the given sort keys. Raises
+    HTTP 400 if it is malformed.
+    """
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError(cursor)
+        return [
+            (
+                datetime.fromisoformat(value)
+                if isinstance(expression.type, DateTime) and value
+                else value
+            )
+            for (expression, _), value in zip(keys, values)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(keys: list[SortKey], values: list):
+    """
+    Returns the condition for rows that sort after the given key values.
+    """
+
+    conditions = []
+    for position, (expression, descending) in enumerate(keys):
+        value = values[position]
+        if value is not None:
+            value = literal(value, expression.type)
+        if value is None:
+            # NULLs sort last ascending and first descending
+            after = false() if not descending else expression.is_not(None)
+        elif descending:
+            after = expression < value
+        else:
+            after = or_(expression > value, expression.is_(None))
+        ties = [
+            (
+                key.is_(None)
+                if key_value is None
+                else key == literal(key_value, key.type)
+            )
+            for (key, _), key_value in zip(keys, values[:position])
+        ]
+        conditions.append(and_(*ties, after))
+    return or_(*conditions)
+
+
+def paginate(
+    query: SQLQuery,
+    keys: list[SortKey],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list, Optional[str]]:
+    """
+    Orders a query by its sort keys and fetches the page after cursor.
+    Returns the rows, which carry the sort keys as extra trailing columns,
+    and the cursor for the next page, or None on the last page. Without a
+    limit every remaining row is returned.
+    """
+
+    labels = [
+        expression.label(f"sort_key_{position}")
+        for position, (expression, _) in enumerate(keys)
+    ]
+    query = query.add_columns(*labels).order_by(
+        *[
+            expression.desc() if descending else expression.asc()
+            for expression, descending in keys
+        ]
+    )
+    if cursor:
+        query = query.filter(keyset_filter(keys, decode_cursor(cursor, keys)))
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    rows = query.all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(
+            [getattr(rows[-1], label.name) for label in labels]
+        )
+
+    return rows, next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """
+    Sends the cursor for the next page, if there is one.
+    """
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,126 @@
+"""
+Helper functions for running password hashing off the request thread pool
+
+bcrypt takes roughly 250ms of CPU per call. Running it inline in a sync handler
+holds one of the AnyIO worker threads for the whole call, so a burst of logins
+starves every other endpoint. Password work is instead sent to a dedicated,
+bounded executor (a process pool by default, to get past the GIL) and awaited
+from async handlers. Requests beyond the queue limit are rejected with 503
+rather than queueing without bound.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+from fastapi import HTTPException, status
+
+from .authentication import hash_password, verify_password
+
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "process")
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(os.cpu_count() or 1, 4)))
+)
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+
+class PasswordExecutor:
+    """
+    Bounded executor for password hashing. Tracks how many calls are pending
+    (running or queued) so the queue depth can be reported and capped.
+    """
+
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._max_pending_seen = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        # Create the pool lazily so importing the app doesn't spawn processes
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="password",
+                    )
+            return self._executor
+
+    async def run(self, fn, *args):
+        """
+        Runs fn(*args) on the executor and waits for the result without
+        blocking the event loop or a request thread.
+        """
+
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please try again.",
+                )
+            self._pending += 1
+            self._max_pending_seen = max(self._max_pending_seen, self._pending)
+        try:
+            return await asyncio.wrap_future(executor.submit(fn, *args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "queue_depth": max(self._pending - self.workers, 0),
+                "max_pending_seen": self._max_pending_seen,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_pool = PasswordExecutor(
+    PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def hash_password_async(plain_password: str) -> str:
+    """
+    Hashes a password on the password executor
+    """
+
+    return await password_pool.run(hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed: str) -> bool:
+    """
+    Checks a password against a hash on the password executor
+    """
+
+    return await password_pool.run(verify_password, plain_password, hashed)
@@ -0,0 +1,318 @@
+"""
+Helper functions for profiling live requests on demand
+
+An admin arms the profiler for the next N requests, optionally only those
+matching one route template, through /api/admin/profiling. Setting
+PROFILE_HEADER_ENABLED=true additionally lets admins profile a single request
+by sending an X-Profile header. While a request is profiled, a sampler thread
+records each PROFILE_INTERVAL_MS (default 10) the stacks of the threads that
+are running the request's code: the event loop while it runs one of the
+request's tasks, and the worker threads running its sync handlers and
+run_sync() work. Stacks are rooted at their thread's name. Finding those
+threads relies on a private part of anyio; if an upgrade changes it, the
+profiler logs a warning at startup and stays off.
+
+Profiles are written to PROFILE_DIR in the collapsed stack format
+("frame;frame;frame count" per line) that speedscope, flamegraph.pl and
+inferno load, keeping the newest PROFILE_MAX_FILES (default 100). When the
+profiler is not armed, a request costs one attribute check.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import Context, ContextVar
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .authentication import decode_jwt_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/getloopdin-profiles")
+PROFILE_HEADER_ENABLED = (
+    os.getenv("PROFILE_HEADER_ENABLED", "false").lower() == "true"
+)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_SUFFIX = ".collapsed"
+
+# The sampler of the request being profiled, copied into its tasks and the
+# worker threads that run its sync code
+profiled_request: ContextVar[Optional["StackSampler"]] = ContextVar(
+    "profiled_request", default=None
+)
+
+
+def context_runners() -> Optional[tuple]:
+    """
+    Returns the code of the frames that call Context.run() for a task step on
+    the event loop and for a call on one of anyio's worker threads, or None
+    when this asyncio or anyio no longer has them.
+    """
+
+    try:
+        # Private to anyio, so an upgrade may move or change it
+        from anyio._backends._asyncio import WorkerThread
+
+        handle_run = asyncio.events.Handle._run.__code__
+        worker_run = WorkerThread.run.__code__
+    except (ImportError, AttributeError):
+        return None
+    if (
+        "self" not in handle_run.co_varnames
+        or "context" not in worker_run.co_varnames
+    ):
+        return None
+    return handle_run, worker_run
+
+
+CONTEXT_RUNNERS = context_runners()
+PROFILING_AVAILABLE = CONTEXT_RUNNERS is not None
+if not PROFILING_AVAILABLE:
+    logger.warning("Request profiling is unavailable with this anyio version")
+
+
+def running_context(frame) -> Optional[Context]:
+    """
+    Returns the context that the innermost frame of a thread's stack runs
+    in, if it is a task step or a worker thread call.
+    """
+
+    handle_run, worker_run = CONTEXT_RUNNERS
+    while frame is not None:
+        if frame.f_code is handle_run:
+            return getattr(frame.f_locals.get("self"), "_context", None)
+        if frame.f_code is worker_run:
+            return frame.f_locals.get("context")
+        frame = frame.f_back
+    return None
+
+
+class StackSampler:
+    """
+    Samples, on a background thread, the stacks of the threads that are
+    running code in the context of this sampler's request, and counts
+    identical stacks.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or not self.is_sampled(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    file_name = os.path.basename(code.co_filename)
+                    stack.append(
+                        f"{code.co_name} ({file_name}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def is_sampled(self, frame) -> bool:
+        context = running_context(frame)
+        return context is not None and context.get(profiled_request) is self
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.items()
+        )
+
+
+class RequestProfiler:
+    """
+    Tracks how many more requests to profile, and for which route.
+    """
+
+    def __init__(self, directory: str, interval_ms: float, max_files: int):
+        self.directory = directory
+        self.interval_ms = interval_ms
+        self.max_files = max_files
+        self.available = PROFILING_AVAILABLE
+        self.remaining = 0
+        self.route = None
+        self.method = None
+        self._lock = threading.Lock()
+
+    def arm(
+        self,
+        count: int,
+        route: Optional[str] = None,
+        method: Optional[str] = None,
+    ):
+        with self._lock:
+            self.remaining = count
+            self.route = route
+            self.method = method.upper() if method else None
+
+    def disarm(self):
+        with self._lock:
+            self.remaining = 0
+
+    def take(self, scope: Scope, routes: list) -> bool:
+        """
+        Claims one of the remaining profiles if the request matches.
+        """
+
+        if self.method and scope["method"] != self.method:
+            return False
+        if self.route and not any(
+            route.path == self.route and route.matches(scope)[0] == Match.FULL
+            for route in routes
+        ):
+            return False
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def profiles(self) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(os.listdir(self.directory))
+
+    def status(self) -> dict:
+        return {
+            "remaining": self.remaining,
+            "route": self.route,
+            "method": self.method,
+            "directory": self.directory,
+            "profiles": self.profiles(),
+        }
+
+    def write(self, name: str, sampler: StackSampler):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as profile:
+            profile.write(sampler.collapsed())
+        self.prune()
+
+    def prune(self):
+        """
+        Deletes all but the newest max_files profiles. Profile names start
+        with the time they were taken, so they sort oldest first.
+        """
+
+        names = [
+            name for name in self.profiles() if name.endswith(PROFILE_SUFFIX)
+        ]
+        for name in names[: max(len(names) - self.max_files, 0)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                # Pruned by a concurrent write
+                pass
+
+
+request_profiler = RequestProfiler(
+    PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_MAX_FILES
+)
+
+
+def requested_by_admin(scope: Scope) -> bool:
+    """
+    Checks whether a request carries the X-Profile header and an admin's JWT
+    cookie.
+    """
+
+    headers = dict(scope["headers"])
+    if PROFILE_HEADER not in headers:
+        return False
+    cookies = SimpleCookie(headers.get(b"cookie", b"").decode("latin-1"))
+    token = cookies.get("fast_api_token")
+    payload = decode_jwt_token(token.value) if token else None
+    return bool(payload) and payload.get("role") == "admin"
+
+
+def profile_name(scope: Scope) -> str:
+    """
+    Returns a unique file name for a request's profile.
+    """
+
+    path = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return f"{stamp}-{time.monotonic_ns()}-{scope['method']}-{path}{PROFILE_SUFFIX}"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles the requests claimed from request_profiler,
+    or sent by an admin with the X-Profile header when that is enabled.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: list,
+        profiler: RequestProfiler = None,
+    ):
+        self.app = app
+        self.routes = routes
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        profiler = self.profiler
+        if (
+            scope["type"] != "http"
+            or not profiler.available
+            or not (profiler.remaining or PROFILE_HEADER_ENABLED)
+        ):
+            await self.app(scope, receive, send)
+            return
+        requested = PROFILE_HEADER_ENABLED and requested_by_admin(scope)
+        if not requested and not profiler.take(scope, self.routes):
+            await self.app(scope, receive, send)
+            return
+
+        name = profile_name(scope)
+
+        async def send_with_profile_id(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(PROFILE_ID_HEADER, name)
+            await send(message)
+
+        sampler = StackSampler(profiler.interval_ms / 1000)
+        token = profiled_request.set(sampler)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            profiled_request.reset(token)
+            await run_in_threadpool(profiler.write, name, sampler)
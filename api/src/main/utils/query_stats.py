@@ -0,0 +1,105 @@
+"""
+Helper functions for per-request query counts and query budgets
+
+QueryStatsMiddleware gives every request a QueryStats that the engine
+listeners (see database.instrument_engine) add each statement to, including
+statements run on worker threads, and reports the totals to the client in a
+Server-Timing header (db;dur=<ms>;desc="<n> queries").
+
+Routes can declare how many statements they may run with @query_budget(n).
+A request that runs more is logged and recorded in query_budget_violations,
+which the test suite checks after every test, so a change that makes a route
+query per row fails the tests that exercise it.
+"""
+
+import logging
+from collections import deque
+
+from src.main.database import QueryStats, current_query_stats
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Recent requests that ran more statements than their route's budget
+query_budget_violations = deque(maxlen=100)
+
+
+def query_budget(max_queries: int):
+    """
+    Decorator declaring the most statements a route may run per request.
+    Apply it below the router decorator. Count the cache invalidation NOTIFY
+    that the Postgres bus sends when a write commits: the test suite sends
+    it too, so tests check the same count production runs.
+    """
+
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+
+    return decorator
+
+
+def server_timing(stats: QueryStats) -> str:
+    """
+    Returns the Server-Timing header value for a request's database work.
+    """
+
+    return f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+
+
+def check_query_budget(scope: Scope, stats: QueryStats):
+    """
+    Records a violation if a request ran more statements than its route's
+    budget.
+    """
+
+    route = scope.get("route")
+    budget = getattr(getattr(route, "endpoint", None), "query_budget", None)
+    if budget is None or stats.count <= budget:
+        return
+
+    violation = {
+        "method": scope["method"],
+        "route": route.path,
+        "queries": stats.count,
+        "budget": budget,
+    }
+    query_budget_violations.append(violation)
+    logger.warning(
+        "%s %s ran %d queries, over its budget of %d",
+        violation["method"],
+        violation["route"],
+        violation["queries"],
+        violation["budget"],
+    )
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that collects the statements each request runs, sends
+    them in a Server-Timing header and checks the route's query budget.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(stats))
+            await send(message)
+
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            check_query_budget(scope, stats)
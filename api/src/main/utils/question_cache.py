@@ -0,0 +1,112 @@
+"""
+Helper functions for caching the published question list
+
+Every attendee of an event sees the same published questions, so the
+serialized JSON for that view is cached per event and served as-is. Entries
+are tagged with the event version they were built from and are only served
+while it is still current, and event writes evict them on every worker
+through the invalidation bus. The cache is an LRU bounded by the total size
+of the cached bodies.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from src.main.models import Event
+from src.main.schemas import QuestionOut
+
+from .invalidation import EVENT, invalidation_bus
+from .question_serialization import list_questions
+
+QUESTION_CACHE_MAX_BYTES = int(
+    os.getenv("QUESTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+question_list_adapter = TypeAdapter(list[QuestionOut])
+
+
+class QuestionListCache:
+    """
+    Thread-safe LRU cache of serialized question lists keyed by event id.
+    Holds at most max_bytes of JSON.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, event_id: int, version: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(event_id)
+            if entry is None or entry[0] != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(event_id)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, event_id: int, version: int, body: bytes):
+        with self._lock:
+            self._pop(event_id)
+            if len(body) > self.max_bytes:
+                return
+            self._entries[event_id] = (version, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def invalidate(self, event_id: int):
+        with self._lock:
+            self._pop(event_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def _pop(self, event_id: int):
+        entry = self._entries.pop(event_id, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+published_questions_cache = QuestionListCache(QUESTION_CACHE_MAX_BYTES)
+invalidation_bus.subscribe(
+    EVENT, lambda event_id: published_questions_cache.invalidate(int(event_id))
+)
+invalidation_bus.subscribe_reset(published_questions_cache.clear)
+
+
+def get_published_questions_json(db: Session, event: Event) -> bytes:
+    """
+    Returns the JSON for an event's published questions, from the cache when
+    it was built for the event's current version.
+    """
+
+    body = published_questions_cache.get(event.id, event.version)
+    if body is None:
+        questions = list_questions(db, event.id, published_only=True)
+        body = question_list_adapter.dump_json(
+            question_list_adapter.validate_python(questions)
+        )
+        published_questions_cache.put(event.id, event.version, body)
+    return body
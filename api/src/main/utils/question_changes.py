@@ -0,0 +1,156 @@
+"""
+Helper functions for syncing question changes incrementally
+
+Every write to a question stamps questions.changed_version with the event
+version it bumped to, and deleting a question leaves a tombstone at that
+version. A client keeps the event version it last synced as its cursor and
+asks for everything stamped after it, so a reconnecting client downloads only
+what changed. Unpublishing a question leaves a tombstone that only attendees
+sync, and attendees only get tombstones of questions that were published at
+their cursor, so draft ids never reach them. The cursor is read before the rows: a concurrent write can only
+make a question show up twice, never be missed.
+"""
+
+from typing import Optional
+
+from sqlalchemy import insert, literal, select, true, update
+from sqlalchemy.orm import Session
+from src.main.models import Event, Question, QuestionAsker, QuestionTombstone
+
+from .question_serialization import list_questions
+
+
+def tombstone_question(
+    db: Session, question: Question, version: int, unpublished: bool = False
+):
+    """
+    Records a question's deletion, or with unpublished its unpublishing, at
+    an event version. Call before changing the question. Does not commit.
+    """
+
+    db.add(
+        QuestionTombstone(
+            event_id=question.event_id,
+            question_id=question.id,
+            version=version,
+            published_version=question.published_version,
+            unpublished=unpublished,
+        )
+    )
+
+
+def tombstone_unpublished_questions(
+    db: Session, event_id: int, question_ids: list[int], version: int
+):
+    """
+    Records the unpublishing of those of the questions that are published,
+    in a single statement. Call before unpublishing them. Does not commit.
+    """
+
+    db.execute(
+        insert(QuestionTombstone).from_select(
+            [
+                "event_id",
+                "question_id",
+                "version",
+                "published_version",
+                "unpublished",
+            ],
+            select(
+                Question.event_id,
+                Question.id,
+                literal(version),
+                Question.published_version,
+                true(),
+            ).where(
+                Question.event_id == event_id,
+                Question.id.in_(question_ids),
+                Question.is_published == True,
+            ),
+        )
+    )
+
+
+def record_user_question_changes(db: Session, user_id: int):
+    """
+    Tombstones the questions a user asked and stamps the questions they are
+    an asker of, at each event's current version. Call after
+    bump_user_event_versions() and before deleting the user. Does not commit.
+    """
+
+    event_version = (
+        select(Event.version)
+        .where(Event.id == Question.event_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        insert(QuestionTombstone).from_select(
+            ["event_id", "question_id", "version", "published_version"],
+            select(
+                Question.event_id,
+                Question.id,
+                event_version,
+                Question.published_version,
+            ).where(Question.user_id == user_id),
+        )
+    )
+    db.execute(
+        update(Question)
+        .where(
+            Question.id.in_(
+                select(QuestionAsker.question_id).where(
+                    QuestionAsker.user_id == user_id
+                )
+            )
+        )
+        .values(changed_version=event_version)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_question_changes(
+    db: Session, event: Event, cursor: Optional[int], is_host: bool
+) -> dict:
+    """
+    Returns the questions created or changed and the ids of questions deleted
+    since a cursor, with the cursor to sync from next time. Attendees only
+    get published questions, and get questions that were unpublished as
+    deleted. Without a cursor every question is returned.
+    """
+
+    # Read the cursor before the rows it covers
+    version = event.version
+    if cursor is not None and cursor >= version:
+        return {"cursor": version, "questions": [], "deleted_ids": []}
+
+    questions = list_questions(
+        db, event.id, published_only=not is_host, changed_since=cursor
+    )
+    deleted_ids = []
+    if cursor is not None:
+        tombstones = db.query(QuestionTombstone.question_id).filter(
+            QuestionTombstone.event_id == event.id,
+            QuestionTombstone.version > cursor,
+        )
+        if is_host:
+            tombstones = tombstones.filter(
+                QuestionTombstone.unpublished == False
+            )
+        else:
+            tombstones = tombstones.filter(
+                QuestionTombstone.published_version <= cursor
+            )
+
+        # A question republished since the cursor is sent as changed
+        changed_ids = {question["id"] for question in questions}
+        deleted_ids = [
+            question_id
+            for question_id, in tombstones.distinct()
+            if question_id not in changed_ids
+        ]
+
+    return {
+        "cursor": version,
+        "questions": questions,
+        "deleted_ids": sorted(deleted_ids),
+    }
@@ -1,8 +1,20 @@
 # TODO: Delete?
-from src.main.models import Question
+from typing import Optional
 
+from sqlalchemy import asc, func
+from sqlalchemy.orm import Session
+from src.main.models import Question, QuestionAsker, QuestionCategory
+
+from .pagination import paginate
+
+
+def serialize_questionout(
+    question: Question, asker_user_ids: Optional[list[int]] = None
+) -> dict:
+    # Fall back to the askers relationship when ids were not prefetched
+    if asker_user_ids is None:
+        asker_user_ids = [asker.user_id for asker in question.askers]
 
-def serialize_questionout(question: Question) -> dict:
     return {
         "id": question.id,
         "event_id": question.event_id,
@@ -12,6 +24,81 @@ def serialize_questionout(question: Question) -> dict:
         "is_published": question.is_published,
         "published_order": question.published_order,
         "draft_order": question.draft_order,
+        "published_rank": question.published_rank,
+        "draft_rank": question.draft_rank,
         "user_id": question.user_id,
-        "asker_user_ids": [asker.user_id for asker in question.askers],
+        "asker_user_ids": asker_user_ids,
     }
+
+
+# Questions sort published first, then by their rank in their list
+QUESTION_SORT_KEYS = [
+    (Question.is_published, True),
+    (func.coalesce(Question.published_rank, Question.draft_rank), False),
+    (Question.id, False),
+]
+
+
+def list_question_page(
+    db: Session,
+    event_id: int,
+    published_only: bool = False,
+    changed_since: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Fetch and serialize a page of an event's questions together with their
+    asker ids in a single query, regardless of how many questions the event
+    has. With changed_since, only questions changed after that event version.
+    Returns the questions and the cursor for the next page.
+    """
+    asker_user_ids = func.array_remove(
+        func.array_agg(QuestionAsker.user_id), None
+    )
+    query = (
+        db.query(Question, asker_user_ids)
+        .outerjoin(QuestionAsker, QuestionAsker.question_id == Question.id)
+        .filter(Question.event_id == event_id)
+    )
+    if published_only:
+        query = query.filter(Question.is_published == True)
+    if changed_since is not None:
+        query = query.filter(Question.changed_version > changed_since)
+
+    rows, next_cursor = paginate(
+        query.group_by(Question.id), QUESTION_SORT_KEYS, cursor, limit
+    )
+    questions = [serialize_questionout(row[0], row[1] or []) for row in rows]
+    return questions, next_cursor
+
+
+def list_questions(
+    db: Session,
+    event_id: int,
+    published_only: bool = False,
+    changed_since: Optional[int] = None,
+) -> list[dict]:
+    """
+    Fetch and serialize all of an event's questions. See list_question_page().
+    """
+    questions, _ = list_question_page(
+        db, event_id, published_only, changed_since
+    )
+    return questions
+
+
+def list_question_categories(db: Session, event_id: int) -> list:
+    """
+    Fetch an event's question categories in display order.
+    """
+    return (
+        db.query(QuestionCategory)
+        .filter(QuestionCategory.event_id == event_id)
+        .order_by(
+            asc(QuestionCategory.display_rank),
+            asc(QuestionCategory.display_order),
+            asc(QuestionCategory.id),
+        )
+        .all()
+    )
@@ -0,0 +1,273 @@
+"""
+Helper functions for streaming live question changes
+
+Attendees subscribe to an event's questions over server-sent events instead of
+polling. Each worker keeps one stream per event with live subscribers. When
+the invalidation bus reports a change to the event, the stream fetches the
+questions once, diffs them against its last snapshot and formats each delta
+once per view (host or attendee), then hands the same messages to every
+subscriber. Database and serialization work per change is therefore constant
+regardless of how many people are watching.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from src.main import database
+from starlette.concurrency import run_in_threadpool
+
+from .invalidation import EVENT, invalidation_bus
+from .question_serialization import list_questions
+
+logger = logging.getLogger(__name__)
+
+QUESTION_STREAM_QUEUE_SIZE = int(
+    os.getenv("QUESTION_STREAM_QUEUE_SIZE", "100")
+)
+QUESTION_STREAM_KEEPALIVE_SECONDS = float(
+    os.getenv("QUESTION_STREAM_KEEPALIVE_SECONDS", "15")
+)
+
+# Fields that only change a question's position, reported as "reordered"
+ORDER_FIELDS = {
+    "published_order",
+    "draft_order",
+    "published_rank",
+    "draft_rank",
+}
+
+
+def format_sse(kind: str, data) -> str:
+    """
+    Formats one server-sent event.
+    """
+
+    payload = json.dumps(jsonable_encoder(data), separators=(",", ":"))
+    return f"event: {kind}\ndata: {payload}\n\n"
+
+
+def question_view(questions: list[dict], is_host: bool) -> list[dict]:
+    """
+    Returns the questions a viewer can see. Attendees only see published
+    questions.
+    """
+
+    if is_host:
+        return questions
+    return [question for question in questions if question["is_published"]]
+
+
+def question_deltas(
+    previous: list[dict], current: list[dict], is_host: bool
+) -> list[tuple[str, dict]]:
+    """
+    Returns the changes between two full question lists as seen by a viewer.
+    Kinds are created, updated, published, unpublished, deleted and
+    reordered.
+    """
+
+    before = {question["id"]: question for question in previous}
+    after = {question["id"]: question for question in current}
+    deltas = []
+
+    for question in current:
+        old = before.get(question["id"])
+        visible = is_host or question["is_published"]
+        was_visible = old is not None and (is_host or old["is_published"])
+        if old is None:
+            if visible:
+                deltas.append(("created", question))
+        elif old["is_published"] != question["is_published"]:
+            if question["is_published"]:
+                deltas.append(("published", question))
+            elif is_host:
+                deltas.append(("unpublished", question))
+            elif was_visible:
+                deltas.append(("unpublished", {"id": question["id"]}))
+        elif visible and any(
+            old[field] != value
+            for field, value in question.items()
+            if field not in ORDER_FIELDS
+        ):
+            deltas.append(("updated", question))
+
+    for question_id, old in before.items():
+        if question_id not in after and (is_host or old["is_published"]):
+            deltas.append(("deleted", {"id": question_id}))
+
+    # Report the new order unless questions were only removed or appended
+    previous_ids = [
+        question["id"] for question in question_view(previous, is_host)
+    ]
+    current_ids = [
+        question["id"] for question in question_view(current, is_host)
+    ]
+    previous_set, current_set = set(previous_ids), set(current_ids)
+    kept_ids = [i for i in previous_ids if i in current_set]
+    added_ids = [i for i in current_ids if i not in previous_set]
+    if current_ids != kept_ids + added_ids:
+        deltas.append(("reordered", {"ids": current_ids}))
+
+    return deltas
+
+
+class _Subscriber:
+    def __init__(self, is_host: bool):
+        self.is_host = is_host
+        self.queue = asyncio.Queue(maxsize=QUESTION_STREAM_QUEUE_SIZE)
+
+    def send(self, messages: list[str]):
+        try:
+            for message in messages:
+                self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too slow to keep up; end the stream so the client reconnects
+            # and starts again from a fresh snapshot
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class _EventStream:
+    def __init__(self):
+        self.subscribers = set()
+        self.questions = None
+        self.loaded = asyncio.Event()
+        self.changed = asyncio.Event()
+        self.task = None
+
+
+def _fetch_questions(event_id: int) -> list[dict]:
+    db = database.SessionLocal()
+    try:
+        return list_questions(db, event_id)
+    finally:
+        db.close()
+
+
+class QuestionStreamHub:
+    """
+    Shares one question stream per event between all of its subscribers on
+    this worker. Runs on the event loop; on_event_changed() may be called from
+    any thread.
+    """
+
+    def __init__(self):
+        self._streams = {}
+        self._loop = None
+
+    async def subscribe(self, event_id: int, is_host: bool):
+        """
+        Subscribes to an event's questions. Returns the subscriber and the
+        current questions in its view; later changes arrive on
+        subscriber.queue as formatted server-sent events.
+        """
+
+        self._loop = asyncio.get_running_loop()
+        stream = self._streams.get(event_id)
+        if stream is None:
+            stream = self._streams[event_id] = _EventStream()
+            stream.task = asyncio.create_task(self._run(event_id, stream))
+
+        subscriber = _Subscriber(is_host)
+        stream.subscribers.add(subscriber)
+        try:
+            await stream.loaded.wait()
+        except BaseException:
+            self.unsubscribe(event_id, subscriber)
+            raise
+        return subscriber, question_view(stream.questions, is_host)
+
+    def unsubscribe(self, event_id: int, subscriber: _Subscriber):
+        stream = self._streams.get(event_id)
+        if stream is None:
+            return
+        stream.subscribers.discard(subscriber)
+        if not stream.subscribers:
+            del self._streams[event_id]
+            stream.task.cancel()
+
+    def subscriber_count(self, event_id: int) -> int:
+        stream = self._streams.get(event_id)
+        return len(stream.subscribers) if stream else 0
+
+    def on_event_changed(self, event_id: str):
+        loop = self._loop
+        if loop is None or int(event_id) not in self._streams:
+            return
+        try:
+            loop.call_soon_threadsafe(self._mark_changed, int(event_id))
+        except RuntimeError:
+            # The loop has been closed
+            pass
+
+    def _mark_changed(self, event_id: int):
+        stream = self._streams.get(event_id)
+        if stream is not None:
+            stream.changed.set()
+
+    async def _run(self, event_id: int, stream: _EventStream):
+        while True:
+            # Changes that arrive during the fetch trigger another round
+            stream.changed.clear()
+            try:
+                questions = await run_in_threadpool(_fetch_questions, event_id)
+            except Exception:
+                logger.exception("Could not fetch questions for %s", event_id)
+                await asyncio.sleep(1)
+                continue
+
+            if stream.questions is not None:
+                self._fan_out(stream, questions)
+            stream.questions = questions
+            stream.loaded.set()
+            await stream.changed.wait()
+
+    def _fan_out(self, stream: _EventStream, questions: list[dict]):
+        messages = {}
+        for subscriber in list(stream.subscribers):
+            if subscriber.is_host not in messages:
+                messages[subscriber.is_host] = [
+                    format_sse(kind, data)
+                    for kind, data in question_deltas(
+                        stream.questions, questions, subscriber.is_host
+                    )
+                ]
+            subscriber.send(messages[subscriber.is_host])
+
+
+question_stream_hub = QuestionStreamHub()
+invalidation_bus.subscribe(EVENT, question_stream_hub.on_event_changed)
+
+
+async def stream_questions(
+    event_id: int, is_host: bool, keepalive: Optional[float] = None
+):
+    """
+    Yields server-sent events for an event's questions: a snapshot first,
+    then deltas as they happen, with comments as keepalives.
+    """
+
+    keepalive = keepalive or QUESTION_STREAM_KEEPALIVE_SECONDS
+    subscriber, questions = await question_stream_hub.subscribe(
+        event_id, is_host
+    )
+    try:
+        yield format_sse("snapshot", questions)
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscriber.queue.get(), keepalive
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        question_stream_hub.unsubscribe(event_id, subscriber)
@@ -0,0 +1,270 @@
+"""
+Helper functions for ordering questions and categories with rank keys
+
+Integer orders force a client to rewrite the whole list to move one item.
+Rank keys are base-62 strings that sort lexicographically (the columns use the
+"C" collation), so a key can always be generated between two neighbours and a
+move only touches the moved row. Repeated moves into the same gap make keys
+longer; once a key passes RANK_REBALANCE_LENGTH the event's keys are rewritten
+to short, evenly spaced ones in the background.
+"""
+
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import (
+    Integer,
+    String,
+    cast,
+    column,
+    func,
+    update,
+    values,
+)
+from sqlalchemy.orm import Query, Session
+from src.main import database
+from src.main.models import Question, QuestionCategory
+
+from .event_version import bump_event_version
+
+logger = logging.getLogger(__name__)
+
+RANK_DIGITS = (
+    "0123456789" "ABCDEFGHIJKLMNOPQRSTUVWXYZ" "abcdefghijklmnopqrstuvwxyz"
+)
+RANK_BASE = len(RANK_DIGITS)
+RANK_WIDTH = 5
+MAX_ORDER = RANK_BASE**RANK_WIDTH - 1
+RANK_REBALANCE_LENGTH = int(os.getenv("RANK_REBALANCE_LENGTH", "24"))
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Returns a rank key that sorts after before and before after. Either bound
+    may be None for the start or end of the list. Keys never end in "0", so
+    there is always room between two distinct keys.
+    """
+
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} must sort before {after!r}")
+
+    before = before or ""
+    rank = ""
+    i = 0
+    while True:
+        low = RANK_DIGITS.index(before[i]) if i < len(before) else 0
+        high = (
+            RANK_DIGITS.index(after[i])
+            if after is not None and i < len(after)
+            else RANK_BASE
+        )
+        if high - low > 1:
+            return rank + RANK_DIGITS[(low + high) // 2]
+
+        # No free digit at this position; keep the lower one and go deeper
+        rank += RANK_DIGITS[low]
+        if high > low:
+            after = None
+        i += 1
+
+
+def rank_for_move(
+    others: Query,
+    rank_column,
+    previous_rank: Optional[str],
+    next_rank: Optional[str],
+) -> str:
+    """
+    Returns the rank for an item moved between two neighbours. others selects
+    the rest of the destination list. With one neighbour the item is placed
+    right next to it; with none it goes to the end of the list. Raises
+    ValueError if previous_rank does not sort before next_rank.
+    """
+
+    if previous_rank is None and next_rank is None:
+        previous_rank = others.with_entities(func.max(rank_column)).scalar()
+    elif next_rank is None:
+        next_rank = (
+            others.filter(rank_column > previous_rank)
+            .with_entities(func.min(rank_column))
+            .scalar()
+        )
+    elif previous_rank is None:
+        previous_rank = (
+            others.filter(rank_column < next_rank)
+            .with_entities(func.max(rank_column))
+            .scalar()
+        )
+    if next_rank is None and previous_rank is not None:
+        return rank_after(previous_rank)
+    return rank_between(previous_rank, next_rank)
+
+
+def rank_after(rank: Optional[str]) -> str:
+    """
+    Returns a key that sorts after rank, for appending to the end of a list.
+    Increments the first RANK_WIDTH digits, so repeated appends keep keys
+    RANK_WIDTH long instead of growing a digit at a time.
+    """
+
+    if rank is None:
+        return rank_between(None, None)
+    prefix = rank[:RANK_WIDTH].ljust(RANK_WIDTH, "0")
+    value = 0
+    for digit in prefix:
+        value = value * RANK_BASE + RANK_DIGITS.index(digit)
+    if value == MAX_ORDER:
+        return rank_between(rank, None)
+    return order_rank(value + 1)
+
+
+def order_rank(order: int) -> str:
+    """
+    Returns the rank key for an integer order, so keys written by the integer
+    reorder endpoints sort the same way as the orders themselves. Raises
+    ValueError for orders outside 1 to MAX_ORDER, which have no distinct key.
+    """
+
+    if not 1 <= order <= MAX_ORDER:
+        raise ValueError(f"Order {order} must be between 1 and {MAX_ORDER}")
+    digits = []
+    for _ in range(RANK_WIDTH):
+        order, digit = divmod(order, RANK_BASE)
+        digits.append(RANK_DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def needs_rebalance(rank: Optional[str]) -> bool:
+    return rank is not None and len(rank) > RANK_REBALANCE_LENGTH
+
+
+def rebalance_question_ranks(
+    db: Session, event_id: int, version: Optional[int] = None
+):
+    """
+    Rewrites an event's question ranks (and integer orders) to evenly spaced
+    values, keeping the current order. Stamps the questions as changed at
+    version when given. Does not commit.
+    """
+
+    questions = (
+        db.query(
+            Question.id,
+            Question.is_published,
+            Question.published_rank,
+            Question.draft_rank,
+        )
+        .filter(Question.event_id == event_id)
+        .order_by(
+            Question.published_rank,
+            Question.draft_rank,
+            Question.published_order,
+            Question.draft_order,
+            Question.id,
+        )
+        .with_for_update()
+        .all()
+    )
+    if not questions:
+        return
+
+    rows = []
+    positions = {True: 0, False: 0}
+    for question in questions:
+        positions[question.is_published] += 1
+        position = positions[question.is_published]
+        rank = order_rank(position)
+        if question.is_published:
+            rows.append((question.id, rank, None, position, None))
+        else:
+            rows.append((question.id, None, rank, None, position))
+
+    changes = values(
+        column("id", Integer),
+        column("published_rank", String),
+        column("draft_rank", String),
+        column("published_order", Integer),
+        column("draft_order", Integer),
+        name="changes",
+    ).data(rows)
+    columns = {
+        "published_rank": cast(changes.c.published_rank, String),
+        "draft_rank": cast(changes.c.draft_rank, String),
+        "published_order": cast(changes.c.published_order, Integer),
+        "draft_order": cast(changes.c.draft_order, Integer),
+    }
+    if version is not None:
+        columns["changed_version"] = version
+    db.execute(
+        update(Question)
+        .where(Question.id == changes.c.id)
+        .values(**columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebalance_category_ranks(db: Session, event_id: int):
+    """
+    Rewrites an event's category ranks (and display orders) to evenly spaced
+    values, keeping the current order. Does not commit.
+    """
+
+    category_ids = [
+        category_id
+        for category_id, in db.query(QuestionCategory.id)
+        .filter(QuestionCategory.event_id == event_id)
+        .order_by(
+            QuestionCategory.display_rank,
+            QuestionCategory.display_order,
+            QuestionCategory.id,
+        )
+        .with_for_update()
+    ]
+    if not category_ids:
+        return
+
+    changes = values(
+        column("id", Integer),
+        column("display_rank", String),
+        column("display_order", Integer),
+        name="changes",
+    ).data(
+        [
+            (category_id, order_rank(position), position)
+            for position, category_id in enumerate(category_ids, start=1)
+        ]
+    )
+    db.execute(
+        update(QuestionCategory)
+        .where(QuestionCategory.id == changes.c.id)
+        .values(
+            display_rank=changes.c.display_rank,
+            display_order=changes.c.display_order,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebalance_event_ranks(event_id: int):
+    """
+    Background task that rebalances an event's question and category ranks
+    in its own session.
+    """
+
+    if database.SessionLocal is None:
+        return
+    # Keep the rebalance out of the triggering request's query stats
+    stats_token = database.current_query_stats.set(None)
+    db = database.SessionLocal()
+    try:
+        version = bump_event_version(db, event_id)
+        rebalance_question_ranks(db, event_id, version)
+        rebalance_category_ranks(db, event_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Could not rebalance ranks for event %s", event_id)
+    finally:
+        db.close()
+        database.current_query_stats.reset(stats_token)
@@ -0,0 +1,65 @@
+"""
+Helper functions for keeping a client's reads on the primary after it writes
+
+Reads from a replica can trail the primary by up to
+DB_REPLICA_MAX_LAG_SECONDS, so a client that has just written would see its
+change disappear on its next read. Every successful write response therefore
+sets a short-lived cookie that makes get_async_read_db() use the primary for
+that client until the replica has caught up.
+"""
+
+import time
+
+from src.main import database
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Methods that do not write
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def read_primary_cookie(sticky_seconds: float) -> str:
+    """
+    Returns the Set-Cookie value that keeps reads on the primary for
+    sticky_seconds.
+    """
+
+    until = time.time() + sticky_seconds
+    return (
+        f"{database.READ_PRIMARY_COOKIE}={until:.3f}; "
+        f"Max-Age={int(sticky_seconds) + 1}; Path=/; HttpOnly; SameSite=Lax"
+    )
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware that sets the read-primary cookie on successful responses
+    to writes while a replica is configured.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        monitor = database.replica_monitor
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or monitor is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message):
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    read_primary_cookie(monitor.sticky_seconds()),
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
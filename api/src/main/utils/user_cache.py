@@ -0,0 +1,125 @@
+"""
+Helper functions for caching authenticated users
+
+Authenticated requests resolve the JWT subject to a user on every call. The
+cache keeps a bounded, short-lived snapshot of each user (never the ORM
+instance, which is bound to the session that loaded it) so most requests can
+skip the users table. Tokens carry a "ver" claim fingerprinting the user row;
+a cached snapshot is only used when its version matches the token's.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from src.main.models import User
+
+from .invalidation import USER, invalidate_on_commit, invalidation_bus
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+
+def user_version(user) -> str:
+    """
+    Returns a short fingerprint of the user fields that change when an account
+    is registered. Stored in the JWT "ver" claim.
+    """
+
+    key = os.getenv("JWT_SECRET_KEY", "").encode("utf-8")
+    state = f"{user.id}:{user.is_registered}:{user.hashed_password}"
+    return hashlib.blake2b(
+        state.encode("utf-8"), key=key[:64], digest_size=8
+    ).hexdigest()
+
+
+class CachedUser:
+    """
+    Detached snapshot of a User row. Exposes the same attributes handlers read
+    from the ORM model.
+    """
+
+    def __init__(self, user: User):
+        self.id = user.id
+        self.email = user.email
+        self.first_name = user.first_name
+        self.last_name = user.last_name
+        self.is_registered = user.is_registered
+        self.version = user_version(user)
+
+
+class UserCache:
+    """
+    Thread-safe LRU cache of CachedUser snapshots keyed by email (the JWT
+    subject). Entries expire after ttl seconds.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, email: str, version: Optional[str] = None
+    ) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+            cached_user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[email]
+                return None
+            if version is not None and cached_user.version != version:
+                return None
+            self._entries.move_to_end(email)
+            return cached_user
+
+    def put(self, user: User) -> CachedUser:
+        cached_user = CachedUser(user)
+        with self._lock:
+            self._entries[user.email] = (
+                cached_user,
+                time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(user.email)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return cached_user
+
+    def invalidate(self, email: str):
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+current_user_cache = UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE)
+invalidation_bus.subscribe(USER, current_user_cache.invalidate)
+invalidation_bus.subscribe_reset(current_user_cache.clear)
+
+
+def get_cached_user(jwt_payload: Optional[dict]) -> Optional[CachedUser]:
+    """
+    Returns the cached user for a JWT payload, or None on a cache miss.
+    """
+
+    if not jwt_payload or "sub" not in jwt_payload:
+        return None
+    return current_user_cache.get(jwt_payload["sub"], jwt_payload.get("ver"))
+
+
+def invalidate_cached_user(db: Session, email: str):
+    """
+    Drops a user from the cache on every worker once the session commits.
+    Call before committing changes to the user.
+    """
+
+    invalidate_on_commit(db, USER, email)
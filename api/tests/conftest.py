@@ -1,15 +1,29 @@
+import os
+
 from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env.test", override=True)
 
+# Tests drive outbox delivery directly instead of through the worker thread
+os.environ.setdefault("EMAIL_OUTBOX_WORKER", "false")
+# Tests run in a single process, so apply cache invalidations in memory
+os.environ.setdefault("CACHE_INVALIDATION_BUS", "memory")
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from testcontainers.postgres import PostgresContainer
 
+from src.main import database
 from src.main.database import get_db, init_engine_and_session
 from src.main.main import app
 from src.main.models import Base
+from src.main.utils import query_budget_violations
+from src.main.utils.invalidation import (
+    CACHE_INVALIDATION_CHANNEL,
+    PostgresInvalidationBus,
+    invalidation_bus,
+)
 
 
 
@@ -26,6 +40,8 @@ def db_engine(postgres_container):
     # Initialize the app's database engine/session for tests
     init_engine_and_session(test_db_url)
     engine = create_engine(test_db_url)
+    # Count the statements routes run through the overridden get_db
+    database.instrument_engine(engine)
     # Create all tables from SQLAlchemy models
     Base.metadata.create_all(engine)
     yield engine
@@ -58,3 +74,74 @@ def test_client(TestingSessionLocal):
 
     # cleanup override so other tests are not affected
     app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def host_event_data():
+    """Return the payload create_host_event creates events from."""
+    return {
+        "address": "123 Main",
+        "description": "Test event",
+        "end_time": "2030-01-02T00:00:00Z",
+        "start_time": "2030-01-01T00:00:00Z",
+        "title": "Test Event",
+    }
+
+
+@pytest.fixture
+def create_host_event(test_client, host_event_data):
+    """
+    Return a function that signs up a user by email and has them create an
+    event, returning the event's id. The user stays signed in on test_client.
+    """
+    def create(email):
+        test_client.post(
+            "/api/users/",
+            json={"email": email, "password": "testpassword"},
+        )
+        response = test_client.post(
+            "/api/private/events/", json=host_event_data
+        )
+        return response.json()["id"]
+
+    return create
+
+
+@pytest.fixture
+def query_counter(db_engine):
+    """
+    Record every SQL statement executed against the test engine (and the
+    app's engines, used by async routes) while the test runs. Tests can
+    clear the list before the call they want to measure.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engines = [db_engine]
+    # Async routes fall back to the app's own engine without asyncpg
+    if database.engine is not db_engine:
+        engines.append(database.engine)
+    if database.async_engine is not None:
+        engines.append(database.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(monkeypatch):
+    """
+    Fail any test in which a request ran more statements than its route's
+    declared query budget. Invalidations are sent with NOTIFY as the
+    production Postgres bus does (nothing listens), so budgets count it.
+    """
+    notify_bus = PostgresInvalidationBus(CACHE_INVALIDATION_CHANNEL)
+    monkeypatch.setattr(invalidation_bus, "publish", notify_bus.publish)
+    query_budget_violations.clear()
+    yield
+    if query_budget_violations:
+        pytest.fail(f"Query budget exceeded: {list(query_budget_violations)}")
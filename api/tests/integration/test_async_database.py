@@ -0,0 +1,85 @@
+"""
+Tests for the async database stack:
+- Test that ported read routes run on the async engine.
+- Test that get_async_db falls back to a sync session without it.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event, text
+from src.main import database
+from src.main.database import SyncSessionAdapter, get_async_db
+
+
+@pytest.fixture
+def async_engine(test_client, db_engine, monkeypatch):
+    """
+    Turn on the asyncpg engine (off by default) for one test.
+    """
+
+    url = db_engine.url.render_as_string(hide_password=False)
+
+    def reinit():
+        # asyncpg connections belong to the test client's event loop
+        test_client.portal.call(database.dispose_async_engine)
+        database.engine.dispose()
+        database.init_engine_and_session(url)
+
+    monkeypatch.setenv("DB_ASYNC_DRIVER", "true")
+    reinit()
+    yield database.async_engine
+    monkeypatch.delenv("DB_ASYNC_DRIVER")
+    reinit()
+
+
+def test_read_routes_use_async_engine(test_client, async_engine):
+    test_client.post(
+        "/api/users/",
+        json={"email": "async-host@example.com", "password": "pw"},
+    )
+    test_client.post(
+        "/api/private/events/",
+        json={
+            "address": "123 Main",
+            "description": "Async event",
+            "end_time": "2030-01-02T00:00:00Z",
+            "start_time": "2030-01-01T00:00:00Z",
+            "title": "Async Event",
+        },
+    )
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sync_engine = async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = test_client.get("/api/private/events/")
+    finally:
+        event.remove(
+            sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+
+    assert response.status_code == 200
+    assert [e["title"] for e in response.json()] == ["Async Event"]
+    assert any("FROM events" in statement for statement in statements)
+    assert async_engine.pool.stats()["checkouts"] >= 1
+
+
+def test_get_async_db_falls_back_to_sync_session(db_engine, monkeypatch):
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+
+    async def select_one():
+        sessions = get_async_db()
+        db = await sessions.__anext__()
+        try:
+            assert isinstance(db, SyncSessionAdapter)
+            return await db.run_sync(
+                lambda session: session.execute(text("SELECT 1")).scalar()
+            )
+        finally:
+            await sessions.aclose()
+
+    assert asyncio.run(select_one()) == 1
@@ -0,0 +1,77 @@
+"""
+Tests for bulk invites:
+- Test per-row outcomes for new, repeated and already invited emails.
+- Test that invites and their emails are written with a fixed number of
+  queries.
+"""
+
+from src.main.models import EmailOutbox
+
+
+def test_bulk_invite_reports_outcomes(
+    test_client, TestingSessionLocal, create_host_event
+):
+    event_id = create_host_event("bulk-host@example.com")
+    test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "bulk-existing@example.com"},
+    )
+
+    response = test_client.post(
+        "/api/invites/bulk",
+        json={
+            "event_id": event_id,
+            "invites": [
+                {"email": "bulk-new@example.com"},
+                {"email": "bulk-host@example.com", "role": "host"},
+                {"email": "bulk-existing@example.com"},
+                {"email": "bulk-new@example.com"},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert [row["outcome"] for row in data["results"]] == [
+        "created",
+        "created",
+        "already_invited",
+        "duplicate",
+    ]
+    assert data["results"][0]["invite"]["event"]["id"] == event_id
+    assert data["results"][1]["invite"]["role"] == "host"
+    assert data["results"][1]["invite"]["user_name"] == "bulk-host@example.com"
+
+    db = TestingSessionLocal()
+    queued = {
+        email.to_email
+        for email in db.query(EmailOutbox).filter(
+            EmailOutbox.to_email.in_(
+                ["bulk-new@example.com", "bulk-host@example.com"]
+            )
+        )
+    }
+    db.close()
+    assert queued == {"bulk-new@example.com", "bulk-host@example.com"}
+
+
+def test_bulk_invite_query_count_is_constant(
+    test_client, query_counter, create_host_event
+):
+    event_id = create_host_event("bulk-count@example.com")
+
+    def invite(prefix, count):
+        query_counter.clear()
+        test_client.post(
+            "/api/invites/bulk",
+            json={
+                "event_id": event_id,
+                "invites": [
+                    {"email": f"{prefix}{i}@example.com"} for i in range(count)
+                ],
+            },
+        )
+        return len(query_counter)
+
+    assert invite("small", 2) == invite("large", 200)
@@ -0,0 +1,70 @@
+"""
+Tests for cross-worker cache invalidation:
+- Test that queued invalidations are applied on commit and dropped on
+  rollback.
+- Test that the Postgres bus delivers NOTIFY messages to a listener.
+- Test that deleting a user drops them from the user cache.
+"""
+
+import queue
+
+from sqlalchemy import text
+from src.main.utils import (
+    PostgresInvalidationBus,
+    current_user_cache,
+    invalidate_on_commit,
+    invalidation_bus,
+)
+
+
+def test_invalidations_apply_on_commit(TestingSessionLocal):
+    received = []
+    invalidation_bus.subscribe("test-commit", received.append)
+
+    db = TestingSessionLocal()
+    db.execute(text("SELECT 1"))
+    invalidate_on_commit(db, "test-commit", 1)
+    db.rollback()
+    invalidate_on_commit(db, "test-commit", 2)
+    assert received == []
+    db.commit()
+    db.close()
+
+    assert received == ["2"]
+
+
+def test_postgres_bus_notifies_listeners(db_engine, TestingSessionLocal):
+    bus = PostgresInvalidationBus("test_cache_invalidation", poll_seconds=0.1)
+    received = queue.Queue()
+    bus.subscribe("event", received.put)
+    bus.start(db_engine)
+    try:
+        assert bus.wait_until_listening(timeout=5)
+
+        db = TestingSessionLocal()
+        bus.publish(db, {("event", "1")})
+        db.rollback()
+        bus.publish(db, {("event", "2"), ("event", "3")})
+        db.commit()
+        db.close()
+
+        keys = {received.get(timeout=5), received.get(timeout=5)}
+        assert keys == {"2", "3"}
+        assert received.empty()
+    finally:
+        bus.stop()
+
+
+def test_deleted_user_is_uncached(test_client):
+    email = "uncache@example.com"
+    test_client.post(
+        "/api/users/",
+        json={"email": email, "password": "testpassword"},
+    )
+    test_client.get("/api/auth/me")
+    assert current_user_cache.get(email) is not None
+
+    response = test_client.delete("/api/users/me")
+
+    assert response.status_code == 204
+    assert current_user_cache.get(email) is None
@@ -0,0 +1,76 @@
+"""
+Tests for the app engine's connection pool:
+- Test that connections carry the configured application name.
+- Test that pool usage and checkout waits are recorded.
+- Test that every engine's pool is reported.
+- Test that read routes need only one connection per request.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from src.main import database
+
+
+def test_connections_use_application_name(db_engine):
+    with database.engine.connect() as connection:
+        name = connection.execute(text("SHOW application_name")).scalar()
+
+    assert name == "getloopdin-api"
+
+
+def test_pool_stats_record_checkouts(db_engine):
+    before = database.get_pool_stats()["primary"]
+
+    with database.engine.connect():
+        during = database.get_pool_stats()["primary"]
+
+    after = database.get_pool_stats()["primary"]
+    assert during["checked_out"] == before["checked_out"] + 1
+    assert after["checked_out"] == before["checked_out"]
+    assert after["checkouts"] >= before["checkouts"] + 1
+    assert after["checkout_wait_seconds"] >= before["checkout_wait_seconds"]
+
+
+def test_pool_stats_cover_every_engine(db_engine, monkeypatch):
+    url = db_engine.url.render_as_string(hide_password=False)
+    replica = create_engine(url, **database.engine_options(url))
+    monkeypatch.setattr(database, "replica_engine", replica)
+
+    with replica.connect():
+        stats = database.get_pool_stats()
+
+    replica.dispose()
+    assert {"primary", "replica"} <= set(stats)
+    assert stats["replica"]["checked_out"] == 1
+
+
+@pytest.fixture
+def single_connection_pool(test_client, db_engine, monkeypatch):
+    """
+    Give the app engine a pool of one connection for one test.
+    """
+
+    url = db_engine.url.render_as_string(hide_password=False)
+
+    def reinit():
+        database.engine.dispose()
+        database.init_engine_and_session(url)
+
+    monkeypatch.setenv("DB_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2")
+    reinit()
+    yield database.engine
+    for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT"):
+        monkeypatch.delenv(name)
+    reinit()
+
+
+def test_question_listing_uses_one_connection(
+    test_client, single_connection_pool, create_host_event
+):
+    event_id = create_host_event("one-connection@example.com")
+
+    response = test_client.get(f"/api/events/{event_id}/questions")
+
+    assert response.status_code == 200
@@ -0,0 +1,155 @@
+"""
+Tests for the email outbox:
+- Test that creating an invite queues its email instead of sending it.
+- Test batched delivery over a single SMTP connection.
+- Test retry with backoff and giving up after the last attempt.
+- Test that delivered emails stay sent when the connection fails to close
+  or the worker dies mid-batch.
+"""
+
+import smtplib
+from datetime import datetime, timezone
+
+import pytest
+from src.main.models import EmailOutbox
+from src.main.utils import deliver_pending_emails, email_outbox, enqueue_email
+
+EVENT = {
+    "address": "123 Main",
+    "description": "Outbox event",
+    "end_time": "2030-01-02T00:00:00Z",
+    "start_time": "2030-01-01T00:00:00Z",
+    "title": "Outbox Event",
+}
+
+
+# --- Mocks ---
+class MockSMTP:
+    connections = 0
+
+    def __init__(self):
+        MockSMTP.connections += 1
+        self.sent = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def send_message(self, msg):
+        self.sent.append(msg["To"])
+
+
+class FailingQuitSMTP(MockSMTP):
+    def __exit__(self, *args):
+        raise smtplib.SMTPServerDisconnected("Connection lost on QUIT")
+
+
+class CrashingSMTP(MockSMTP):
+    def send_message(self, msg):
+        if self.sent:
+            raise SystemExit("Worker killed")
+        super().send_message(msg)
+
+
+@pytest.fixture
+def db(TestingSessionLocal):
+    db = TestingSessionLocal()
+    db.query(EmailOutbox).delete()
+    db.commit()
+    yield db
+    db.close()
+
+
+# --- Tests ---
+def test_create_invite_queues_email(test_client, db, monkeypatch):
+    def fail_smtp(*args, **kwargs):
+        raise AssertionError("SMTP must not be used inside the request")
+
+    monkeypatch.setattr(smtplib, "SMTP", fail_smtp)
+    test_client.post(
+        "/api/users/",
+        json={"email": "outbox-host@example.com", "password": "testpassword"},
+    )
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+
+    response = test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "outbox-guest@example.com"},
+    )
+
+    assert response.status_code == 200
+    queued = db.query(EmailOutbox).all()
+    assert [email.to_email for email in queued] == ["outbox-guest@example.com"]
+    assert queued[0].status == "pending"
+    assert "Outbox Event" in queued[0].subject
+
+
+def test_deliver_pending_emails_uses_one_connection(db):
+    for i in range(3):
+        enqueue_email(db, f"batch{i}@example.com", "Subject", "<p>Body</p>")
+    db.commit()
+    MockSMTP.connections = 0
+
+    processed = deliver_pending_emails(db, batch_size=10, connect=MockSMTP)
+
+    assert processed == 3
+    assert MockSMTP.connections == 1
+    assert {email.status for email in db.query(EmailOutbox)} == {"sent"}
+
+
+def test_deliver_pending_emails_retries_with_backoff(db, monkeypatch):
+    def refuse_connection():
+        raise ConnectionRefusedError("SMTP unavailable")
+
+    enqueue_email(db, "retry@example.com", "Subject", "<p>Body</p>")
+    db.commit()
+
+    deliver_pending_emails(db, connect=refuse_connection)
+    email = db.query(EmailOutbox).one()
+
+    assert email.status == "pending"
+    assert email.attempts == 1
+    assert email.next_attempt_at > datetime.now(timezone.utc)
+    assert "SMTP unavailable" in email.last_error
+
+    # Due again, and this is the last allowed attempt
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    email.next_attempt_at = datetime.now(timezone.utc)
+    db.commit()
+    deliver_pending_emails(db, connect=refuse_connection)
+    db.refresh(email)
+
+    assert email.status == "failed"
+    assert email.attempts == 2
+
+
+def test_failed_quit_does_not_resend(db):
+    for i in range(2):
+        enqueue_email(db, f"quit{i}@example.com", "Subject", "<p>Body</p>")
+    db.commit()
+
+    assert deliver_pending_emails(db, connect=FailingQuitSMTP) == 2
+    assert {email.status for email in db.query(EmailOutbox)} == {"sent"}
+    assert deliver_pending_emails(db, connect=MockSMTP) == 0
+
+
+def test_crash_mid_batch_keeps_sent_emails(db):
+    for i in range(3):
+        enqueue_email(db, f"crash{i}@example.com", "Subject", "<p>Body</p>")
+    db.commit()
+
+    with pytest.raises(SystemExit):
+        deliver_pending_emails(db, connect=CrashingSMTP)
+    db.rollback()
+    emails = db.query(EmailOutbox).order_by(EmailOutbox.id).all()
+
+    assert [email.status for email in emails] == ["sent", "pending", "pending"]
+    # The unsent emails wait out the claim before another worker retries
+    assert all(
+        email.next_attempt_at > datetime.now(timezone.utc)
+        for email in emails[1:]
+    )
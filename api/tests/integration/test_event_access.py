@@ -0,0 +1,93 @@
+"""
+Tests for the event access context:
+- Test that event, user and role are resolved with a single query.
+- Test host, participant and anonymous access errors.
+- Test that invite token holders cannot create questions.
+"""
+
+EVENT = {
+    "address": "123 Main",
+    "description": "Event access event",
+    "end_time": "2030-01-02T00:00:00Z",
+    "start_time": "2030-01-01T00:00:00Z",
+    "title": "Event Access",
+}
+
+
+def sign_up(test_client, email):
+    return test_client.post(
+        "/api/users/",
+        json={"email": email, "password": "testpassword"},
+    )
+
+
+def test_get_event_by_id_uses_single_query(test_client, query_counter):
+    sign_up(test_client, "access-host@example.com")
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+
+    query_counter.clear()
+    response = test_client.get(f"/api/private/events/{event_id}")
+
+    assert response.status_code == 200
+    assert response.json()["title"] == EVENT["title"]
+    assert len(query_counter) == 1
+
+
+def test_non_host_cannot_manage_categories(test_client):
+    sign_up(test_client, "access-owner@example.com")
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+    sign_up(test_client, "access-outsider@example.com")
+
+    create_response = test_client.post(
+        f"/api/events/{event_id}/question-categories", json={"name": "FAQ"}
+    )
+    get_response = test_client.get(f"/api/private/events/{event_id}")
+
+    assert create_response.status_code == 403
+    assert (
+        create_response.json()["detail"] == "Only hosts can create categories"
+    )
+    assert get_response.status_code == 404
+
+
+def test_missing_event_and_anonymous_access(test_client):
+    sign_up(test_client, "access-missing@example.com")
+    missing_response = test_client.get("/api/events/999999/questions")
+
+    test_client.cookies.clear()
+    anonymous_response = test_client.delete("/api/events/1/questions/1")
+
+    assert missing_response.status_code == 404
+    assert anonymous_response.status_code == 401
+    assert anonymous_response.json()["detail"] == "Not logged in"
+
+
+def test_invite_token_cannot_create_questions(test_client):
+    sign_up(test_client, "access-asker-host@example.com")
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+    test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "access-guest@example.com"},
+    )
+    token = test_client.get(
+        "/api/invites/", params={"event_id": event_id}
+    ).json()[0]["token"]
+
+    test_client.cookies.clear()
+    response = test_client.post(
+        f"/api/events/{event_id}/questions",
+        json={"question_text": "Anonymous?", "invite_token": token},
+    )
+    questions = test_client.get(
+        f"/api/events/{event_id}/questions", params={"invite_token": token}
+    )
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Not logged in"
+    assert questions.json() == []
@@ -0,0 +1,81 @@
+"""
+Tests for event versions and ETags:
+- Test that question and category reads return an ETag and answer 304 when
+  If-None-Match is current, without querying the rows.
+- Test that question, category and event changes bump the version.
+- Test that hosts and attendees get different ETags.
+"""
+
+
+def get_etag(test_client, url):
+    response = test_client.get(url)
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+
+def test_questions_not_modified(test_client, query_counter, create_host_event):
+    event_id = create_host_event("etag@example.com")
+    url = f"/api/events/{event_id}/questions"
+    test_client.post(url, json={"question_text": "Question"})
+    etag = get_etag(test_client, url)
+
+    query_counter.clear()
+    response = test_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    assert not any(
+        "FROM questions" in statement for statement in query_counter
+    )
+
+
+def test_mutations_change_etags(
+    test_client, create_host_event, host_event_data
+):
+    event_id = create_host_event("etag-changes@example.com")
+    questions_url = f"/api/events/{event_id}/questions"
+    categories_url = f"/api/events/{event_id}/question-categories"
+
+    etag = get_etag(test_client, questions_url)
+    question_id = test_client.post(
+        questions_url, json={"question_text": "Question"}
+    ).json()["id"]
+    changed_etag = get_etag(test_client, questions_url)
+    assert changed_etag != etag
+
+    test_client.put(
+        f"{questions_url}/{question_id}", json={"answer_text": "Answer"}
+    )
+    assert get_etag(test_client, questions_url) != changed_etag
+
+    etag = get_etag(test_client, categories_url)
+    test_client.post(categories_url, json={"name": "Category"})
+    changed_etag = get_etag(test_client, categories_url)
+    assert changed_etag != etag
+
+    test_client.put(f"/api/private/events/{event_id}", json=host_event_data)
+    response = test_client.get(
+        categories_url, headers={"If-None-Match": changed_etag}
+    )
+    assert response.status_code == 200
+
+
+def test_etag_varies_by_viewer(test_client, create_host_event):
+    event_id = create_host_event("etag-host@example.com")
+    url = f"/api/events/{event_id}/questions"
+    host_etag = get_etag(test_client, url)
+
+    token = test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "etag-guest@example.com"},
+    ).json()["token"]
+    test_client.cookies.clear()
+    response = test_client.get(
+        url,
+        params={"invite_token": token},
+        headers={"If-None-Match": host_etag},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != host_etag
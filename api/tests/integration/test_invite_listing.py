@@ -0,0 +1,68 @@
+"""
+Tests for invite listing:
+- Test that invites are serialized with their event and user.
+- Test that the number of queries does not grow with the number of invites.
+"""
+
+EVENT = {
+    "address": "123 Main",
+    "description": "Invite listing event",
+    "end_time": "2030-01-02T00:00:00Z",
+    "start_time": "2030-01-01T00:00:00Z",
+    "title": "Invite Listing Event",
+}
+
+
+def invite_guests(test_client, event_id, prefix, count):
+    test_client.post(
+        "/api/invites/bulk",
+        json={
+            "event_id": event_id,
+            "invites": [
+                {"email": f"{prefix}{i}@example.com"} for i in range(count)
+            ],
+        },
+    )
+
+
+def test_get_invites_query_count_is_constant(test_client, query_counter):
+    test_client.post(
+        "/api/users/",
+        json={
+            "email": "listing-guest@example.com",
+            "first_name": "Listing",
+            "last_name": "Guest",
+            "password": "testpassword",
+        },
+    )
+    test_client.post(
+        "/api/users/",
+        json={"email": "listing-host@example.com", "password": "testpassword"},
+    )
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+    invite_guests(test_client, event_id, "listing-small", 2)
+    test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "listing-guest@example.com"},
+    )
+
+    query_counter.clear()
+    small_response = test_client.get(f"/api/invites/?event_id={event_id}")
+    small_event_queries = len(query_counter)
+
+    invite_guests(test_client, event_id, "listing-large", 60)
+    query_counter.clear()
+    large_response = test_client.get(f"/api/invites/?event_id={event_id}")
+
+    assert len(small_response.json()) == 3
+    assert len(large_response.json()) == 63
+    assert len(query_counter) == small_event_queries
+    guest = next(
+        invite
+        for invite in large_response.json()
+        if invite["email"] == "listing-guest@example.com"
+    )
+    assert guest["user_name"] == "Listing Guest"
+    assert guest["event"]["title"] == EVENT["title"]
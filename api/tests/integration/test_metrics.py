@@ -0,0 +1,99 @@
+"""
+Tests for the metrics endpoint:
+- Test that requests are recorded by route template, not raw path.
+- Test that unmatched paths share one label.
+- Test that pool and thread pool metrics are exported.
+- Test that a configured token is required.
+- Test that metrics are closed without a token unless made public.
+"""
+
+import pytest
+from src.main.routers import metrics_router
+from src.main.utils import request_metrics
+
+EVENT = {
+    "address": "123 Main",
+    "description": "Metrics event",
+    "end_time": "2030-01-02T00:00:00Z",
+    "start_time": "2030-01-01T00:00:00Z",
+    "title": "Metrics Event",
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics(monkeypatch):
+    """Start each test with empty request metrics, served without a token."""
+    request_metrics.reset()
+    monkeypatch.setattr(metrics_router, "METRICS_PUBLIC", True)
+
+
+def scrape(test_client):
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    return response.text.splitlines()
+
+
+def test_requests_recorded_by_route_template(test_client):
+    test_client.post(
+        "/api/users/",
+        json={"email": "metrics@example.com", "password": "testpassword"},
+    )
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+    test_client.get(f"/api/events/{event_id}/questions")
+    test_client.get("/api/events/999999/questions")
+
+    lines = scrape(test_client)
+    labels = 'method="GET",route="/api/events/{event_id}/questions"'
+    assert f'http_responses_total{{{labels},status="200"}} 1' in lines
+    assert f'http_responses_total{{{labels},status="404"}} 1' in lines
+    assert any(
+        line.startswith(f"http_request_duration_seconds_count{{{labels}}}")
+        for line in lines
+    )
+    assert not any(f"/api/events/{event_id}/" in line for line in lines)
+
+
+def test_unmatched_paths_share_one_label(test_client):
+    test_client.get("/wp-login.php")
+    test_client.get("/.env")
+
+    lines = scrape(test_client)
+    assert (
+        'http_responses_total{method="GET",route="unmatched",status="404"} 2'
+        in lines
+    )
+    assert not any("wp-login" in line for line in lines)
+
+
+def test_pool_and_thread_pool_metrics(test_client):
+    names = {line.split("{")[0].split(" ")[0] for line in scrape(test_client)}
+
+    assert "http_requests_in_flight" in names
+    assert "db_pool_checked_out" in names
+    assert any(
+        line.startswith('db_pool_checked_out{engine="primary"}')
+        for line in scrape(test_client)
+    )
+    assert "db_pool_checkout_wait_seconds_total" in names
+    assert "threadpool_threads_busy" in names
+    assert "threadpool_tasks_waiting" in names
+
+
+def test_metrics_token_required(test_client, monkeypatch):
+    monkeypatch.setattr(metrics_router, "METRICS_TOKEN", "scrape-secret")
+
+    assert test_client.get("/metrics").status_code == 401
+    response = test_client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    )
+    assert response.status_code == 200
+
+
+def test_metrics_closed_without_token(test_client, monkeypatch):
+    monkeypatch.setattr(metrics_router, "METRICS_TOKEN", None)
+    monkeypatch.setattr(metrics_router, "METRICS_PUBLIC", False)
+
+    assert test_client.get("/metrics").status_code == 403
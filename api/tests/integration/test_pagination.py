@@ -0,0 +1,106 @@
+"""
+Tests for cursor pagination of list endpoints:
+- Test that pages of events, invites and questions join up to the full list.
+- Test that the last page has no next cursor.
+- Test that a malformed cursor is rejected.
+"""
+
+EVENT = {
+    "address": "123 Main",
+    "description": "Pagination event",
+    "end_time": "2030-01-02T00:00:00Z",
+    "title": "Pagination",
+}
+
+
+def fetch_pages(test_client, url, limit, **params):
+    pages = []
+    params["limit"] = limit
+    while True:
+        response = test_client.get(url, params=params)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        params["cursor"] = cursor
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+def test_events_pagination(test_client):
+    test_client.post(
+        "/api/users/",
+        json={"email": "pages-events@example.com", "password": "pw"},
+    )
+    # Events sharing a start time are ordered by id
+    for day in (3, 1, 2, 1, 1):
+        test_client.post(
+            "/api/private/events/",
+            json={**EVENT, "start_time": f"2030-01-0{day}T00:00:00Z"},
+        )
+
+    full = test_client.get("/api/private/events/").json()
+    pages = fetch_pages(test_client, "/api/private/events/", 2)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert ids(sum(pages, [])) == ids(full)
+
+
+def test_invites_pagination(test_client):
+    test_client.post(
+        "/api/users/",
+        json={"email": "pages-invites@example.com", "password": "pw"},
+    )
+    event_id = test_client.post(
+        "/api/private/events/",
+        json={**EVENT, "start_time": "2030-01-01T00:00:00Z"},
+    ).json()["id"]
+    test_client.post(
+        "/api/invites/bulk",
+        json={
+            "event_id": event_id,
+            "invites": [
+                {"email": f"pages-guest{i}@example.com"} for i in range(5)
+            ],
+        },
+    )
+
+    url = "/api/invites/"
+    full = test_client.get(url, params={"event_id": event_id}).json()
+    pages = fetch_pages(test_client, url, 2, event_id=event_id)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert ids(sum(pages, [])) == ids(full)
+
+
+def test_questions_pagination(test_client):
+    test_client.post(
+        "/api/users/",
+        json={"email": "pages-questions@example.com", "password": "pw"},
+    )
+    event_id = test_client.post(
+        "/api/private/events/",
+        json={**EVENT, "start_time": "2030-01-01T00:00:00Z"},
+    ).json()["id"]
+    for i in range(5):
+        test_client.post(
+            f"/api/events/{event_id}/questions",
+            json={
+                "question_text": f"Question {i}",
+                "answer_text": "Yes",
+                "is_published": i % 2 == 0,
+            },
+        )
+
+    url = f"/api/events/{event_id}/questions"
+    full = test_client.get(url).json()
+    pages = fetch_pages(test_client, url, 2)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert ids(sum(pages, [])) == ids(full)
+
+    response = test_client.get(url, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,79 @@
+"""
+Tests for participant listing:
+- Test that participants are listed with their names in one query.
+- Test cursor pagination by user id.
+"""
+
+EVENT = {
+    "address": "123 Main",
+    "description": "Participant listing event",
+    "end_time": "2030-01-02T00:00:00Z",
+    "start_time": "2030-01-01T00:00:00Z",
+    "title": "Participant Listing Event",
+}
+
+
+def add_participants(test_client, event_id, prefix, count):
+    response = test_client.post(
+        "/api/invites/bulk",
+        json={
+            "event_id": event_id,
+            "invites": [
+                {"email": f"{prefix}{i}@example.com"} for i in range(count)
+            ],
+        },
+    )
+    tokens = [row["invite"]["token"] for row in response.json()["results"]]
+    for token in tokens:
+        test_client.put(f"/api/invites/{token}", json={"status": "accepted"})
+    return tokens
+
+
+def test_participant_listing_query_count_is_constant(
+    test_client, query_counter
+):
+    test_client.post(
+        "/api/users/",
+        json={"email": "participants-host@example.com", "password": "pw"},
+    )
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+    token = add_participants(test_client, event_id, "participants-small", 2)[0]
+    url = f"/api/public/events/token/{token}/participants"
+
+    query_counter.clear()
+    small_response = test_client.get(url)
+    small_event_queries = len(query_counter)
+
+    add_participants(test_client, event_id, "participants-large", 30)
+    query_counter.clear()
+    large_response = test_client.get(url)
+
+    assert len(small_response.json()) == 3
+    assert len(large_response.json()) == 33
+    host = {"name": "participants-host@example.com", "role": "host"}
+    assert len(query_counter) == small_event_queries
+    assert host.items() <= large_response.json()[0].items()
+
+
+def test_participant_listing_pagination(test_client):
+    test_client.post(
+        "/api/users/",
+        json={"email": "pages-host@example.com", "password": "pw"},
+    )
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+    add_participants(test_client, event_id, "pages", 4)
+    url = f"/api/private/events/{event_id}/participants"
+
+    first_response = test_client.get(f"{url}?limit=3")
+    cursor = first_response.headers["X-Next-Cursor"]
+    second_response = test_client.get(f"{url}?limit=3&cursor={cursor}")
+    first_page, second_page = first_response.json(), second_response.json()
+
+    all_ids = [p["id"] for p in test_client.get(url).json()]
+    assert [p["id"] for p in first_page + second_page] == all_ids
+    assert len(second_page) == 2
+    assert "X-Next-Cursor" not in second_response.headers
@@ -0,0 +1,126 @@
+"""
+Tests for profiling live requests:
+- Test that only admins can arm the profiler.
+- Test that the next matching requests are profiled to disk.
+- Test that admins can profile a request with the X-Profile header.
+- Test that only the newest profiles are kept.
+- Test that nothing is profiled when profiling is unavailable.
+"""
+
+import re
+
+import pytest
+from src.main.utils import generate_jwt_token, profiling, request_profiler
+
+TOKEN_ROUTE = "/api/public/events/token/{token}"
+
+
+class TokenUser:
+    def __init__(self, email, role=None):
+        self.email = email
+        self.role = role
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(request_profiler, "directory", str(tmp_path))
+    yield tmp_path
+    request_profiler.disarm()
+
+
+@pytest.fixture
+def as_admin(test_client):
+    token = generate_jwt_token(TokenUser("admin@example.com", "admin"))
+    test_client.cookies.set("fast_api_token", token)
+    yield
+    test_client.cookies.delete("fast_api_token")
+
+
+def test_profiling_requires_admin(test_client, profile_dir):
+    test_client.cookies.delete("fast_api_token")
+
+    response = test_client.post("/api/admin/profiling", json={"count": 1})
+
+    assert response.status_code == 403
+    assert request_profiler.remaining == 0
+
+
+def test_next_matching_requests_are_profiled(
+    test_client, profile_dir, as_admin
+):
+    response = test_client.post(
+        "/api/admin/profiling",
+        json={"count": 1, "route": TOKEN_ROUTE, "method": "get"},
+    )
+    assert response.status_code == 200
+    assert response.json()["remaining"] == 1
+
+    # Other routes are not profiled
+    other = test_client.get("/api/auth/me")
+    assert "x-profile-id" not in other.headers
+
+    first = test_client.get("/api/public/events/token/missing")
+    second = test_client.get("/api/public/events/token/missing")
+
+    assert "x-profile-id" not in second.headers
+    name = first.headers["x-profile-id"]
+    status = test_client.get("/api/admin/profiling").json()
+    assert status["remaining"] == 0
+    assert status["profiles"] == [name]
+    lines = (profile_dir / name).read_text().splitlines()
+    assert all(re.fullmatch(r".+ \d+", line) for line in lines)
+
+
+def test_unknown_route_is_rejected(test_client, profile_dir, as_admin):
+    response = test_client.post(
+        "/api/admin/profiling", json={"count": 1, "route": "/nope"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_admins_profile_with_header(
+    test_client, profile_dir, monkeypatch, as_admin
+):
+    monkeypatch.setattr(profiling, "PROFILE_HEADER_ENABLED", True)
+
+    response = test_client.get(
+        "/api/public/events/token/missing", headers={"X-Profile": "1"}
+    )
+    assert (profile_dir / response.headers["x-profile-id"]).exists()
+
+    # Other users' headers are ignored
+    test_client.cookies.delete("fast_api_token")
+    response = test_client.get(
+        "/api/public/events/token/missing", headers={"X-Profile": "1"}
+    )
+    assert "x-profile-id" not in response.headers
+
+
+def test_only_newest_profiles_are_kept(test_client, profile_dir, monkeypatch):
+    monkeypatch.setattr(request_profiler, "max_files", 2)
+    request_profiler.arm(3)
+
+    names = [
+        test_client.get("/api/public/events/token/missing").headers[
+            "x-profile-id"
+        ]
+        for _ in range(3)
+    ]
+
+    assert request_profiler.profiles() == names[1:]
+
+
+def test_unavailable_profiler_stays_off(
+    test_client, profile_dir, monkeypatch, as_admin
+):
+    monkeypatch.setattr(request_profiler, "available", False)
+    monkeypatch.setattr(profiling, "PROFILE_HEADER_ENABLED", True)
+
+    response = test_client.post("/api/admin/profiling", json={"count": 1})
+    assert response.status_code == 503
+
+    response = test_client.get(
+        "/api/public/events/token/missing", headers={"X-Profile": "1"}
+    )
+    assert "x-profile-id" not in response.headers
@@ -0,0 +1,128 @@
+"""
+Tests for the indexes behind the routers' hot queries:
+- Test that each hot query is planned with its index.
+- Test that the database rejects a second invite for the same email.
+- Test that inviting the same email twice is reported as a bad request.
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from src.main.models import (
+    Event,
+    Invite,
+    Participant,
+    Question,
+    QuestionCategory,
+)
+from src.main.utils import QUESTION_SORT_KEYS
+
+HOT_QUERIES = [
+    (
+        "ix_participants_user_id_role",
+        lambda db: db.query(Participant.event_id).filter(
+            Participant.user_id == 1, Participant.role == "host"
+        ),
+    ),
+    (
+        "uq_invites_event_id_email",
+        lambda db: db.query(Invite).filter(
+            Invite.event_id == 1, Invite.email == "guest@example.com"
+        ),
+    ),
+    (
+        "ix_invites_user_id_status",
+        lambda db: db.query(Invite).filter(
+            Invite.user_id == 1, Invite.status == "pending"
+        ),
+    ),
+    (
+        "ix_questions_event_id_is_published_rank",
+        lambda db: db.query(Question)
+        .filter(Question.event_id == 1, Question.is_published == True)
+        .order_by(
+            *[
+                expression.desc() if descending else expression.asc()
+                for expression, descending in QUESTION_SORT_KEYS
+            ]
+        ),
+    ),
+    (
+        "ix_question_categories_event_id_display_rank",
+        lambda db: db.query(QuestionCategory)
+        .filter(QuestionCategory.event_id == 1)
+        .order_by(QuestionCategory.display_rank),
+    ),
+]
+
+
+@pytest.mark.parametrize("index, build_query", HOT_QUERIES)
+def test_hot_query_uses_index(TestingSessionLocal, index, build_query):
+    db = TestingSessionLocal()
+    try:
+        # The test tables are tiny; make the planner prefer any index
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        statement = build_query(db).statement.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = "\n".join(
+            db.execute(text(f"EXPLAIN {statement}")).scalars().all()
+        )
+    finally:
+        db.close()
+
+    assert index in plan, plan
+
+
+def test_invites_are_unique_per_event_and_email(TestingSessionLocal):
+    db = TestingSessionLocal()
+    try:
+        event = Event(
+            address="123 Main",
+            description="Unique invite event",
+            end_time="2030-01-02T00:00:00Z",
+            start_time="2030-01-01T00:00:00Z",
+            title="Unique Invite Event",
+        )
+        db.add(event)
+        db.flush()
+        for token in ("unique-1", "unique-2"):
+            db.add(
+                Invite(
+                    event_id=event.id,
+                    email="unique@example.com",
+                    role="participant",
+                    token=token,
+                )
+            )
+        with pytest.raises(IntegrityError):
+            db.flush()
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_create_invite_twice(test_client):
+    test_client.post(
+        "/api/users/",
+        json={"email": "plans-host@example.com", "password": "pw"},
+    )
+    event_id = test_client.post(
+        "/api/private/events/",
+        json={
+            "address": "123 Main",
+            "description": "Duplicate invite event",
+            "end_time": "2030-01-02T00:00:00Z",
+            "start_time": "2030-01-01T00:00:00Z",
+            "title": "Duplicate Invite Event",
+        },
+    ).json()["id"]
+    invite = {"event_id": event_id, "email": "plans-guest@example.com"}
+
+    assert test_client.post("/api/invites/", json=invite).status_code == 200
+    response = test_client.post("/api/invites/", json=invite)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "An invitation has already been sent."
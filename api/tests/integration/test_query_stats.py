@@ -0,0 +1,85 @@
+"""
+Tests for per-request query stats:
+- Test that responses report their database work in Server-Timing.
+- Test that a route over its query budget is recorded.
+- Test that slow statements are logged with their route.
+"""
+
+import logging
+import re
+
+from src.main import database
+from src.main.routers import public_event_router
+from src.main.utils import query_budget_violations
+
+EVENT = {
+    "address": "123 Main",
+    "description": "Query stats event",
+    "end_time": "2030-01-02T00:00:00Z",
+    "start_time": "2030-01-01T00:00:00Z",
+    "title": "Query Stats Event",
+}
+
+
+def create_invite_token(test_client, email):
+    test_client.post(
+        "/api/users/",
+        json={"email": email, "password": "testpassword"},
+    )
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+    test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": f"guest-{email}"},
+    )
+    invites = test_client.get("/api/invites/", params={"event_id": event_id})
+    return invites.json()[0]["token"]
+
+
+def test_server_timing_reports_queries(test_client):
+    token = create_invite_token(test_client, "timing-host@example.com")
+
+    response = test_client.get(f"/api/public/events/token/{token}")
+
+    assert response.status_code == 200
+    timing = re.fullmatch(
+        r'db;dur=[\d.]+;desc="(\d+) queries"',
+        response.headers["server-timing"],
+    )
+    assert timing and int(timing.group(1)) == 2
+
+
+def test_route_over_budget_is_recorded(test_client, monkeypatch):
+    token = create_invite_token(test_client, "budget-host@example.com")
+    monkeypatch.setattr(
+        public_event_router.get_event_by_token, "query_budget", 1
+    )
+
+    test_client.get(f"/api/public/events/token/{token}")
+
+    assert list(query_budget_violations) == [
+        {
+            "method": "GET",
+            "route": "/api/public/events/token/{token}",
+            "queries": 2,
+            "budget": 1,
+        }
+    ]
+    query_budget_violations.clear()
+
+
+def test_slow_queries_are_logged_with_route(test_client, monkeypatch, caplog):
+    token = create_invite_token(test_client, "slow-host@example.com")
+    monkeypatch.setattr(database, "DB_SLOW_QUERY_MS", 1e-6)
+
+    with caplog.at_level(logging.WARNING, logger=database.__name__):
+        test_client.get(f"/api/public/events/token/{token}")
+
+    slow = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith("Slow query")
+    ]
+    assert slow
+    assert all("/api/public/events/token/{token}" in line for line in slow)
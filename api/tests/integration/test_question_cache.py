@@ -0,0 +1,58 @@
+"""
+Tests for the published question cache:
+- Test that attendees are served the cached list without querying questions.
+- Test that host changes are visible to attendees straight away.
+"""
+
+EVENT = {
+    "address": "123 Main",
+    "description": "Question cache event",
+    "end_time": "2030-01-02T00:00:00Z",
+    "start_time": "2030-01-01T00:00:00Z",
+    "title": "Question Cache",
+}
+
+
+def test_attendees_read_cached_questions(test_client, query_counter):
+    test_client.post(
+        "/api/users/",
+        json={"email": "cache-host@example.com", "password": "testpassword"},
+    )
+    event_id = test_client.post("/api/private/events/", json=EVENT).json()[
+        "id"
+    ]
+    url = f"/api/events/{event_id}/questions"
+    question = test_client.post(
+        url,
+        json={
+            "question_text": "Published",
+            "answer_text": "Yes",
+            "is_published": True,
+        },
+    ).json()
+    test_client.post(url, json={"question_text": "Draft"})
+    token = test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "cache-guest@example.com"},
+    ).json()["token"]
+    host_cookies = dict(test_client.cookies)
+    test_client.cookies.clear()
+
+    first = test_client.get(url, params={"invite_token": token})
+    query_counter.clear()
+    second = test_client.get(url, params={"invite_token": token})
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert [q["question_text"] for q in second.json()] == ["Published"]
+    assert second.headers["etag"] == first.headers["etag"]
+    assert not any(
+        "FROM questions" in statement for statement in query_counter
+    )
+
+    # A host edit is visible to attendees on their next read
+    test_client.cookies.update(host_cookies)
+    test_client.put(f"{url}/{question['id']}", json={"answer_text": "No"})
+    test_client.cookies.clear()
+    response = test_client.get(url, params={"invite_token": token})
+    assert response.json()[0]["answer_text"] == "No"
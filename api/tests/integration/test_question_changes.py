@@ -0,0 +1,194 @@
+"""
+Tests for syncing question changes since a cursor:
+- Test that only questions changed since the cursor are returned.
+- Test that deleted questions are returned as tombstones.
+- Test that attendees see unpublished questions as deleted.
+- Test that attendees never get the ids of drafts.
+- Test that an up-to-date cursor returns nothing.
+- Test that deleting a user tombstones the questions they asked.
+"""
+
+from src.main.models import Question, QuestionAsker, User
+from src.main.utils import (
+    bump_user_event_versions,
+    record_user_question_changes,
+)
+
+
+def create_question(test_client, event_id, text, is_published=False):
+    return test_client.post(
+        f"/api/events/{event_id}/questions",
+        json={
+            "question_text": text,
+            "answer_text": "Yes",
+            "is_published": is_published,
+        },
+    ).json()["id"]
+
+
+def changes(test_client, event_id, cursor=None, **params):
+    if cursor is not None:
+        params["cursor"] = cursor
+    response = test_client.get(
+        f"/api/events/{event_id}/questions/changes", params=params
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_question_changes_since_cursor(test_client, create_host_event):
+    event_id = create_host_event("changes@example.com")
+    a = create_question(test_client, event_id, "A")
+    b = create_question(test_client, event_id, "B")
+
+    full = changes(test_client, event_id)
+    assert [q["id"] for q in full["questions"]] == [a, b]
+    assert full["deleted_ids"] == []
+    cursor = full["cursor"]
+
+    # Nothing changed
+    assert changes(test_client, event_id, cursor) == {
+        "cursor": cursor,
+        "questions": [],
+        "deleted_ids": [],
+    }
+
+    c = create_question(test_client, event_id, "C")
+    test_client.put(
+        f"/api/events/{event_id}/questions/{a}",
+        json={"question_text": "A edited"},
+    )
+    test_client.delete(f"/api/events/{event_id}/questions/{b}")
+
+    delta = changes(test_client, event_id, cursor)
+    assert {q["id"] for q in delta["questions"]} == {a, c}
+    assert delta["deleted_ids"] == [b]
+    assert delta["cursor"] > cursor
+
+    # Reordering marks the moved questions as changed
+    cursor = delta["cursor"]
+    test_client.put(
+        f"/api/events/{event_id}/questions/{c}/move",
+        json={"is_published": False, "next_id": a},
+    )
+    delta = changes(test_client, event_id, cursor)
+    assert [q["id"] for q in delta["questions"]] == [c]
+    assert delta["deleted_ids"] == []
+
+
+def guest_changes(test_client, event_id, token, cursor=None):
+    # Read without the host's session cookie
+    cookies = list(test_client.cookies.jar)
+    test_client.cookies.clear()
+    try:
+        return changes(test_client, event_id, cursor, invite_token=token)
+    finally:
+        for cookie in cookies:
+            test_client.cookies.jar.set_cookie(cookie)
+
+
+def test_question_changes_for_attendees(test_client, create_host_event):
+    event_id = create_host_event("changes-host@example.com")
+    a = create_question(test_client, event_id, "A", is_published=True)
+    b = create_question(test_client, event_id, "B")
+    token = test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "changes-guest@example.com"},
+    ).json()["token"]
+
+    full = guest_changes(test_client, event_id, token)
+    assert [q["id"] for q in full["questions"]] == [a]
+    assert full["deleted_ids"] == []
+
+    # Unpublishing looks like a deletion to attendees
+    test_client.put(
+        f"/api/events/{event_id}/questions/order",
+        json={
+            "items": [
+                {"question_id": a, "is_published": False, "draft_order": 2},
+                {"question_id": b, "is_published": True, "published_order": 1},
+            ]
+        },
+    )
+    delta = guest_changes(test_client, event_id, token, full["cursor"])
+    assert [q["id"] for q in delta["questions"]] == [b]
+    assert delta["deleted_ids"] == [a]
+
+    # Hosts still have the unpublished question
+    host_delta = changes(test_client, event_id, full["cursor"])
+    assert {q["id"] for q in host_delta["questions"]} == {a, b}
+    assert host_delta["deleted_ids"] == []
+
+
+def test_question_changes_hide_drafts_from_attendees(
+    test_client, create_host_event
+):
+    event_id = create_host_event("changes-drafts@example.com")
+    a = create_question(test_client, event_id, "A", is_published=True)
+    draft = create_question(test_client, event_id, "Draft")
+    token = test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "drafts-guest@example.com"},
+    ).json()["token"]
+    cursor = guest_changes(test_client, event_id, token)["cursor"]
+
+    # Drafts edited, published and unpublished since the cursor stay hidden
+    test_client.put(
+        f"/api/events/{event_id}/questions/{draft}",
+        json={"question_text": "Draft edited"},
+    )
+    brief = create_question(test_client, event_id, "Brief", is_published=True)
+    test_client.put(
+        f"/api/events/{event_id}/questions/{brief}/move",
+        json={"is_published": False},
+    )
+    test_client.delete(f"/api/events/{event_id}/questions/{brief}")
+
+    # A question unpublished and published again is sent as changed
+    for is_published in (False, True):
+        test_client.put(
+            f"/api/events/{event_id}/questions/{a}/move",
+            json={"is_published": is_published},
+        )
+
+    delta = guest_changes(test_client, event_id, token, cursor)
+    assert [q["id"] for q in delta["questions"]] == [a]
+    assert delta["deleted_ids"] == []
+
+
+def test_question_changes_requires_access(test_client, create_host_event):
+    event_id = create_host_event("changes-auth@example.com")
+    test_client.cookies.clear()
+
+    response = test_client.get(f"/api/events/{event_id}/questions/changes")
+    assert response.status_code == 401
+
+
+def test_deleting_a_user_tombstones_their_questions(
+    test_client, TestingSessionLocal, create_host_event
+):
+    event_id = create_host_event("changes-owner@example.com")
+    kept = create_question(test_client, event_id, "Kept")
+    cursor = changes(test_client, event_id)["cursor"]
+
+    db = TestingSessionLocal()
+    user = User(email="changes-asker@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    question = Question(event_id=event_id, user_id=user.id, question_text="Q")
+    db.add(question)
+    db.flush()
+    db.add(QuestionAsker(question_id=kept, user_id=user.id))
+    db.commit()
+    question_id, user_id = question.id, user.id
+
+    bump_user_event_versions(db, user.id)
+    record_user_question_changes(db, user.id)
+    db.delete(user)
+    db.commit()
+    db.close()
+
+    delta = changes(test_client, event_id, cursor)
+    assert [q["id"] for q in delta["questions"]] == [kept]
+    assert user_id not in delta["questions"][0]["asker_user_ids"]
+    assert delta["deleted_ids"] == [question_id]
@@ -0,0 +1,44 @@
+"""
+Tests for question listing:
+- Test that questions are returned with their asker ids.
+- Test that the number of queries does not grow with the number of questions.
+"""
+
+
+def create_questions(test_client, event_id, count):
+    for i in range(count):
+        test_client.post(
+            f"/api/events/{event_id}/questions",
+            json={"question_text": f"Question {i}"},
+        )
+
+
+def test_get_questions_includes_asker_ids(test_client, create_host_event):
+    event_id = create_host_event("askers@example.com")
+    create_questions(test_client, event_id, 2)
+    host_id = test_client.get("/api/auth/me").json()["id"]
+
+    response = test_client.get(f"/api/events/{event_id}/questions")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [q["question_text"] for q in data] == ["Question 0", "Question 1"]
+    assert all(q["asker_user_ids"] == [host_id] for q in data)
+
+
+def test_get_questions_query_count_is_constant(
+    test_client, query_counter, create_host_event
+):
+    event_id = create_host_event("querycount@example.com")
+
+    create_questions(test_client, event_id, 2)
+    query_counter.clear()
+    test_client.get(f"/api/events/{event_id}/questions")
+    small_event_queries = len(query_counter)
+
+    create_questions(test_client, event_id, 40)
+    query_counter.clear()
+    response = test_client.get(f"/api/events/{event_id}/questions")
+
+    assert len(response.json()) == 42
+    assert len(query_counter) == small_event_queries
@@ -0,0 +1,195 @@
+"""
+Tests for moving questions and categories with rank keys:
+- Test that a question can be moved between neighbours, to the end and into
+  the published list.
+- Test that a move touches a single row.
+- Test that the costliest move stays within the route's query budget.
+- Test that long rank keys are rebalanced in the background.
+- Test that appended questions keep short rank keys.
+- Test that categories can be moved and that integer reorders keep ranks.
+"""
+
+from src.main.models import Question
+from src.main.utils import ranking
+
+
+def create_questions(test_client, event_id, count):
+    return [
+        test_client.post(
+            f"/api/events/{event_id}/questions",
+            json={"question_text": f"Question {i}", "answer_text": "Yes"},
+        ).json()["id"]
+        for i in range(count)
+    ]
+
+
+def question_ids(test_client, event_id, is_published=False):
+    return [
+        q["id"]
+        for q in test_client.get(f"/api/events/{event_id}/questions").json()
+        if q["is_published"] == is_published
+    ]
+
+
+def move(test_client, event_id, question_id, **payload):
+    payload.setdefault("is_published", False)
+    return test_client.put(
+        f"/api/events/{event_id}/questions/{question_id}/move",
+        json=payload,
+    )
+
+
+def test_move_question(test_client, create_host_event):
+    event_id = create_host_event("move@example.com")
+    a, b, c, d = create_questions(test_client, event_id, 4)
+
+    assert move(test_client, event_id, d, previous_id=a).status_code == 204
+    assert question_ids(test_client, event_id) == [a, d, b, c]
+
+    assert move(test_client, event_id, a, next_id=c).status_code == 204
+    assert question_ids(test_client, event_id) == [d, b, a, c]
+
+    assert move(test_client, event_id, d).status_code == 204
+    assert question_ids(test_client, event_id) == [b, a, c, d]
+
+    response = move(test_client, event_id, c, previous_id=d, next_id=b)
+    assert response.status_code == 400
+
+    response = move(test_client, event_id, c, is_published=True)
+    assert response.status_code == 204
+    assert question_ids(test_client, event_id) == [b, a, d]
+    assert question_ids(test_client, event_id, is_published=True) == [c]
+
+
+def test_move_question_within_budget(test_client, create_host_event):
+    event_id = create_host_event("move-budget@example.com")
+    a, b = create_questions(test_client, event_id, 2)
+    category_id = test_client.post(
+        f"/api/events/{event_id}/question-categories", json={"name": "FAQ"}
+    ).json()["id"]
+    move(test_client, event_id, a, is_published=True)
+
+    # Unpublish into a category next to one neighbour, the costliest move
+    response = move(
+        test_client, event_id, a, previous_id=b, category_id=category_id
+    )
+    assert response.status_code == 204
+    assert question_ids(test_client, event_id) == [b, a]
+
+
+def test_move_question_updates_one_row(
+    test_client, query_counter, create_host_event
+):
+    event_id = create_host_event("move-count@example.com")
+    ids = create_questions(test_client, event_id, 30)
+
+    query_counter.clear()
+    response = move(
+        test_client, event_id, ids[0], previous_id=ids[14], next_id=ids[15]
+    )
+
+    assert response.status_code == 204
+    updates = [
+        statement
+        for statement in query_counter
+        if statement.startswith("UPDATE questions")
+    ]
+    assert len(updates) == 1
+    assert question_ids(test_client, event_id)[14] == ids[0]
+
+
+def test_long_ranks_are_rebalanced(
+    test_client, TestingSessionLocal, monkeypatch, create_host_event
+):
+    limit = ranking.RANK_WIDTH + 2
+    monkeypatch.setattr(ranking, "RANK_REBALANCE_LENGTH", limit)
+    event_id = create_host_event("rebalance@example.com")
+    ids = create_questions(test_client, event_id, 3)
+
+    # Keep moving the last question into the gap after the first one
+    for _ in range(30):
+        order = question_ids(test_client, event_id)
+        move(
+            test_client,
+            event_id,
+            order[-1],
+            previous_id=order[0],
+            next_id=order[1],
+        )
+    order = question_ids(test_client, event_id)
+
+    db = TestingSessionLocal()
+    questions = {
+        question.id: question
+        for question in db.query(Question).filter(Question.id.in_(ids))
+    }
+    db.close()
+    assert all(len(q.draft_rank) <= limit for q in questions.values())
+    assert [questions[question_id].draft_order for question_id in order] == [
+        1,
+        2,
+        3,
+    ]
+    assert question_ids(test_client, event_id) == order
+
+
+def test_appended_ranks_stay_short(
+    test_client, TestingSessionLocal, create_host_event
+):
+    event_id = create_host_event("append@example.com")
+    ids = create_questions(test_client, event_id, 300)
+
+    # Moving to the end appends too
+    move(test_client, event_id, ids[0])
+    ids += create_questions(test_client, event_id, 2)
+
+    db = TestingSessionLocal()
+    ranks = [
+        rank
+        for (rank,) in db.query(Question.draft_rank).filter(
+            Question.event_id == event_id
+        )
+    ]
+    db.close()
+    assert len(set(ranks)) == len(ids)
+    assert max(len(rank) for rank in ranks) <= ranking.RANK_WIDTH
+    expected = ids[1:300] + [ids[0]] + ids[300:]
+    assert question_ids(test_client, event_id) == expected
+
+
+def test_move_question_category(test_client, create_host_event):
+    event_id = create_host_event("move-category@example.com")
+    a, b, c = [
+        test_client.post(
+            f"/api/events/{event_id}/question-categories",
+            json={"name": name},
+        ).json()["id"]
+        for name in ("A", "B", "C")
+    ]
+
+    response = test_client.put(
+        f"/api/events/{event_id}/question-categories/{c}/move",
+        json={"next_id": a},
+    )
+    assert response.status_code == 204
+    categories = test_client.get(
+        f"/api/events/{event_id}/question-categories"
+    ).json()
+    assert [category["id"] for category in categories] == [c, a, b]
+
+    # Integer reorders keep the rank keys in step
+    response = test_client.put(
+        f"/api/events/{event_id}/question-categories/order",
+        json={
+            "items": [
+                {"category_id": b, "display_order": 1},
+                {"category_id": a, "display_order": 2},
+                {"category_id": c, "display_order": 3},
+            ]
+        },
+    )
+    assert response.status_code == 204
+    categories = test_client.get(
+        f"/api/events/{event_id}/question-categories"
+    ).json()
+    assert [category["id"] for category in categories] == [b, a, c]
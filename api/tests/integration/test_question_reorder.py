@@ -0,0 +1,123 @@
+"""
+Tests for question reordering:
+- Test that order, publish state and published_at are applied.
+- Test that unknown, unanswered and unordered questions are rejected with
+  no changes.
+- Test that the number of queries does not grow with the number of questions.
+"""
+
+from src.main.models import Question
+
+
+def create_questions(test_client, event_id, count, answered=True):
+    ids = []
+    for i in range(count):
+        response = test_client.post(
+            f"/api/events/{event_id}/questions",
+            json={
+                "question_text": f"Question {i}",
+                "answer_text": f"Answer {i}" if answered else None,
+            },
+        )
+        ids.append(response.json()["id"])
+    return ids
+
+
+def reorder_payload(question_ids, is_published=True):
+    return {
+        "items": [
+            {
+                "question_id": question_id,
+                "is_published": is_published,
+                "published_order": len(question_ids) - i,
+                "draft_order": None,
+            }
+            for i, question_id in enumerate(question_ids)
+        ]
+    }
+
+
+def test_reorder_questions_applies_changes(
+    test_client, TestingSessionLocal, create_host_event
+):
+    event_id = create_host_event("reorder@example.com")
+    question_ids = create_questions(test_client, event_id, 3)
+
+    response = test_client.put(
+        f"/api/events/{event_id}/questions/order",
+        json=reorder_payload(question_ids),
+    )
+
+    assert response.status_code == 204
+    data = test_client.get(f"/api/events/{event_id}/questions").json()
+    assert [q["id"] for q in data] == list(reversed(question_ids))
+    assert all(q["is_published"] for q in data)
+    assert [q["published_order"] for q in data] == [1, 2, 3]
+
+    db = TestingSessionLocal()
+    try:
+        questions = (
+            db.query(Question).filter(Question.id.in_(question_ids)).all()
+        )
+        assert all(q.published_at is not None for q in questions)
+    finally:
+        db.close()
+
+
+def test_reorder_questions_validates_all_items(test_client, create_host_event):
+    event_id = create_host_event("reorderinvalid@example.com")
+    answered_ids = create_questions(test_client, event_id, 2)
+    unanswered_ids = create_questions(test_client, event_id, 1, answered=False)
+
+    response = test_client.put(
+        f"/api/events/{event_id}/questions/order",
+        json=reorder_payload(answered_ids + [999999]),
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Question not found"
+
+    response = test_client.put(
+        f"/api/events/{event_id}/questions/order",
+        json=reorder_payload(answered_ids + unanswered_ids),
+    )
+    assert response.status_code == 400
+    assert (
+        response.json()["detail"]
+        == "Published questions must include an answer"
+    )
+
+    # Every question needs a valid order in the list it ends up in
+    for order in (None, 0):
+        payload = reorder_payload(answered_ids)
+        payload["items"][0]["published_order"] = order
+        response = test_client.put(
+            f"/api/events/{event_id}/questions/order", json=payload
+        )
+        assert response.status_code == 400
+
+    data = test_client.get(f"/api/events/{event_id}/questions").json()
+    assert not any(q["is_published"] for q in data)
+
+
+def test_reorder_questions_query_count_is_constant(
+    test_client, query_counter, create_host_event
+):
+    event_id = create_host_event("reordercount@example.com")
+
+    question_ids = create_questions(test_client, event_id, 2)
+    query_counter.clear()
+    test_client.put(
+        f"/api/events/{event_id}/questions/order",
+        json=reorder_payload(question_ids),
+    )
+    small_reorder_queries = len(query_counter)
+
+    question_ids += create_questions(test_client, event_id, 40)
+    query_counter.clear()
+    response = test_client.put(
+        f"/api/events/{event_id}/questions/order",
+        json=reorder_payload(question_ids),
+    )
+
+    assert response.status_code == 204
+    assert len(query_counter) == small_reorder_queries
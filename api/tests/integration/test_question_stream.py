@@ -0,0 +1,99 @@
+"""
+Tests for the live question stream:
+- Test that every subscriber gets each change from a single fetch.
+- Test that attendees only see published questions.
+- Test that the stream requires the same authentication as get_questions.
+"""
+
+import asyncio
+
+from src.main.utils import question_stream, question_stream_hub
+
+
+def test_stream_fans_out_one_fetch_per_change(
+    test_client, monkeypatch, create_host_event
+):
+    event_id = create_host_event("stream@example.com")
+    url = f"/api/events/{event_id}/questions"
+
+    fetches = []
+    fetch_questions = question_stream._fetch_questions
+
+    def counting_fetch(fetch_event_id):
+        fetches.append(fetch_event_id)
+        return fetch_questions(fetch_event_id)
+
+    monkeypatch.setattr(question_stream, "_fetch_questions", counting_fetch)
+
+    async def next_message(subscriber):
+        return await asyncio.wait_for(subscriber.queue.get(), 5)
+
+    async def watch():
+        attendees = [
+            (await question_stream_hub.subscribe(event_id, False))[0]
+            for _ in range(5)
+        ]
+        host, snapshot = await question_stream_hub.subscribe(event_id, True)
+        assert snapshot == []
+
+        try:
+            fetches.clear()
+            await asyncio.to_thread(
+                test_client.post,
+                url,
+                json={
+                    "question_text": "Published",
+                    "answer_text": "Yes",
+                    "is_published": True,
+                },
+            )
+            messages = [
+                await next_message(subscriber) for subscriber in attendees
+            ]
+            host_message = await next_message(host)
+            change_fetches = len(fetches)
+
+            await asyncio.to_thread(
+                test_client.post, url, json={"question_text": "Draft"}
+            )
+            draft_message = await next_message(host)
+            attendee_queues_empty = all(
+                subscriber.queue.empty() for subscriber in attendees
+            )
+        finally:
+            for subscriber in attendees + [host]:
+                question_stream_hub.unsubscribe(event_id, subscriber)
+        return (
+            messages,
+            host_message,
+            change_fetches,
+            draft_message,
+            attendee_queues_empty,
+        )
+
+    (
+        messages,
+        host_message,
+        change_fetches,
+        draft_message,
+        attendee_queues_empty,
+    ) = asyncio.run(watch())
+
+    assert change_fetches == 1
+    assert len(set(messages)) == 1
+    assert messages[0].startswith("event: created\n")
+    assert '"question_text":"Published"' in messages[0]
+    assert host_message == messages[0]
+    assert draft_message.startswith("event: created\n")
+    assert '"question_text":"Draft"' in draft_message
+    assert attendee_queues_empty
+    assert question_stream_hub.subscriber_count(event_id) == 0
+
+
+def test_stream_requires_authentication(test_client, create_host_event):
+    event_id = create_host_event("stream-auth@example.com")
+    test_client.cookies.clear()
+
+    response = test_client.get(f"/api/events/{event_id}/questions/stream")
+
+    assert response.status_code == 401
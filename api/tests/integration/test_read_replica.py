@@ -0,0 +1,161 @@
+"""
+Tests for routing reads to a replica:
+- Test that read routes use the replica until the client writes.
+- Test that reads fall back to the primary when the replica lags.
+- Test that reads fall back to the primary when the replica is unreachable.
+- Test that questions are not served from a replica behind the event version.
+- Test that invite tokens missing from the replica are looked up on the
+  primary.
+"""
+
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, delete, insert, select, text
+from src.main import database
+from src.main.models import Base
+
+
+def admin_engine(db_engine):
+    url = db_engine.url.set(database="postgres")
+    return create_engine(url, isolation_level="AUTOCOMMIT")
+
+
+@pytest.fixture
+def replica(db_engine, test_client):
+    """
+    Configure a second database on the test server as the app's replica.
+    Tests copy the primary's rows into it with replicate().
+    """
+    admin = admin_engine(db_engine)
+    with admin.connect() as connection:
+        connection.execute(text("DROP DATABASE IF EXISTS itest_replica"))
+        connection.execute(text("CREATE DATABASE itest_replica"))
+    url = db_engine.url.set(database="itest_replica")
+    replica_engine = create_engine(url)
+    Base.metadata.create_all(replica_engine)
+    database.init_replica_engine_and_session(
+        url.render_as_string(hide_password=False)
+    )
+    yield replica_engine
+
+    if database.async_replica_engine is not None:
+        test_client.portal.call(database.async_replica_engine.dispose)
+    database.init_replica_engine_and_session(None)
+    replica_engine.dispose()
+    with admin.connect() as connection:
+        connection.execute(
+            text("DROP DATABASE IF EXISTS itest_replica WITH (FORCE)")
+        )
+    admin.dispose()
+    test_client.cookies.delete(database.READ_PRIMARY_COOKIE)
+
+
+def replicate(db_engine, replica_engine):
+    """
+    Copy every row from the primary into the replica.
+    """
+    with db_engine.connect() as source, replica_engine.begin() as target:
+        for table in reversed(Base.metadata.sorted_tables):
+            target.execute(delete(table))
+        for table in Base.metadata.sorted_tables:
+            rows = source.execute(select(table)).mappings().all()
+            if rows:
+                target.execute(insert(table), [dict(row) for row in rows])
+
+
+def event_titles(test_client):
+    response = test_client.get("/api/private/events/?role=host")
+    assert response.status_code == 200
+    return [event["title"] for event in response.json()]
+
+
+def test_reads_use_replica_until_client_writes(
+    test_client, db_engine, replica, create_host_event
+):
+    create_host_event("replica-host@example.com")
+
+    # The client that wrote reads its own writes from the primary
+    assert database.READ_PRIMARY_COOKIE in test_client.cookies
+    assert event_titles(test_client) == ["Test Event"]
+
+    # Other reads go to the replica, which has not caught up yet
+    test_client.cookies.delete(database.READ_PRIMARY_COOKIE)
+    assert event_titles(test_client) == []
+
+    replicate(db_engine, replica)
+    assert event_titles(test_client) == ["Test Event"]
+
+
+def test_lagging_replica_falls_back_to_primary(
+    test_client, replica, create_host_event
+):
+    create_host_event("replica-lag@example.com")
+    test_client.cookies.delete(database.READ_PRIMARY_COOKIE)
+
+    monitor = database.replica_monitor
+    monitor.lag_seconds = monitor.max_lag_seconds + 1
+    monitor.checked_at = time.monotonic()
+    assert event_titles(test_client) == ["Test Event"]
+    assert database.get_replica_stats()["usable"] is False
+
+
+def test_unreachable_replica_falls_back_to_primary(
+    test_client, db_engine, replica, create_host_event
+):
+    create_host_event("replica-down@example.com")
+    test_client.cookies.delete(database.READ_PRIMARY_COOKIE)
+
+    database.init_replica_engine_and_session(
+        db_engine.url.set(database="missing_replica").render_as_string(
+            hide_password=False
+        )
+    )
+    assert event_titles(test_client) == ["Test Event"]
+    assert database.get_replica_stats()["lag_seconds"] is None
+
+
+def test_questions_wait_for_replica_version(
+    test_client, db_engine, replica, create_host_event
+):
+    event_id = create_host_event("replica-questions@example.com")
+    replicate(db_engine, replica)
+
+    # The replica misses the question and the version bump that came with it
+    test_client.post(
+        f"/api/events/{event_id}/questions",
+        json={"question_text": "Fresh?", "answer_text": "Yes"},
+    )
+    test_client.cookies.delete(database.READ_PRIMARY_COOKIE)
+
+    response = test_client.get(f"/api/events/{event_id}/questions")
+    assert response.status_code == 200
+    assert [q["question_text"] for q in response.json()] == ["Fresh?"]
+
+
+def test_fresh_invites_fall_back_to_primary(
+    test_client, db_engine, replica, create_host_event
+):
+    event_id = create_host_event("replica-invite@example.com")
+    replicate(db_engine, replica)
+
+    # The replica misses the new invite
+    token = test_client.post(
+        "/api/invites/",
+        json={"event_id": event_id, "email": "replica-guest@example.com"},
+    ).json()["token"]
+    test_client.cookies.delete(database.READ_PRIMARY_COOKIE)
+
+    response = test_client.get(f"/api/public/events/token/{token}")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Test Event"
+
+    response = test_client.get(
+        f"/api/public/events/token/{token}/participants"
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+    response = test_client.get(f"/api/public/events/token/{uuid.uuid4()}")
+    assert response.status_code == 404
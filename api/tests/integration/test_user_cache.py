@@ -0,0 +1,34 @@
+"""
+Tests for the authenticated user cache:
+- Test that repeat requests skip the users table.
+- Test that deleting a user invalidates the cached copy.
+"""
+
+
+def test_current_user_is_cached(test_client, query_counter):
+    test_client.post(
+        "/api/users/",
+        json={"email": "cached@example.com", "password": "testpassword"},
+    )
+
+    test_client.get("/api/auth/me")
+    query_counter.clear()
+    response = test_client.get("/api/auth/me")
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "cached@example.com"
+    assert query_counter == []
+
+
+def test_deleted_user_is_evicted(test_client):
+    test_client.post(
+        "/api/users/",
+        json={"email": "evicted@example.com", "password": "testpassword"},
+    )
+    test_client.get("/api/auth/me")
+
+    delete_response = test_client.delete("/api/users/me")
+    me_response = test_client.get("/api/auth/me")
+
+    assert delete_response.status_code == 204
+    assert me_response.status_code == 401
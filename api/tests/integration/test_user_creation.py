@@ -1,3 +1,6 @@
+from src.main.routers import user_router
+
+
 def test_create_user(test_client):
     payload = {
         "email": "integration@example.com",
@@ -13,3 +16,19 @@ def test_create_user(test_client):
 
     assert data["email"] == payload["email"]
     assert "id" in data
+
+
+def test_existing_account_is_rejected_before_hashing(test_client, monkeypatch):
+    payload = {"email": "duplicate@example.com", "password": "testpassword"}
+    test_client.post("/api/users/", json=payload)
+
+    async def fail_hash(password):
+        raise AssertionError("hashed a password for an existing account")
+
+    monkeypatch.setattr(user_router, "hash_password_async", fail_hash)
+    response = test_client.post("/api/users/", json=payload)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "An account already exists for this email."
+    )
@@ -43,6 +43,9 @@ class MockSession:
     def query(self, *args, **kwargs):
         return MockQuery(self._email)
 
+    def close(self):
+        pass
+
 
 # --- Tests ---
 def test_signin_success():
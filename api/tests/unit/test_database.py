@@ -4,3 +4,42 @@ Tests for database setup:
 - Test transaction handling and rollback.
 - Test error handling for database operations.
 """
+
+from src.main.database import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    async_engine_options,
+    engine_options,
+)
+
+
+def test_engine_options_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+
+    options = engine_options("postgresql://user:pw@localhost/db")
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"]["options"] == "-c statement_timeout=5000"
+
+
+def test_engine_options_for_other_backends():
+    options = engine_options("sqlite://")
+
+    assert "poolclass" not in options
+    assert "connect_args" not in options
+
+
+def test_async_engine_options_keep_the_instrumented_pool(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+
+    options = async_engine_options("postgresql://user:pw@localhost/db")
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == 20
+    assert "application_name" in options["connect_args"]["server_settings"]
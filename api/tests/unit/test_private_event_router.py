@@ -6,10 +6,10 @@ Tests for event_router:
 """
 
 from fastapi.testclient import TestClient
-from src.main.database import get_db
+from src.main.database import SyncSessionAdapter, get_async_read_db, get_db
 from src.main.main import app
 from src.main.models import Event, Participant
-from src.main.utils import get_current_user_from_token
+from src.main.utils import get_current_user_async, get_current_user_from_token
 
 client = TestClient(app)
 
@@ -34,8 +34,9 @@ class MockEvent:
 
 
 class MockEventQuery:
-    def __init__(self, events):
+    def __init__(self, events, columns=()):
         self._events = events
+        self._columns = columns
 
     def filter(self, *args):
         filtered = self._events
@@ -55,16 +56,22 @@ class MockEventQuery:
                     filtered = [e for e in filtered if e.start_time > arg.right]
                 elif getattr(arg.left, 'name', None) == 'end_time':
                     filtered = [e for e in filtered if e.end_time < arg.right]
-        return MockEventQuery(filtered)
+        return MockEventQuery(filtered, self._columns)
 
-    def order_by(self, key_func):
+    def add_columns(self, *columns):
+        return MockEventQuery(self._events, columns)
+
+    def order_by(self, key_func, *keys):
         try:
             ordered = sorted(self._events, key=lambda e: getattr(e, key_func.key))
-        except AttributeError:
+        except (AttributeError, TypeError):
             ordered = self._events
-        return MockEventQuery(ordered)
+        return MockEventQuery(ordered, self._columns)
 
     def all(self):
+        # Rows carry the event followed by its sort keys
+        if self._columns:
+            return [(event,) for event in self._events]
         return self._events
 
 
@@ -297,8 +304,10 @@ def test_get_events_host_success():
     ]
     mock_db = MockSession(events=mock_events, participants=mock_participants)
 
-    app.dependency_overrides[get_current_user_from_token] = lambda: MockUser(id=1)
-    app.dependency_overrides[get_db] = lambda: mock_db
+    app.dependency_overrides[get_current_user_async] = lambda: MockUser(id=1)
+    app.dependency_overrides[get_async_read_db] = lambda: SyncSessionAdapter(
+        mock_db
+    )
 
     response = client.get("/api/private/events/?role=host&time=all")
 
@@ -4,3 +4,296 @@ Tests for utils:
 - Test email utility functions (email formatting, sending).
 - Test error handling in utility functions.
 """
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import anyio
+import pytest
+from fastapi import HTTPException
+from src.main.models import Event
+from src.main.utils import (
+    PasswordExecutor,
+    QuestionListCache,
+    RequestMetrics,
+    StackSampler,
+    UserCache,
+    decode_cursor,
+    decode_jwt_token,
+    encode_cursor,
+    generate_jwt_token,
+    MAX_ORDER,
+    hash_password,
+    order_rank,
+    question_deltas,
+    rank_after,
+    rank_between,
+    render_metrics,
+    profiling,
+    verify_password,
+)
+
+
+# --- Mocks ---
+class MockUser:
+    def __init__(self, id=1, email="user@example.com", hashed_password="hash"):
+        self.id = id
+        self.email = email
+        self.first_name = "Test"
+        self.last_name = "User"
+        self.is_registered = True
+        self.hashed_password = hashed_password
+
+
+# --- Tests ---
+def test_user_cache_returns_snapshot():
+    cache = UserCache(ttl=60, max_size=10)
+    cache.put(MockUser())
+
+    cached_user = cache.get("user@example.com")
+
+    assert cached_user.id == 1
+    assert cached_user.first_name == "Test"
+
+
+def test_user_cache_expires_entries():
+    cache = UserCache(ttl=-1, max_size=10)
+    cache.put(MockUser())
+
+    assert cache.get("user@example.com") is None
+
+
+def test_user_cache_evicts_least_recently_used():
+    cache = UserCache(ttl=60, max_size=2)
+    cache.put(MockUser(id=1, email="a@example.com"))
+    cache.put(MockUser(id=2, email="b@example.com"))
+    cache.get("a@example.com")
+    cache.put(MockUser(id=3, email="c@example.com"))
+
+    assert cache.get("a@example.com") is not None
+    assert cache.get("b@example.com") is None
+    assert cache.get("c@example.com") is not None
+
+
+def test_user_cache_ignores_stale_version():
+    cache = UserCache(ttl=60, max_size=10)
+    old_version = cache.put(MockUser(hashed_password="old")).version
+    cache.invalidate("user@example.com")
+    cache.put(MockUser(hashed_password="new"))
+
+    assert cache.get("user@example.com", old_version) is None
+    assert cache.get("user@example.com") is not None
+
+
+def test_generate_jwt_token_includes_version():
+    class UserObj:
+        email = "user@example.com"
+        role = None
+        version = "abc123"
+
+    payload = decode_jwt_token(generate_jwt_token(UserObj()))
+
+    assert payload == {"sub": "user@example.com", "ver": "abc123"}
+
+
+def test_password_executor_hashes_and_verifies():
+    executor = PasswordExecutor("thread", workers=1, max_pending=4)
+
+    async def hash_and_verify():
+        hashed = await executor.run(hash_password, "secret")
+        return await executor.run(verify_password, "secret", hashed)
+
+    assert asyncio.run(hash_and_verify()) is True
+    assert executor.stats()["completed"] == 2
+    executor.shutdown()
+
+
+def test_password_executor_rejects_when_full():
+    executor = PasswordExecutor("thread", workers=1, max_pending=0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(executor.run(hash_password, "secret"))
+
+    assert exc_info.value.status_code == 503
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+def test_rank_between_sorts_between_neighbours():
+    ranks = [rank_between(None, None)]
+    # Insert repeatedly at the start, end and into the same gap
+    for _ in range(50):
+        ranks.insert(0, rank_between(None, ranks[0]))
+        ranks.append(rank_between(ranks[-1], None))
+        ranks.insert(2, rank_between(ranks[1], ranks[2]))
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+    assert not any(rank.endswith("0") for rank in ranks)
+
+
+def test_rank_between_rejects_unordered_bounds():
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+    with pytest.raises(ValueError):
+        rank_between("a", "a")
+
+
+def test_order_rank_preserves_integer_order():
+    ranks = [order_rank(order) for order in range(1, 5000, 7)]
+    assert ranks == sorted(ranks)
+    assert rank_between(order_rank(1), order_rank(2)) < order_rank(2)
+
+
+def test_order_rank_rejects_orders_without_a_key():
+    for order in (-1, 0, MAX_ORDER + 1):
+        with pytest.raises(ValueError):
+            order_rank(order)
+
+
+def test_rank_after_keeps_appended_keys_short():
+    ranks = [rank_after(None)]
+    for _ in range(1000):
+        ranks.append(rank_after(ranks[-1]))
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+    assert max(len(rank) for rank in ranks) <= 5
+
+    # Keys longer than the fixed width (e.g. after moves) are still passed
+    long_rank = rank_between(ranks[-2], ranks[-1])
+    assert ranks[-2] < long_rank < rank_after(long_rank)
+    assert len(rank_after(long_rank)) <= 5
+    assert rank_after("z" * 5) > "z" * 5
+
+
+def test_question_list_cache_checks_version():
+    cache = QuestionListCache(max_bytes=100)
+    cache.put(1, 3, b"[]")
+
+    assert cache.get(1, 3) == b"[]"
+    assert cache.get(1, 4) is None
+    cache.invalidate(1)
+    assert cache.get(1, 3) is None
+
+
+def test_question_list_cache_caps_memory():
+    cache = QuestionListCache(max_bytes=10)
+    cache.put(1, 1, b"aaaa")
+    cache.put(2, 1, b"bbbb")
+    cache.get(1, 1)
+    cache.put(3, 1, b"cccc")
+    cache.put(4, 1, b"x" * 11)
+
+    assert cache.get(1, 1) == b"aaaa"
+    assert cache.get(2, 1) is None
+    assert cache.get(3, 1) == b"cccc"
+    assert cache.get(4, 1) is None
+    assert cache.stats()["bytes"] == 8
+
+
+def make_question(id, is_published=False, answer_text=None, order=1):
+    return {
+        "id": id,
+        "question_text": f"Question {id}",
+        "answer_text": answer_text,
+        "is_published": is_published,
+        "published_order": order if is_published else None,
+        "draft_order": None if is_published else order,
+    }
+
+
+def test_question_deltas_by_viewer():
+    previous = [
+        make_question(1, is_published=True, answer_text="Yes", order=1),
+        make_question(2, is_published=True, answer_text="No", order=2),
+        make_question(3),
+    ]
+    current = [
+        make_question(2, is_published=True, answer_text="No", order=1),
+        make_question(1, is_published=True, answer_text="Yes!", order=2),
+        make_question(3, is_published=True, answer_text="Ok", order=3),
+        make_question(4),
+    ]
+
+    host_kinds = [kind for kind, _ in question_deltas(previous, current, True)]
+    attendee_deltas = question_deltas(previous, current, False)
+
+    assert host_kinds == ["updated", "published", "created", "reordered"]
+    assert [kind for kind, _ in attendee_deltas] == [
+        "updated",
+        "published",
+        "reordered",
+    ]
+    assert attendee_deltas[-1][1] == {"ids": [2, 1, 3]}
+
+
+def test_question_deltas_hide_drafts_from_attendees():
+    previous = [make_question(1, is_published=True, answer_text="Yes")]
+    current = [make_question(1), make_question(2)]
+
+    assert question_deltas(previous, current, False) == [
+        ("unpublished", {"id": 1})
+    ]
+    assert question_deltas(current, [], False) == []
+
+
+def test_cursor_round_trip():
+    keys = [(Event.start_time, False), (Event.id, False)]
+    start_time = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    cursor = encode_cursor([start_time, 42])
+
+    assert decode_cursor(cursor, keys) == [start_time, 42]
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", keys)
+    assert exc.value.status_code == 400
+
+
+def test_request_metrics_histogram():
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+    metrics.observe("GET", "/api/events/{event_id}", 200, 0.05)
+    metrics.observe("GET", "/api/events/{event_id}", 200, 0.1)
+    metrics.observe("GET", "/api/events/{event_id}", 404, 5.0)
+
+    async def render():
+        return render_metrics(metrics)
+
+    lines = asyncio.run(render()).splitlines()
+    labels = 'method="GET",route="/api/events/{event_id}"'
+    buckets = [
+        line
+        for line in lines
+        if line.startswith(f"http_request_duration_seconds_bucket{{{labels}")
+    ]
+    assert [line.rsplit(" ", 1)[1] for line in buckets] == ["2", "2", "3"]
+    assert f"http_request_duration_seconds_count{{{labels}}} 3" in lines
+    assert f'http_responses_total{{{labels},status="404"}} 1' in lines
+
+
+def test_stack_sampler_records_only_its_request():
+    def busy_work(seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            sum(range(100))
+
+    async def profiled_request(sampler):
+        profiling.profiled_request.set(sampler)
+        await anyio.to_thread.run_sync(busy_work, 0.05)
+
+    other = threading.Thread(target=busy_work, args=(0.05,), name="other")
+    sampler = StackSampler(0.001)
+    other.start()
+    sampler.start()
+    anyio.run(profiled_request, sampler)
+    sampler.stop()
+    other.join()
+
+    stacks = sampler.collapsed().splitlines()
+    assert any("busy_work (test_utils.py:" in line for line in stacks)
+    assert not any(line.startswith("other;") for line in stacks)
+
+
+def test_profiler_finds_context_runners():
+    # Fails when an anyio upgrade turns request profiling off
+    assert profiling.context_runners() is not None